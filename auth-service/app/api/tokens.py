@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import create_access_token
 from app.api.dependencies import get_current_user
 from app.models.user import User
@@ -74,7 +74,7 @@ def generate_token(
 )
 def list_tokens(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> TokenListResponse:
     """List all tokens for the current user (both active and revoked)."""
     tokens = db.query(Token).filter(Token.user_id == current_user.id).order_by(Token.created_at.desc()).all()
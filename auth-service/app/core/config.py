@@ -14,6 +14,19 @@ class Settings(BaseSettings):
         description="PostgreSQL database connection URL"
     )
 
+    DATABASE_REPLICA_URLS: str = Field(
+        default="",
+        description="Comma separated connection URLs of read replicas for read-only endpoints"
+    )
+
+    DB_REPLICA_RETRY_SECONDS: float = Field(
+        default=30,
+        description="Seconds a replica that refused a connection is skipped for"
+    )
+
+    # Pool settings (DB_POOL_SIZE, DB_MAX_OVERFLOW, ...) are read by
+    # everse_db.config, shared with the database tools; see app/core/database.py.
+
     JWT_SECRET: str = Field(
         description="Secret key for JWT token signing (min 32 bytes)"
     )
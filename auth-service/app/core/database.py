@@ -4,15 +4,37 @@ from sqlalchemy.orm import sessionmaker
 from typing import Generator
 
 from app.core.config import settings
+from everse_db.config import engine_options, load_config
+from everse_db.pool import MonitoredQueuePool
+from everse_db.routing import ReplicaRouter
+
+# Pool settings come from the DB_POOL_* environment variables, with the
+# defaults of the database tools (everse_db.config.POOL_DEFAULTS). Each
+# gunicorn worker holds its own pool of up to DB_POOL_SIZE + DB_MAX_OVERFLOW
+# connections.
+pool_options = engine_options(load_config())
+
+
+def _create_engine(url: str):
+    # pool_pre_ping (on by default) validates connections before use
+    return create_engine(
+        url,
+        poolclass=MonitoredQueuePool,
+        echo=False,  # Set to True for SQL query logging
+        **pool_options,
+    )
+
 
 # Create SQLAlchemy engine
-# pool_pre_ping=True ensures connections are validated before use
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    echo=False  # Set to True for SQL query logging
+engine = _create_engine(settings.DATABASE_URL)
+
+# Read replicas for get_read_db: round-robin, a replica that refuses a
+# connection is skipped for DB_REPLICA_RETRY_SECONDS, primary as fallback
+replica_router = ReplicaRouter(
+    engine,
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    pool_options,
+    settings.DB_REPLICA_RETRY_SECONDS,
 )
 
 # Create SessionLocal class for database sessions
@@ -43,3 +65,15 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Generator:
+    """
+    Dependency function that yields a read-only session on a read replica.
+
+    Uses everse_db.routing.ReplicaRouter; without a reachable replica the
+    session reads from the primary. Replicas lag slightly behind the primary,
+    so use this only for endpoints that do not read back their own writes.
+    """
+    with replica_router.read_session() as db:
+        yield db
@@ -6,6 +6,7 @@ import logging
 
 from app.core.config import settings
 from app.core.database import engine, Base
+from everse_db.schema_fingerprint import create_all_if_changed
 from app.core.logging_config import configure_logging
 from app.api import auth, tokens, web
 
@@ -19,10 +20,12 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("Starting up auth-service...")
 
-    # Create database tables
-    logger.info("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created successfully")
+    # Create database tables unless the models are unchanged since the last start
+    with engine.connect() as connection:
+        if create_all_if_changed(connection, Base.metadata, "auth-service"):
+            logger.info("Database tables created successfully")
+        else:
+            logger.info("Database tables up to date")
 
     yield
     logger.info("Shutting down auth-service...")
@@ -63,6 +66,25 @@ async def health_check():
     }
 
 
+# Clients allowed to read /health/pool; kubectl exec and kubectl port-forward
+# connect from inside the pod, traffic through the service does not.
+LOOPBACK_HOSTS = {"127.0.0.1", "::1"}
+
+
+@app.get("/health/pool", status_code=status.HTTP_200_OK, include_in_schema=False)
+async def pool_health(request: Request):
+    """
+    Connection pool snapshot of the worker serving the request.
+
+    Reports checkout wait times, overflow usage and connection age, for sizing
+    DB_POOL_SIZE and DB_MAX_OVERFLOW against PostgreSQL's max_connections.
+    Served only to clients on the pod's loopback interface; others get 404.
+    """
+    if request.client is None or request.client.host not in LOOPBACK_HOSTS:
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": "Not Found"})
+    return engine.pool.stats().as_dict()
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """
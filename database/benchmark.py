@@ -0,0 +1,109 @@
+"""
+Benchmark the dashboard views and API queries at production-like scale.
+
+Loads a seeded synthetic dataset at each requested size (10k, 100k and 1M
+assessments by default) into the configured database, times every view of
+sql/schema/006, the materialized views and the PostgREST filters from
+docs/API_examples.md, and writes a JSON report with latency percentiles and
+buffer usage. Pass an earlier report with --compare to see the change.
+
+The data tables are emptied before every scale, so point this at a local,
+disposable database and confirm with --reset.
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import replace
+from tabulate import tabulate
+from everse_db.config import load_config, build_database_url, engine_options, DEFAULT_SCHEMA_NAME
+from everse_db.db_helper import EverseDB
+from everse_db.benchmark import DEFAULT_SCALES, PRODUCTION_LIKE, BenchmarkRunner, compare_reports
+
+
+def parse_scales(value: str):
+    """Parse a comma separated list of assessment counts such as 10000,100000."""
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main():
+    """
+    Parse command-line arguments, run the benchmark and write the report.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark dashboard views and API queries on synthetic data."
+    )
+    parser.add_argument(
+        "--config",
+        help="Path to JSON config file. If omitted, environment variables are used.",
+        required=False,
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Confirm that all data in the target database may be deleted",
+    )
+    parser.add_argument(
+        "--scales",
+        type=parse_scales,
+        default=list(DEFAULT_SCALES),
+        help="Comma separated assessment counts (default: 10000,100000,1000000)",
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per query")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per query")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic dataset")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Data generation processes"
+    )
+    parser.add_argument(
+        "--output", default="benchmark-report.json", help="Where to write the JSON report"
+    )
+    parser.add_argument("--compare", help="Earlier report to compare the results with")
+    args = parser.parse_args()
+
+    if not args.reset:
+        sys.exit("The benchmark deletes all data in the target database; pass --reset to confirm.")
+
+    config = load_config(args.config)
+    database_url = build_database_url(config)
+    schema_name = config.get("schema_name", DEFAULT_SCHEMA_NAME)
+
+    db = EverseDB(
+        database_url=database_url, schema=schema_name, engine_options=engine_options(config)
+    )
+    db.init_db()
+    dataset = replace(PRODUCTION_LIKE, seed=args.seed, workers=args.workers)
+    runner = BenchmarkRunner(
+        db.engine, schema=schema_name, dataset=dataset, repeat=args.repeat, warmup=args.warmup
+    )
+    report = runner.run(args.scales)
+
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Report written to {args.output}")
+
+    rows = [
+        {
+            "assessments": entry["assessments"],
+            "query": name,
+            "rows": timing["rows"],
+            "p50 ms": timing["latency_ms"]["p50"],
+            "p95 ms": timing["latency_ms"]["p95"],
+            "hit blocks": timing["shared_hit_blocks"],
+            "read blocks": timing["shared_read_blocks"],
+        }
+        for entry in report["scales"]
+        for name, timing in entry["queries"].items()
+    ]
+    print(tabulate(rows, headers="keys", tablefmt="pretty"))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        print(f"Compared with {args.compare} ({baseline.get('git_commit')}):")
+        print(tabulate(compare_reports(report, baseline), headers="keys", tablefmt="pretty"))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Exports the public API of the everse_db package.
 
 from .config import load_config, build_database_url, DEFAULT_SCHEMA_NAME
 from .db_helper import EverseDB
+from .ingest import BulkAssessmentLoader, IngestStats
 from .models import (
     Indicator,
     IndicatorModel,
@@ -0,0 +1,90 @@
+"""
+Module: async_db_helper
+Provides AsyncEverseDB, the asyncio counterpart of EverseDB.
+
+The engine uses SQLAlchemy's asyncio extension with the asyncpg driver, so one
+process can keep many queries in flight on a single event loop instead of
+running a thread per connection. The pool settings are the same as for
+EverseDB (see config.engine_options).
+"""
+
+from typing import Any, Dict, Optional
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from .config import DEFAULT_SCHEMA_NAME, engine_options as default_engine_options
+from .db_helper import FINGERPRINT_NAME, SCHEMA_UPGRADES
+from .models.base import Base
+from .pool import MonitoredAsyncQueuePool, PoolStats
+from .schema_fingerprint import create_all_if_changed
+
+ASYNC_DRIVER = "postgresql+asyncpg"
+
+
+def async_database_url(database_url: str) -> str:
+    """Switch a PostgreSQL URL such as build_database_url() returns to asyncpg."""
+    return make_url(database_url).set(drivername=ASYNC_DRIVER).render_as_string(
+        hide_password=False
+    )
+
+
+class AsyncEverseDB:
+    """
+    Helper class to manage database initialization with an asyncio engine.
+
+    Attributes:
+        database_url (str): The PostgreSQL connection string, using asyncpg.
+        schema (str): The database schema to use.
+        engine: The SQLAlchemy AsyncEngine instance.
+        SessionLocal: A configured async_sessionmaker producing AsyncSession objects.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        schema: str = DEFAULT_SCHEMA_NAME,
+        engine_options: Optional[Dict[str, Any]] = None,
+    ):
+        self.database_url = async_database_url(database_url)
+        self.schema = schema
+        options = (
+            default_engine_options({}, asyncpg=True) if engine_options is None else engine_options
+        )
+        self.engine = create_async_engine(
+            self.database_url, poolclass=MonitoredAsyncQueuePool, **options
+        )
+        # Objects stay usable after commit; reloading them would need another
+        # await, which attribute access cannot do.
+        self.SessionLocal = async_sessionmaker(
+            self.engine, autoflush=False, expire_on_commit=False
+        )
+
+    async def init_db(self) -> None:
+        """
+        Initialize the database by creating the schema (if it doesn't exist)
+        and all tables defined in the metadata.
+        """
+        async with self.engine.connect() as connection:
+            await connection.run_sync(
+                create_all_if_changed,
+                Base.metadata,
+                FINGERPRINT_NAME,
+                [self.schema],
+                [statement.format(schema=self.schema) for statement in SCHEMA_UPGRADES],
+            )
+
+        url_obj = make_url(self.database_url)
+        print(f"Database initialized with schema '{self.schema}'.")
+        print(
+            f"Connected to server at {url_obj.host}:{url_obj.port} and database "
+            f"'{url_obj.database}' as user '{url_obj.username}'."
+        )
+
+    def pool_stats(self) -> PoolStats:
+        """
+        Snapshot of the connection pool: checkout waits, overflow and connection age.
+        """
+        return self.engine.sync_engine.pool.stats()
+
+    async def dispose(self) -> None:
+        """Close all pooled connections; call before the event loop ends."""
+        await self.engine.dispose()
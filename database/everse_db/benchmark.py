@@ -0,0 +1,223 @@
+"""
+Module: benchmark
+Times the query catalog against synthetic datasets of increasing size.
+
+For each scale the data tables are emptied and a seeded synthetic dataset is
+loaded into assessment_raw (so check_facts is filled by its triggers, as in
+production), the tables are analysed and the materialized views refreshed.
+Every catalog query is then run a few times to warm the cache and timed over
+``repeat`` runs, with rows streamed to the client as PostgREST would. One
+``EXPLAIN (ANALYZE, BUFFERS)`` run per query records buffer hits and reads.
+The report is plain JSON so runs from different commits can be compared.
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .config import DEFAULT_SCHEMA_NAME
+from .partitions import PartitionManager
+from .query_catalog import CatalogQuery, dashboard_queries
+from .refresh import MaterializedViewRefresher
+from .synthetic import SYNTHETIC_EPOCH, SyntheticConfig, SyntheticDataGenerator, clear_tables
+
+DEFAULT_SCALES = (10_000, 100_000, 1_000_000)
+PERCENTILES = (50, 90, 95, 99)
+
+#: Dataset shape shared by all scales; only the number of assessments changes.
+PRODUCTION_LIKE = SyntheticConfig(
+    num_dimensions=11,
+    num_indicators=60,
+    num_software=5000,
+    num_content_relations=1000,
+    num_distinct_software=2000,
+    software_skew=1.1,
+    checks_distribution="normal",
+    checks_min=1,
+    checks_max=20,
+    checks_mean=8,
+    layout="raw",
+)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Percentile with linear interpolation between the closest ranks."""
+    ordered = sorted(values)
+    if not ordered:
+        return math.nan
+    position = (len(ordered) - 1) * pct / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    """Min, max, mean and percentiles of a list of latencies, rounded to µs."""
+    summary = {
+        "min": min(latencies_ms),
+        "max": max(latencies_ms),
+        "mean": statistics.fmean(latencies_ms),
+    }
+    summary.update({f"p{pct}": percentile(latencies_ms, pct) for pct in PERCENTILES})
+    return {key: round(value, 3) for key, value in summary.items()}
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree, if it is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def explain_analyze(connection: Connection, query: CatalogQuery) -> Dict[str, Any]:
+    """Planning/execution time and buffer usage from one EXPLAIN ANALYZE run."""
+    plan = connection.execute(
+        text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.sql}"), query.params
+    ).scalar_one()[0]
+    root = plan["Plan"]
+    return {
+        "planning_ms": plan.get("Planning Time"),
+        "execution_ms": plan.get("Execution Time"),
+        "shared_hit_blocks": root.get("Shared Hit Blocks", 0),
+        "shared_read_blocks": root.get("Shared Read Blocks", 0),
+        "temp_written_blocks": root.get("Temp Written Blocks", 0),
+    }
+
+
+def time_query(
+    connection: Connection, query: CatalogQuery, repeat: int, warmup: int
+) -> Dict[str, Any]:
+    """Run a query ``warmup + repeat`` times, streaming all rows, and time the last runs."""
+    latencies = []
+    rows = 0
+    for run in range(warmup + repeat):
+        started = time.perf_counter()
+        result = connection.execute(
+            text(query.sql), query.params, execution_options={"stream_results": True}
+        )
+        rows = sum(len(partition) for partition in result.partitions(1000))
+        elapsed = (time.perf_counter() - started) * 1000
+        if run >= warmup:
+            latencies.append(elapsed)
+    connection.rollback()
+    return {"source": query.source, "request": query.request, "rows": rows,
+            "latency_ms": summarize(latencies)}
+
+
+class BenchmarkRunner:
+    """
+    Load synthetic datasets and time the query catalog against each.
+
+    Attributes:
+        engine: The SQLAlchemy engine of the (disposable) benchmark database.
+        schema (str): The schema holding the EVERSE tables.
+        dataset (SyntheticConfig): Dataset shape; ``num_assessments`` is set per scale.
+        repeat (int): Timed runs per query.
+        warmup (int): Untimed runs per query before timing.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        schema: str = DEFAULT_SCHEMA_NAME,
+        dataset: SyntheticConfig = PRODUCTION_LIKE,
+        repeat: int = 10,
+        warmup: int = 1,
+    ):
+        self.engine = engine
+        self.schema = schema
+        self.dataset = dataset
+        self.repeat = repeat
+        self.warmup = warmup
+
+    def load(self, num_assessments: int) -> Dict[str, Any]:
+        """Replace the data with a dataset of ``num_assessments`` assessments."""
+        with self.engine.begin() as connection:
+            clear_tables(connection, self.schema, include_raw=True)
+        # Synthetic assessments are dated back to SYNTHETIC_EPOCH; give every
+        # month its own partition as production history would have.
+        now = datetime.now(timezone.utc)
+        months_back = (now.year - SYNTHETIC_EPOCH.year) * 12 + now.month - SYNTHETIC_EPOCH.month
+        PartitionManager(self.engine, self.schema).ensure(months_ahead=1, months_back=months_back)
+
+        config = replace(self.dataset, num_assessments=num_assessments)
+        result = SyntheticDataGenerator(self.engine, config, schema=self.schema).generate()
+        started = time.perf_counter()
+        with self.engine.connect() as connection:
+            connection.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+        MaterializedViewRefresher(self.engine, self.schema).refresh(force=True)
+        return {
+            "rows": result.rows,
+            "load_seconds": round(result.seconds, 3),
+            "analyze_refresh_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    def run_queries(self) -> Dict[str, Any]:
+        """Time every catalog query against the loaded dataset."""
+        results = {}
+        with self.engine.connect() as connection:
+            for query in dashboard_queries(self.schema):
+                timing = time_query(connection, query, self.repeat, self.warmup)
+                timing.update(explain_analyze(connection, query))
+                connection.rollback()
+                results[query.name] = timing
+        return results
+
+    def run(self, scales: Sequence[int] = DEFAULT_SCALES, progress=print) -> Dict[str, Any]:
+        """Benchmark every scale and return the report."""
+        with self.engine.connect() as connection:
+            server_version = connection.execute(text("SHOW server_version")).scalar_one()
+        report = {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "server_version": server_version,
+            "dataset": asdict(self.dataset),
+            "repeat": self.repeat,
+            "warmup": self.warmup,
+            "scales": [],
+        }
+        for scale in scales:
+            progress(f"Loading {scale} assessments...")
+            entry = {"assessments": scale}
+            entry.update(self.load(scale))
+            progress(f"Timing {len(dashboard_queries(self.schema))} queries...")
+            entry["queries"] = self.run_queries()
+            report["scales"].append(entry)
+        return report
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    p50/p95 of each query in ``current`` next to ``baseline`` for the scales
+    both reports contain; ratios above 1 mean slower than the baseline.
+    """
+    baseline_scales = {entry["assessments"]: entry for entry in baseline.get("scales", [])}
+    rows = []
+    for entry in current.get("scales", []):
+        previous = baseline_scales.get(entry["assessments"])
+        if previous is None:
+            continue
+        for name, timing in entry["queries"].items():
+            before = previous["queries"].get(name)
+            if before is None:
+                continue
+            row = {"assessments": entry["assessments"], "query": name}
+            for key in ("p50", "p95"):
+                now_ms = timing["latency_ms"][key]
+                then_ms = before["latency_ms"][key]
+                row[f"{key} ms"] = now_ms
+                row[f"{key} ratio"] = round(now_ms / then_ms, 2) if then_ms else None
+            rows.append(row)
+    return rows
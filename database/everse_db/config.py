@@ -9,7 +9,7 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 def load_config(file_path: Optional[str] = None) -> Dict[str, str]:
@@ -17,7 +17,9 @@ def load_config(file_path: Optional[str] = None) -> Dict[str, str]:
     Load configuration from JSON when a path is supplied, otherwise fall back to env vars.
 
     Recognised environment variables:
-        DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+        DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_SCHEMA,
+        DB_REPLICA_HOSTS and the pool settings of POOL_ENV_VARS (the last two
+        are used unless the JSON file sets them)
     """
     if file_path:
         config_path = Path(file_path)
@@ -35,9 +37,62 @@ def load_config(file_path: Optional[str] = None) -> Dict[str, str]:
         }
 
     config.setdefault("schema_name", os.environ.get("DB_SCHEMA", DEFAULT_SCHEMA_NAME))
+    if "replica_hosts" not in config and os.environ.get("DB_REPLICA_HOSTS"):
+        config["replica_hosts"] = os.environ["DB_REPLICA_HOSTS"]
+    for key, env_var in POOL_ENV_VARS.items():
+        if key not in config and env_var in os.environ:
+            config[key] = os.environ[env_var]
     return config
 
 
+def build_replica_urls(config: Dict[str, Any]) -> List[str]:
+    """
+    Database URLs of the read replicas in ``replica_hosts``.
+
+    ``replica_hosts`` is a list, or a comma separated string, of ``host`` or
+    ``host:port`` entries; replicas share the primary's database name and
+    credentials. Returns an empty list when no replicas are configured.
+    """
+    hosts = config.get("replica_hosts") or []
+    if isinstance(hosts, str):
+        hosts = [host.strip() for host in hosts.split(",") if host.strip()]
+    urls = []
+    for entry in hosts:
+        host, _, port = entry.partition(":")
+        urls.append(build_database_url(dict(config, host=host, port=port or 5432)))
+    return urls
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def engine_options(config: Dict[str, Any], asyncpg: bool = False) -> Dict[str, Any]:
+    """
+    Keyword arguments for ``create_engine`` from the pool settings in ``config``.
+
+    Missing settings take the values of POOL_DEFAULTS. A positive
+    ``statement_timeout_ms`` is set on every new connection, in the form the
+    driver expects: psycopg2 by default, asyncpg when ``asyncpg`` is set.
+    """
+    settings = {key: config.get(key, default) for key, default in POOL_DEFAULTS.items()}
+    options: Dict[str, Any] = {
+        "pool_size": int(settings["pool_size"]),
+        "max_overflow": int(settings["max_overflow"]),
+        "pool_timeout": float(settings["pool_timeout"]),
+        "pool_recycle": int(settings["pool_recycle"]),
+        "pool_pre_ping": _as_bool(settings["pool_pre_ping"]),
+    }
+    statement_timeout = int(settings["statement_timeout_ms"])
+    if statement_timeout > 0 and asyncpg:
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(statement_timeout)}}
+    elif statement_timeout > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+    return options
+
+
 def build_database_url(config: Dict[str, str]) -> str:
     """
     Construct a PostgreSQL database URL using configuration parameters.
@@ -51,3 +106,23 @@ def build_database_url(config: Dict[str, str]) -> str:
 
 
 DEFAULT_SCHEMA_NAME = "api"
+
+#: Connection pool settings shared by the database tools and the auth-service.
+#: Every process holds up to pool_size + max_overflow connections, which must
+#: fit in PostgreSQL's max_connections together with all other clients.
+POOL_DEFAULTS = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_timeout": 30,
+    "pool_recycle": 1800,
+    "pool_pre_ping": True,
+    "statement_timeout_ms": 0,
+}
+POOL_ENV_VARS = {
+    "pool_size": "DB_POOL_SIZE",
+    "max_overflow": "DB_MAX_OVERFLOW",
+    "pool_timeout": "DB_POOL_TIMEOUT",
+    "pool_recycle": "DB_POOL_RECYCLE",
+    "pool_pre_ping": "DB_POOL_PRE_PING",
+    "statement_timeout_ms": "DB_STATEMENT_TIMEOUT_MS",
+}
@@ -4,12 +4,27 @@ Provides the EverseDB helper class for initializing the database schema, creatin
 and querying table metadata.
 """
 
-from sqlalchemy import create_engine, text, inspect
-from sqlalchemy.orm import sessionmaker
-from .config import DEFAULT_SCHEMA_NAME
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, sessionmaker
+from .config import DEFAULT_SCHEMA_NAME, engine_options as default_engine_options
 from .models.base import Base
+from .pool import MonitoredQueuePool, PoolStats
+from .routing import ReplicaRouter
+from .schema_fingerprint import create_all_if_changed
 from sqlalchemy.engine.url import make_url
 
+#: Name of the ORM models' entry in public.schema_fingerprints.
+FINGERPRINT_NAME = "everse_db"
+#: Columns added to models after their tables were first created; create_all
+#: leaves existing tables as they are. ``{schema}`` is the EverseDB schema.
+SCHEMA_UPGRADES = (
+    "ALTER TABLE {schema}.assessments ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS assessments_content_hash_key "
+    "ON {schema}.assessments (content_hash)",
+)
+
 
 class EverseDB:
     """
@@ -18,29 +33,56 @@ class EverseDB:
     Attributes:
         database_url (str): The PostgreSQL connection string.
         schema (str): The database schema to use.
-        engine: The SQLAlchemy engine instance.
+        engine: The SQLAlchemy engine instance, pooled by a MonitoredQueuePool
+            configured from ``engine_options`` (see config.engine_options).
         SessionLocal: A configured SQLAlchemy sessionmaker.
+        router: Routes read-only work to the replicas of ``replica_urls``
+            (see config.build_replica_urls), or to the primary without them.
     """
 
-    def __init__(self, database_url: str, schema: str = DEFAULT_SCHEMA_NAME):
+    def __init__(
+        self,
+        database_url: str,
+        schema: str = DEFAULT_SCHEMA_NAME,
+        engine_options: Optional[Dict[str, Any]] = None,
+        replica_urls: Optional[List[str]] = None,
+    ):
         self.database_url = database_url
         self.schema = schema
-        self.engine = create_engine(self.database_url)
+        options = default_engine_options({}) if engine_options is None else engine_options
+        self.engine = create_engine(
+            self.database_url, poolclass=MonitoredQueuePool, **options
+        )
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
         )
+        self.router = ReplicaRouter(self.engine, replica_urls, options)
+
+    def read_connection(self) -> Iterator[Connection]:
+        """Context manager yielding a read-only connection, preferably to a replica."""
+        return self.router.read_connection()
+
+    def read_session(self) -> Iterator[Session]:
+        """Context manager yielding a read-only ORM session, preferably on a replica."""
+        return self.router.read_session()
 
     def init_db(self) -> None:
         """
         Initialize the database by creating the schema (if it doesn't exist)
         and all tables defined in the metadata.
+
+        Skipped with a single query when the models are unchanged since the
+        last initialization (see schema_fingerprint). Tables created by an
+        older version of the models are upgraded with SCHEMA_UPGRADES.
         """
-        # Create schema if it doesn't exist.
         with self.engine.connect() as connection:
-            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.schema}"))
-            connection.commit()
-        # Create all tables.
-        Base.metadata.create_all(self.engine)
+            create_all_if_changed(
+                connection,
+                Base.metadata,
+                FINGERPRINT_NAME,
+                [self.schema],
+                [statement.format(schema=self.schema) for statement in SCHEMA_UPGRADES],
+            )
 
         # Parse database URL to extract non-sensitive details.
         url_obj = make_url(self.database_url)
@@ -54,16 +96,45 @@ class EverseDB:
             f"Connected to server at {host}:{port} and database '{database}' as user '{username}'."
         )
 
+    def pool_stats(self) -> PoolStats:
+        """
+        Snapshot of the connection pool: checkout waits, overflow and connection age.
+        """
+        return self.engine.pool.stats()
+
     def query_tables_and_columns(self) -> dict:
         """
         Query the database to retrieve table names and their columns.
+
+        One catalog query returns every table of the schema (partitions are
+        listed under their parent) with its columns as dicts with ``name``,
+        ``type``, ``nullable`` and ``default``.
         """
-        inspector = inspect(self.engine)
-        table_names = inspector.get_table_names(schema=self.schema)
+        with self.read_connection() as connection:
+            rows = connection.execute(
+                text(
+                    """
+                    SELECT c.relname, a.attname,
+                           format_type(a.atttypid, a.atttypmod),
+                           NOT a.attnotnull,
+                           pg_get_expr(d.adbin, d.adrelid)
+                    FROM pg_class c
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    JOIN pg_attribute a ON a.attrelid = c.oid
+                    LEFT JOIN pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+                    WHERE n.nspname = :schema
+                      AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+                      AND a.attnum > 0 AND NOT a.attisdropped
+                    ORDER BY c.relname, a.attnum
+                    """
+                ),
+                {"schema": self.schema},
+            ).all()
         tables_info = {}
-        for table in table_names:
-            columns = inspector.get_columns(table, schema=self.schema)
-            tables_info[table] = columns
+        for table, name, type_, nullable, default in rows:
+            tables_info.setdefault(table, []).append(
+                {"name": name, "type": type_, "nullable": nullable, "default": default}
+            )
         return tables_info
 
     def print_tables_and_columns(self) -> None:
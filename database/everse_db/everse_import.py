@@ -0,0 +1,218 @@
+"""
+Module: everse_import
+Imports the EVERSE dimension and indicator catalog (as written by the sync job)
+into the dimensions and indicators tables.
+
+Every JSON file is parsed once and validated with DimensionModel/IndicatorModel.
+Rows are then upserted in batches with one multi-row
+``INSERT ... ON CONFLICT (identifier) DO UPDATE`` statement per batch. The same
+statements can be rendered as plain SQL for a dry run or for piping into psql.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel as PydanticBaseModel, ValidationError
+from sqlalchemy import Table, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+
+from .ingest import batched
+from .models.dimension import Dimension, DimensionModel
+from .models.indicator import Indicator, IndicatorModel
+
+#: Columns written for each table, and the subset refreshed on conflict.
+DIMENSION_COLUMNS = ("identifier", "name", "description", "status", "source")
+DIMENSION_UPDATE_COLUMNS = ("name", "description", "source")
+INDICATOR_COLUMNS = (
+    "identifier",
+    "name",
+    "description",
+    "status",
+    "quality_dimension",
+    "contact",
+    "source",
+)
+INDICATOR_UPDATE_COLUMNS = (
+    "name",
+    "description",
+    "status",
+    "quality_dimension",
+    "contact",
+    "source",
+)
+
+
+@dataclass
+class CatalogImport:
+    """Validated catalog rows and the files that could not be used."""
+
+    dimensions: List[DimensionModel] = field(default_factory=list)
+    indicators: List[IndicatorModel] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+
+def _identifier(document: Dict[str, Any]) -> Optional[str]:
+    """
+    Short identifier used as the natural key, e.g. ``maintainability``.
+
+    The catalog's ``abbreviation`` is preferred; otherwise the last path segment
+    of ``@id``/``identifier`` is used.
+    """
+    if document.get("abbreviation"):
+        return document["abbreviation"]
+    uri = document.get("@id") or document.get("identifier")
+    if isinstance(uri, str) and uri:
+        return uri.rstrip("/").rsplit("/", 1)[-1]
+    return None
+
+
+def _as_text(value: Any) -> Optional[str]:
+    """Store JSON-LD references such as qualityDimension as compact JSON text."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"))
+
+
+def dimension_from_document(document: Dict[str, Any]) -> DimensionModel:
+    """Map an EVERSE dimension document onto DimensionModel."""
+    return DimensionModel(
+        identifier=_identifier(document),
+        name=document.get("name"),
+        description=document.get("description"),
+        status="Active",
+        source=document.get("source") or {},
+    )
+
+
+def indicator_from_document(document: Dict[str, Any]) -> IndicatorModel:
+    """Map an EVERSE indicator document onto IndicatorModel."""
+    return IndicatorModel(
+        identifier=_identifier(document),
+        name=document.get("name"),
+        description=document.get("description"),
+        status=document.get("status") or "Active",
+        quality_dimension=_as_text(document.get("qualityDimension")),
+        contact=document.get("contact") or document.get("contactPoint") or {},
+        source=document.get("source") or {},
+    )
+
+
+def _read_directory(
+    directory: Path, parse, skipped: List[str]
+) -> Iterator[PydanticBaseModel]:
+    for path in sorted(directory.glob("*.json")):
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if not isinstance(data, dict):
+                skipped.append(f"{path}: expected a JSON object, got {type(data).__name__}")
+                continue
+            yield parse(data)
+        except (ValueError, ValidationError) as exc:
+            skipped.append(f"{path}: {exc}")
+
+
+def _dedupe(models: Iterable[PydanticBaseModel]) -> List[PydanticBaseModel]:
+    # One statement may not touch the same identifier twice; the last file wins.
+    return list({model.identifier: model for model in models}.values())
+
+
+def load_catalog(input_dir: str) -> CatalogImport:
+    """Parse and validate ``dimensions/*.json`` and ``indicators/*.json``."""
+    root = Path(input_dir)
+    if not (root / "dimensions").is_dir():
+        raise FileNotFoundError(f"No dimensions directory in {root}; run the sync first.")
+    catalog = CatalogImport()
+    catalog.dimensions = _dedupe(
+        _read_directory(root / "dimensions", dimension_from_document, catalog.skipped)
+    )
+    catalog.indicators = _dedupe(
+        _read_directory(root / "indicators", indicator_from_document, catalog.skipped)
+    )
+    return catalog
+
+
+def _targets(
+    catalog: CatalogImport,
+) -> List[Tuple[Table, Sequence[str], Sequence[str], List[PydanticBaseModel]]]:
+    # Dimensions first so indicator rows can be resolved against them.
+    return [
+        (Dimension.__table__, DIMENSION_COLUMNS, DIMENSION_UPDATE_COLUMNS, catalog.dimensions),
+        (Indicator.__table__, INDICATOR_COLUMNS, INDICATOR_UPDATE_COLUMNS, catalog.indicators),
+    ]
+
+
+def upsert_statement(
+    table: Table,
+    columns: Sequence[str],
+    update_columns: Sequence[str],
+    models: Sequence[PydanticBaseModel],
+):
+    """Build one multi-row INSERT ... ON CONFLICT (identifier) DO UPDATE."""
+    stmt = insert(table).values(
+        [{column: getattr(model, column) for column in columns} for model in models]
+    )
+    updates = {column: stmt.excluded[column] for column in update_columns}
+    updates["updated_at"] = func.now()
+    return stmt.on_conflict_do_update(index_elements=["identifier"], set_=updates)
+
+
+def sql_literal(value: Any) -> str:
+    """Render a value as a PostgreSQL literal (standard_conforming_strings on)."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (dict, list)):
+        return f"{sql_literal(json.dumps(value, ensure_ascii=False))}::jsonb"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def render_upsert_sql(
+    table: Table,
+    columns: Sequence[str],
+    update_columns: Sequence[str],
+    models: Sequence[PydanticBaseModel],
+) -> str:
+    """Render the statement built by upsert_statement() as literal SQL."""
+    values = ",\n".join(
+        "  (" + ", ".join(sql_literal(getattr(model, column)) for column in columns) + ")"
+        for model in models
+    )
+    updates = ",\n".join(
+        [f"  {column} = EXCLUDED.{column}" for column in update_columns]
+        + ["  updated_at = CURRENT_TIMESTAMP"]
+    )
+    return (
+        f"INSERT INTO {table.fullname} ({', '.join(columns)})\nVALUES\n{values}\n"
+        f"ON CONFLICT (identifier) DO UPDATE SET\n{updates};\n"
+    )
+
+
+def render_catalog_sql(catalog: CatalogImport, batch_size: int = 500) -> str:
+    """Render the whole import as a SQL script, one statement per batch."""
+    statements = ["BEGIN;\n"]
+    for table, columns, update_columns, models in _targets(catalog):
+        statements.append(f"-- {table.name}\n")
+        for batch in batched(models, batch_size):
+            statements.append(render_upsert_sql(table, columns, update_columns, batch))
+    statements.append("COMMIT;\n")
+    return "\n".join(statements)
+
+
+def import_catalog(engine: Engine, catalog: CatalogImport, batch_size: int = 500) -> Dict[str, int]:
+    """Upsert the catalog in one transaction and return row counts per table."""
+    counts: Dict[str, int] = {}
+    with engine.begin() as connection:
+        for table, columns, update_columns, models in _targets(catalog):
+            for batch in batched(models, batch_size):
+                connection.execute(upsert_statement(table, columns, update_columns, batch))
+            counts[table.name] = len(models)
+    return counts
@@ -0,0 +1,201 @@
+"""
+Module: everse_sync
+Downloads the EVERSE dimension and indicator files from GitHub.
+
+Directory listings come from the contents API, which reports the git blob SHA
+of every file. A manifest in the output directory remembers the SHA of each
+downloaded file and the ETag of each listing, so an unchanged repository costs
+two conditional requests and no downloads. Changed files are fetched
+concurrently by a bounded thread pool, and a download is only kept when its
+git blob SHA matches the listing, so a truncated or stale response is never
+taken for the new version. Server errors, rate limits and dropped connections
+are retried with backoff; other client errors such as 404 fail at once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+GITHUB_API = "https://api.github.com/repos/EVERSE-ResearchSoftware/indicators/contents"
+GITHUB_RAW = "https://raw.githubusercontent.com/EVERSE-ResearchSoftware/indicators/main"
+SYNC_DIRECTORIES = ("dimensions", "indicators")
+MANIFEST_NAME = ".everse-sync.json"
+MAX_RETRIES = 3
+REQUEST_TIMEOUT = 30
+#: Client errors worth retrying: request timeout and rate limiting.
+RETRY_STATUSES = frozenset({408, 429})
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one sync run; file paths are relative to the output directory."""
+
+    downloaded: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+
+def git_blob_sha(content: bytes) -> str:
+    """The SHA git and the contents API report for a file with ``content``."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def _retryable(exc: requests.RequestException) -> bool:
+    response = getattr(exc, "response", None)
+    if response is None:
+        return True
+    return response.status_code >= 500 or response.status_code in RETRY_STATUSES
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+class EverseSync:
+    """
+    Mirror the EVERSE catalog directories into a local directory.
+
+    Attributes:
+        output_dir (Path): Where ``dimensions/`` and ``indicators/`` are written.
+        api_url (str): Base URL of the contents API for the repository.
+        raw_url (str): Base URL used to download raw file contents.
+        max_workers (int): Upper bound on concurrent downloads.
+        retry_delay (float): Seconds before the first retry; doubled per attempt.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        api_url: str = GITHUB_API,
+        raw_url: str = GITHUB_RAW,
+        max_workers: int = 8,
+        token: Optional[str] = None,
+        retry_delay: float = 1.0,
+    ):
+        self.output_dir = Path(output_dir)
+        self.api_url = api_url.rstrip("/")
+        self.raw_url = raw_url.rstrip("/")
+        self.max_workers = max_workers
+        self.retry_delay = retry_delay
+        self.session = requests.Session()
+        token = token if token is not None else os.environ.get("GITHUB_TOKEN")
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self.manifest_path.exists():
+            with self.manifest_path.open("r", encoding="utf-8") as handle:
+                manifest = json.load(handle)
+        else:
+            manifest = {}
+        manifest.setdefault("listings", {})
+        manifest.setdefault("files", {})
+        return manifest
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        _write_atomic(
+            self.manifest_path, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        )
+
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """GET with exponential backoff on transient failures; 304 counts as success."""
+        delay = self.retry_delay
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+                if response.status_code == 304 or response.ok:
+                    return response
+                response.raise_for_status()
+            except requests.RequestException as exc:
+                if attempt == MAX_RETRIES or not _retryable(exc):
+                    raise
+            time.sleep(delay)
+            delay *= 2
+        raise RuntimeError("unreachable")
+
+    def list_directory(self, directory: str, manifest: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Return ``{file name: blob sha}`` for the JSON files of a directory.
+
+        The request carries the ETag of the previous listing, so an unchanged
+        directory is answered with 304 and the cached listing is reused.
+        """
+        cached = manifest["listings"].get(directory)
+        headers = {"Accept": "application/vnd.github+json"}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        response = self._get(f"{self.api_url}/{directory}", headers=headers)
+        if response.status_code == 304 and cached:
+            return cached["entries"]
+        entries = {
+            item["name"]: item["sha"]
+            for item in response.json()
+            if item.get("type", "file") == "file" and item["name"].endswith(".json")
+        }
+        manifest["listings"][directory] = {
+            "etag": response.headers.get("ETag"),
+            "entries": entries,
+        }
+        return entries
+
+    def _download(self, relative_path: str, sha: str) -> Tuple[str, Optional[str]]:
+        try:
+            response = self._get(f"{self.raw_url}/{relative_path}")
+            actual = git_blob_sha(response.content)
+            if actual != sha:
+                return relative_path, f"blob SHA {actual} does not match the listed {sha}"
+            _write_atomic(self.output_dir / relative_path, response.content)
+            return relative_path, None
+        except (requests.RequestException, OSError) as exc:
+            return relative_path, str(exc)
+
+    def sync(self) -> SyncResult:
+        """Bring the output directory up to date with the repository."""
+        result = SyncResult()
+        manifest = self._load_manifest()
+        stored = manifest["files"]
+        wanted: Dict[str, str] = {}
+        for directory in SYNC_DIRECTORIES:
+            (self.output_dir / directory).mkdir(parents=True, exist_ok=True)
+            for name, sha in self.list_directory(directory, manifest).items():
+                wanted[f"{directory}/{name}"] = sha
+
+        to_fetch = []
+        for relative_path, sha in sorted(wanted.items()):
+            if stored.get(relative_path) == sha and (self.output_dir / relative_path).exists():
+                result.unchanged.append(relative_path)
+            else:
+                to_fetch.append(relative_path)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for relative_path, error in executor.map(
+                self._download, to_fetch, [wanted[path] for path in to_fetch]
+            ):
+                if error is None:
+                    stored[relative_path] = wanted[relative_path]
+                    result.downloaded.append(relative_path)
+                else:
+                    stored.pop(relative_path, None)
+                    result.failed.append(f"{relative_path}: {error}")
+
+        # Files deleted upstream are removed so the importer does not revive them.
+        for relative_path in sorted(set(stored) - set(wanted)):
+            (self.output_dir / relative_path).unlink(missing_ok=True)
+            del stored[relative_path]
+            result.removed.append(relative_path)
+
+        self._save_manifest(manifest)
+        return result
@@ -0,0 +1,268 @@
+"""
+Module: incremental_export
+Exports only the assessments, and their checks, stored since the last export.
+
+Progress is a watermark of ``(created_at, id)``, the keyset of the last
+exported assessment_raw row, kept in a JSON state file. A run exports the
+rows between the stored watermark and the newest settled row, in that key
+order, then replaces the state file atomically. A failed run leaves the
+watermark where it was, so the next run exports the same window again, and
+the nightly cost follows the amount of new data rather than the table size.
+
+``created_at`` is set when the inserting transaction starts, so a row can
+become visible after rows with a later ``created_at``. Only rows older than
+``settle_seconds`` are exported; ingestion transactions must commit within
+that time for their rows to be picked up.
+
+Only new rows are exported. A row updated in place after its export (web_user
+may UPDATE assessment_raw through PostgREST) keeps its ``(created_at, id)``
+and is not exported again, and deleted rows are not reported. Consumers that
+need those changes must re-export in full with parquet_export.
+
+Checks are read from check_facts, partitioned like assessment_raw with the
+``created_at`` of their assessment, so both streams cover the same window.
+Their indicator and dimension names are those at export time; the reference
+tables are small and are exported in full with parquet_export.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from .parquet_export import (
+    DEFAULT_ROW_GROUP_SIZE,
+    query_columns,
+    relation_columns,
+    select_statement,
+    write_parquet,
+)
+
+FORMATS = ("ndjson", "parquet")
+DEFAULT_SETTLE_SECONDS = 300
+
+
+def keyset_window(created_at: str = "created_at", key: str = "id") -> str:
+    """Condition for the rows after the ``after_*`` keyset up to the ``until_*`` one."""
+    # The plain range on created_at lets the planner prune partitions and use
+    # the created_at indexes; the row comparisons settle ties on the key.
+    return (
+        f"{created_at} BETWEEN :after_created_at AND :until_created_at "
+        f"AND ({created_at}, {key}) > (:after_created_at, :after_id) "
+        f"AND ({created_at}, {key}) <= (:until_created_at, :until_id)"
+    )
+
+
+@dataclass
+class Watermark:
+    """Keyset of the last exported assessment and when it was exported."""
+
+    created_at: datetime = datetime.min
+    id: int = 0
+    exported_at: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: Path) -> "Watermark":
+        """The stored watermark, or the start of time before the first export."""
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return cls()
+        return cls(datetime.fromisoformat(data["created_at"]), data["id"], data.get("exported_at"))
+
+    def save(self, path: Path) -> None:
+        """Replace the state file atomically."""
+        temporary = path.with_name(f"{path.name}.tmp")
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "created_at": self.created_at.isoformat(),
+                    "id": self.id,
+                    "exported_at": self.exported_at,
+                },
+                handle,
+            )
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, path)
+
+
+@dataclass
+class IncrementalResult:
+    """Outcome of one incremental export."""
+
+    after: Watermark
+    until: Watermark
+    assessments: int
+    checks: int
+    files: List[str]
+    seconds: float
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot serialise values of type {type(value).__name__}")
+
+
+def write_ndjson(
+    connection: Connection,
+    sql: str,
+    params: Dict[str, Any],
+    path: Path,
+    chunk_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> int:
+    """Stream the rows of ``sql`` into ``path`` as one JSON object per line."""
+    temporary = path.with_name(f"{path.name}.tmp")
+    result = connection.execute(
+        text(sql),
+        params,
+        execution_options={"stream_results": True, "max_row_buffer": chunk_size},
+    )
+    keys = list(result.keys())
+    rows = 0
+    with open(temporary, "w", encoding="utf-8") as handle:
+        for chunk in result.partitions(chunk_size):
+            handle.writelines(
+                json.dumps(dict(zip(keys, row)), default=_json_default) + "\n"
+                for row in chunk
+            )
+            rows += len(chunk)
+    os.replace(temporary, path)
+    return rows
+
+
+class IncrementalExporter:
+    """
+    Export new assessments and checks as NDJSON or Parquet files.
+
+    Attributes:
+        db: The EverseDB to export from; reads use ``db.read_connection()``.
+        output_dir (Path): Directory receiving ``assessments-<stamp>`` and
+            ``checks-<stamp>`` files.
+        state_path (Path): JSON file holding the watermark.
+        format (str): ``ndjson`` or ``parquet``.
+        settle_seconds (int): Age below which new rows wait for the next run.
+        chunk_size (int): Rows per fetch, and per row group for Parquet.
+    """
+
+    def __init__(
+        self,
+        db,
+        output_dir: Path,
+        state_path: Optional[Path] = None,
+        format: str = "ndjson",
+        settle_seconds: int = DEFAULT_SETTLE_SECONDS,
+        chunk_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format {format!r}; expected one of {FORMATS}")
+        self.db = db
+        self.output_dir = Path(output_dir)
+        self.state_path = Path(state_path) if state_path else self.output_dir / "watermark.json"
+        self.format = format
+        self.settle_seconds = settle_seconds
+        self.chunk_size = chunk_size
+
+    def _assessments_query(self, connection: Connection) -> Tuple[str, list]:
+        where = f"WHERE {keyset_window()} ORDER BY created_at, id"
+        if self.format == "ndjson":
+            return f"SELECT * FROM {self.db.schema}.assessments_detailed {where}", []
+        columns = relation_columns(connection, self.db.schema, "assessments_detailed")
+        select = select_statement(self.db.schema, "assessments_detailed", columns)
+        return f"{select} {where}", columns
+
+    def _checks_query(self) -> str:
+        # checks_detailed plus the keys of the window, which the view leaves out.
+        return f"""
+            SELECT
+              f.assessment_id, f.check_index, f.created_at,
+              f.software_name, f.assessment_date, f.check_type, f.indicator_id,
+              f.checking_software, f.process, f.status, f.output, f.evidence,
+              i.name AS indicator_name, i.quality_dimension, d.name AS dimension_name
+            FROM {self.db.schema}.check_facts f
+            LEFT JOIN {self.db.schema}.indicators i ON i.identifier = f.indicator_id
+            LEFT JOIN {self.db.schema}.dimensions d ON d.id = f.dimension_id
+            WHERE {keyset_window("f.created_at", "f.assessment_id")}
+            ORDER BY f.created_at, f.assessment_id, f.check_index
+        """
+
+    def _settled_until(self, connection: Connection, after: Watermark) -> Optional[Watermark]:
+        """Keyset of the newest row past ``after`` that is older than settle_seconds."""
+        row = connection.execute(
+            text(
+                f"""
+                SELECT created_at, id FROM {self.db.schema}.assessment_raw
+                WHERE (created_at, id) > (:after_created_at, :after_id)
+                  AND created_at < LOCALTIMESTAMP - make_interval(secs => :settle)
+                ORDER BY created_at DESC, id DESC
+                LIMIT 1
+                """
+            ),
+            {
+                "after_created_at": after.created_at,
+                "after_id": after.id,
+                "settle": self.settle_seconds,
+            },
+        ).first()
+        return Watermark(row[0], row[1]) if row else None
+
+    def _write(self, connection: Connection, sql: str, params: dict, columns, path: Path) -> int:
+        if self.format == "ndjson":
+            return write_ndjson(connection, sql, params, path, self.chunk_size)
+        if not columns:
+            columns = query_columns(connection, sql, params)
+        rows, _ = write_parquet(connection, sql, params, columns, path, self.chunk_size)
+        return rows
+
+    def export(self) -> IncrementalResult:
+        """Export everything past the stored watermark, then advance it."""
+        started = time.perf_counter()
+        after = Watermark.load(self.state_path)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        extension = "ndjson" if self.format == "ndjson" else "parquet"
+        assessments = checks = 0
+        files: List[str] = []
+        with self.db.read_connection() as connection:
+            until = self._settled_until(connection, after)
+            if until is not None:
+                params = {
+                    "after_created_at": after.created_at,
+                    "after_id": after.id,
+                    "until_created_at": until.created_at,
+                    "until_id": until.id,
+                }
+                sql, columns = self._assessments_query(connection)
+                path = self.output_dir / f"assessments-{stamp}.{extension}"
+                assessments = self._write(connection, sql, params, columns, path)
+                files.append(str(path))
+                path = self.output_dir / f"checks-{stamp}.{extension}"
+                checks = self._write(connection, self._checks_query(), params, None, path)
+                files.append(str(path))
+        if until is None:
+            until = after
+        else:
+            # Only now that both files are in place does the next run start after them.
+            until.exported_at = stamp
+            until.save(self.state_path)
+        return IncrementalResult(
+            after=after,
+            until=until,
+            assessments=assessments,
+            checks=checks,
+            files=files,
+            seconds=round(time.perf_counter() - started, 3),
+        )
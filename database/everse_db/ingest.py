@@ -0,0 +1,576 @@
+"""
+Module: ingest
+Bulk loader for EVERSE assessment documents.
+
+Documents are validated against AssessmentModel, flattened into plain row tuples
+and written to the normalised assessment tables with PostgreSQL COPY. Primary
+keys are pre-allocated from the table sequences so that child rows can reference
+their parent without a round trip per assessment. Documents whose canonical JSON
+hash is already stored are skipped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import itertools
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .config import DEFAULT_SCHEMA_NAME
+from .models.assessment import AssessmentModel
+
+#: Column order used for the COPY streams of each table (ids first).
+ASSESSMENT_COLUMNS = (
+    "id",
+    "context",
+    "type",
+    "name",
+    "description",
+    "date_created",
+    "license_uri",
+    "content_hash",
+)
+CREATOR_COLUMNS = ("id", "assessment_id", "type", "name", "email")
+SOFTWARE_COLUMNS = (
+    "id",
+    "assessment_id",
+    "type",
+    "name",
+    "version",
+    "url",
+    "identifier_uri",
+)
+CHECK_COLUMNS = (
+    "id",
+    "assessment_id",
+    "type",
+    "indicator_uri",
+    "checking_software_type",
+    "checking_software_name",
+    "checking_software_uri",
+    "checking_software_version",
+    "process",
+    "status_uri",
+    "output",
+    "evidence",
+)
+
+#: Upper bound on the number of validation messages kept in IngestStats.
+MAX_REPORTED_ERRORS = 20
+
+
+class FlatAssessment(NamedTuple):
+    """
+    One assessment flattened into row tuples, without primary or foreign keys.
+
+    The tuples follow the *_COLUMNS constants minus their leading id columns.
+    """
+
+    assessment: Tuple[Any, ...]
+    creators: List[Tuple[Any, ...]]
+    software: Tuple[Any, ...]
+    checks: List[Tuple[Any, ...]]
+
+    @property
+    def content_hash(self) -> str:
+        """Canonical content hash, stored as the last assessment column."""
+        return self.assessment[-1]
+
+
+@dataclass
+class IngestStats:
+    """Counters describing one or more bulk loads."""
+
+    received: int = 0
+    loaded: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    checks: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+
+    def add_stage_time(self, stage: str, seconds: float) -> None:
+        """Accumulate time spent in a pipeline stage (read, validate, write)."""
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def record_error(self, message: str) -> None:
+        """Count an invalid document and keep the first few messages."""
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def merge(self, other: "IngestStats") -> None:
+        """Add the counters of another run to this one."""
+        self.received += other.received
+        self.loaded += other.loaded
+        self.duplicates += other.duplicates
+        self.checks += other.checks
+        self.seconds += other.seconds
+        self.invalid += other.invalid
+        room = MAX_REPORTED_ERRORS - len(self.errors)
+        self.errors.extend(other.errors[:room])
+        for stage, seconds in other.stage_seconds.items():
+            self.add_stage_time(stage, seconds)
+
+    @property
+    def rows(self) -> int:
+        """Total rows written across the four assessment tables."""
+        # Every assessment has one creator and one software row.
+        return self.loaded * 3 + self.checks
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def stage_throughput(self) -> Dict[str, float]:
+        """
+        Documents per second of busy time for each stage.
+
+        With a process pool the validate time is summed over all workers, so
+        its figure is the throughput of a single worker.
+        """
+        return {
+            stage: self.received / seconds if seconds else 0.0
+            for stage, seconds in self.stage_seconds.items()
+        }
+
+
+def validate_document(document: Dict[str, Any]) -> AssessmentModel:
+    """Validate a decoded JSON-LD document against AssessmentModel."""
+    return AssessmentModel.model_validate(document)
+
+
+def content_hash(model: AssessmentModel) -> str:
+    """
+    SHA-256 of the canonical JSON form of a validated assessment.
+
+    The model is dumped with its JSON-LD aliases, keys sorted and no
+    insignificant whitespace, so re-submissions that differ only in key order
+    or formatting hash to the same value.
+    """
+    canonical = json.dumps(
+        model.model_dump(mode="json", by_alias=True),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _str_or_none(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def flatten_assessment(model: AssessmentModel) -> FlatAssessment:
+    """Turn a validated assessment into row tuples for the four tables."""
+    assessment = (
+        str(model.context),
+        model.type,
+        model.name,
+        model.description,
+        model.dateCreated,
+        str(model.license.id),
+        content_hash(model),
+    )
+    creator = model.creator
+    creators = [(creator.type, creator.name, creator.email)]
+    software_model = model.assessedSoftware
+    software = (
+        software_model.type,
+        software_model.name,
+        software_model.softwareVersion,
+        _str_or_none(software_model.url),
+        _str_or_none(software_model.identifier.id if software_model.identifier else None),
+    )
+    checks = [
+        (
+            check.type,
+            str(check.assessesIndicator.id),
+            check.checkingSoftware.type,
+            check.checkingSoftware.name,
+            _str_or_none(check.checkingSoftware.id),
+            check.checkingSoftware.softwareVersion,
+            check.process,
+            str(check.status.id),
+            check.output,
+            check.evidence,
+        )
+        for check in model.checks
+    ]
+    return FlatAssessment(assessment, creators, software, checks)
+
+
+def _copy_value(value: Any) -> str:
+    """Render one value in PostgreSQL COPY text format."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif not isinstance(value, str):
+        value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def iter_raw_documents(source: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield ``(location, json_text)`` pairs from an ingestion source.
+
+    ``source`` may be ``-`` for NDJSON on stdin, a directory of ``.json`` files
+    (one document per file) or an NDJSON file. Only one document is held in
+    memory at a time.
+    """
+    if source == "-":
+        yield from _iter_ndjson(sys.stdin, "<stdin>")
+        return
+    path = Path(source)
+    if path.is_dir():
+        for file_path in sorted(path.glob("*.json")):
+            yield str(file_path), file_path.read_text(encoding="utf-8")
+        return
+    with path.open("r", encoding="utf-8") as handle:
+        yield from _iter_ndjson(handle, str(path))
+
+
+def _iter_ndjson(handle: Iterable[str], name: str) -> Iterator[Tuple[str, str]]:
+    for line_number, line in enumerate(handle, start=1):
+        line = line.strip()
+        if line:
+            yield f"{name}:{line_number}", line
+
+
+def time_stage(items: Iterable[Any], stats: IngestStats, stage: str) -> Iterator[Any]:
+    """Pass items through while charging the time spent producing them to ``stage``."""
+    iterator = iter(items)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            stats.add_stage_time(stage, time.perf_counter() - started)
+        yield item
+
+
+def parse_documents(
+    raw_documents: Iterable[Tuple[str, str]], stats: IngestStats
+) -> Iterator[FlatAssessment]:
+    """Decode, validate and flatten raw documents, counting failures in ``stats``."""
+    for location, raw in raw_documents:
+        stats.received += 1
+        started = time.perf_counter()
+        try:
+            flat = flatten_assessment(validate_document(json.loads(raw)))
+        except (ValueError, ValidationError) as exc:
+            stats.record_error(f"{location}: {exc}")
+            continue
+        finally:
+            stats.add_stage_time("validate", time.perf_counter() - started)
+        yield flat
+
+
+def _parse_chunk(
+    chunk: List[Tuple[str, str]]
+) -> Tuple[List[FlatAssessment], IngestStats]:
+    """Worker entry point: parse one chunk and return its rows and counters."""
+    stats = IngestStats()
+    return list(parse_documents(chunk, stats)), stats
+
+
+def parallel_parse_documents(
+    raw_documents: Iterable[Tuple[str, str]],
+    stats: IngestStats,
+    workers: int,
+    chunk_size: int = 500,
+) -> Iterator[FlatAssessment]:
+    """
+    Like parse_documents(), but decode and validate in a process pool.
+
+    Raw documents are sent to the workers in chunks of ``chunk_size``. At most
+    two chunks per worker are in flight, so memory stays bounded, and results
+    are yielded in input order to the single writer in the calling process.
+    """
+    raw_iterator = iter(raw_documents)
+
+    def next_chunk() -> List[Tuple[str, str]]:
+        started = time.perf_counter()
+        chunk = list(itertools.islice(raw_iterator, chunk_size))
+        stats.add_stage_time("read", time.perf_counter() - started)
+        return chunk
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: deque = deque()
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < workers * 2:
+                chunk = next_chunk()
+                if not chunk:
+                    exhausted = True
+                    break
+                in_flight.append(executor.submit(_parse_chunk, chunk))
+            if not in_flight:
+                return
+            flats, chunk_stats = in_flight.popleft().result()
+            stats.merge(chunk_stats)
+            yield from flats
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most ``size`` items."""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def copy_rows(
+    connection: Connection,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+) -> int:
+    """
+    Stream rows into a table with COPY FROM STDIN and return the row count.
+
+    The rows are buffered in memory, so callers should pass one batch at a time.
+    """
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+        count += 1
+    if not count:
+        return 0
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer
+        )
+    finally:
+        cursor.close()
+    return count
+
+
+class BulkAssessmentLoader:
+    """
+    Load assessment documents into the assessment tables with COPY.
+
+    Each call to load() or load_flattened() runs in a single transaction, so a
+    batch is either stored completely or not at all. Assessments whose content
+    hash is already stored, or repeated within the batch, are skipped and
+    counted as duplicates. Concurrent loaders racing on the same document are
+    stopped by the unique index on ``assessments.content_hash``.
+
+    Attributes:
+        engine: The SQLAlchemy engine used to open connections.
+        schema (str): The database schema holding the assessment tables.
+    """
+
+    def __init__(self, engine: Engine, schema: str = DEFAULT_SCHEMA_NAME):
+        self.engine = engine
+        self.schema = schema
+        self._sequences: Dict[str, str] = {}
+
+    def _table(self, name: str) -> str:
+        return f"{self.schema}.{name}"
+
+    def _allocate_ids(self, connection: Connection, table: str, count: int) -> List[int]:
+        """Reserve ``count`` primary keys from the serial sequence of ``table``."""
+        if not count:
+            return []
+        sequence = self._sequences.get(table)
+        if sequence is None:
+            sequence = connection.execute(
+                text("SELECT pg_get_serial_sequence(:table, 'id')"),
+                {"table": table},
+            ).scalar_one()
+            self._sequences[table] = sequence
+        result = connection.execute(
+            text("SELECT nextval(:sequence) FROM generate_series(1, :count)"),
+            {"sequence": sequence, "count": count},
+        )
+        return [row[0] for row in result]
+
+    def _drop_duplicates(
+        self, connection: Connection, batch: Sequence[FlatAssessment]
+    ) -> List[FlatAssessment]:
+        """Remove assessments that repeat within the batch or are already stored."""
+        unique: Dict[str, FlatAssessment] = {}
+        for item in batch:
+            unique.setdefault(item.content_hash, item)
+        if not unique:
+            return []
+        stored = connection.execute(
+            text(
+                f"SELECT content_hash FROM {self._table('assessments')} "
+                "WHERE content_hash = ANY(:hashes)"
+            ),
+            {"hashes": list(unique)},
+        ).scalars()
+        for stored_hash in stored:
+            del unique[stored_hash]
+        return list(unique.values())
+
+    def write_batch(
+        self, connection: Connection, batch: Sequence[FlatAssessment]
+    ) -> IngestStats:
+        """
+        Write flattened assessments on an open connection and return counters
+        for the batch. The caller owns the transaction.
+        """
+        stats = IngestStats(received=len(batch))
+        batch = self._drop_duplicates(connection, batch)
+        stats.duplicates = stats.received - len(batch)
+        stats.loaded = len(batch)
+        if not batch:
+            return stats
+        assessments_table = self._table("assessments")
+        creators_table = self._table("assessment_creators")
+        software_table = self._table("assessment_software")
+        checks_table = self._table("assessment_checks")
+
+        assessment_ids = self._allocate_ids(connection, assessments_table, len(batch))
+        creator_ids = iter(
+            self._allocate_ids(
+                connection, creators_table, sum(len(item.creators) for item in batch)
+            )
+        )
+        software_ids = iter(self._allocate_ids(connection, software_table, len(batch)))
+        check_ids = iter(
+            self._allocate_ids(
+                connection, checks_table, sum(len(item.checks) for item in batch)
+            )
+        )
+
+        copy_rows(
+            connection,
+            assessments_table,
+            ASSESSMENT_COLUMNS,
+            ((pk,) + item.assessment for pk, item in zip(assessment_ids, batch)),
+        )
+        copy_rows(
+            connection,
+            creators_table,
+            CREATOR_COLUMNS,
+            (
+                (next(creator_ids), pk) + creator
+                for pk, item in zip(assessment_ids, batch)
+                for creator in item.creators
+            ),
+        )
+        copy_rows(
+            connection,
+            software_table,
+            SOFTWARE_COLUMNS,
+            ((next(software_ids), pk) + item.software for pk, item in zip(assessment_ids, batch)),
+        )
+        stats.checks = copy_rows(
+            connection,
+            checks_table,
+            CHECK_COLUMNS,
+            (
+                (next(check_ids), pk) + check
+                for pk, item in zip(assessment_ids, batch)
+                for check in item.checks
+            ),
+        )
+        return stats
+
+    def load_flattened(self, batch: Sequence[FlatAssessment]) -> IngestStats:
+        """Write already flattened assessments in one transaction."""
+        started = time.perf_counter()
+        with self.engine.begin() as connection:
+            stats = self.write_batch(connection, batch)
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def ingest(
+        self,
+        assessments: Iterable[FlatAssessment],
+        batch_size: int = 1000,
+        commit_interval: int = 1,
+        stats: Optional[IngestStats] = None,
+    ) -> IngestStats:
+        """
+        Write a stream of flattened assessments over a single connection.
+
+        The stream is consumed ``batch_size`` assessments at a time and the
+        transaction is committed every ``commit_interval`` batches, so memory
+        use does not depend on the length of the stream.
+        """
+        stats = stats if stats is not None else IngestStats()
+        started = time.perf_counter()
+        pending = IngestStats()
+        with self.engine.connect() as connection:
+            for number, batch in enumerate(batched(assessments, batch_size), start=1):
+                write_started = time.perf_counter()
+                pending.merge(self.write_batch(connection, batch))
+                if number % commit_interval == 0:
+                    connection.commit()
+                    self._count_written(stats, pending)
+                    pending = IngestStats()
+                stats.add_stage_time("write", time.perf_counter() - write_started)
+            connection.commit()
+            self._count_written(stats, pending)
+        stats.seconds += time.perf_counter() - started
+        return stats
+
+    @staticmethod
+    def _count_written(stats: IngestStats, written: IngestStats) -> None:
+        # ``received`` is already counted by the parse stage.
+        stats.loaded += written.loaded
+        stats.duplicates += written.duplicates
+        stats.checks += written.checks
+
+    def load(self, documents: Iterable[Dict[str, Any]]) -> IngestStats:
+        """
+        Validate, flatten and write a batch of decoded JSON-LD documents.
+
+        Invalid documents are skipped and counted; the valid ones are written in
+        a single transaction.
+        """
+        stats = IngestStats()
+        started = time.perf_counter()
+        batch: List[FlatAssessment] = []
+        for index, document in enumerate(documents):
+            stats.received += 1
+            try:
+                batch.append(flatten_assessment(validate_document(document)))
+            except ValidationError as exc:
+                stats.record_error(f"document {index}: {exc}")
+        with self.engine.begin() as connection:
+            self._count_written(stats, self.write_batch(connection, batch))
+        stats.seconds = time.perf_counter() - started
+        return stats
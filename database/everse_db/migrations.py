@@ -0,0 +1,150 @@
+"""
+Module: migrations
+Applies the SQL schema scripts (sql/schema/NNN_*.sql) that are new or changed.
+
+The sha256 of every applied script is recorded in ``public.schema_migrations``.
+A run compares the scripts on disk with that table. When a script is new or
+its checksum changed, it and every later script are applied again: later
+scripts build on the objects of earlier ones (views on tables, grants on
+views), and a changed table script may have replaced objects they created.
+Redeploying an unchanged schema therefore executes nothing and takes none of
+the locks of ``CREATE OR REPLACE VIEW``, ``CREATE TRIGGER`` or ``CREATE POLICY``.
+
+Everything runs in one transaction under a transaction-level advisory lock, so
+init jobs started in parallel apply the scripts once, one after the other, and
+a failing script leaves the schema and the bookkeeping unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+MIGRATIONS_TABLE = "public.schema_migrations"
+#: pg_advisory_xact_lock key shared by every migration run ("EVERSE" in hex).
+LOCK_KEY = 0x455645525345
+DEFAULT_SQL_DIR = Path(__file__).resolve().parent.parent / "sql" / "schema"
+
+
+@dataclass
+class Migration:
+    """One schema script and whether it must be applied."""
+
+    filename: str
+    path: Path
+    checksum: str
+    applied_checksum: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        if self.applied_checksum is None:
+            return "new"
+        return "applied" if self.applied_checksum == self.checksum else "changed"
+
+
+def file_checksum(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class MigrationRunner:
+    """
+    Apply new and changed schema scripts once per database.
+
+    Attributes:
+        engine: The SQLAlchemy engine of the target database; its user must
+            own the schema objects.
+        sql_dir (Path): Directory holding the numbered ``*.sql`` scripts.
+    """
+
+    def __init__(self, engine: Engine, sql_dir: Path = DEFAULT_SQL_DIR):
+        self.engine = engine
+        self.sql_dir = Path(sql_dir)
+
+    def _ensure_table(self, connection: Connection) -> None:
+        connection.execute(
+            text(
+                f"""
+                CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+                  filename TEXT PRIMARY KEY,
+                  checksum TEXT NOT NULL,
+                  applied_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                  execution_ms INTEGER NOT NULL
+                )
+                """
+            )
+        )
+
+    def _applied(self, connection: Connection) -> Dict[str, str]:
+        if not connection.execute(
+            text("SELECT to_regclass(:table) IS NOT NULL"), {"table": MIGRATIONS_TABLE}
+        ).scalar():
+            return {}
+        rows = connection.execute(text(f"SELECT filename, checksum FROM {MIGRATIONS_TABLE}"))
+        return dict(rows.all())
+
+    def scripts(self, connection: Optional[Connection] = None) -> List[Migration]:
+        """The scripts in name order with the checksum each was last applied with."""
+        if connection is None:
+            with self.engine.connect() as own_connection:
+                return self.scripts(own_connection)
+        applied = self._applied(connection)
+        return [
+            Migration(path.name, path, file_checksum(path), applied.get(path.name))
+            for path in sorted(self.sql_dir.glob("*.sql"))
+        ]
+
+    @staticmethod
+    def pending(scripts: List[Migration], reapply_all: bool = False) -> List[Migration]:
+        """The first new or changed script and everything after it."""
+        for index, script in enumerate(scripts):
+            if reapply_all or script.state != "applied":
+                return scripts[index:]
+        return []
+
+    def migrate(self, reapply_all: bool = False, progress=print) -> List[Migration]:
+        """Apply the pending scripts in one transaction; return them."""
+        with self.engine.connect() as connection:
+            with connection.begin():
+                connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": LOCK_KEY})
+                # Read the state only once the lock is held: a run that held it
+                # before may just have applied the same scripts.
+                pending = self.pending(self.scripts(connection), reapply_all)
+                if not pending:
+                    return []
+                self._ensure_table(connection)
+                cursor = connection.connection.cursor()
+                try:
+                    for script in pending:
+                        progress(f"Applying {script.filename} ({script.state})")
+                        started = time.perf_counter()
+                        # The scripts hold several statements and DO blocks;
+                        # psycopg2 sends them as they are without parameters.
+                        cursor.execute(script.path.read_text(encoding="utf-8"))
+                        elapsed = int((time.perf_counter() - started) * 1000)
+                        connection.execute(
+                            text(
+                                f"""
+                                INSERT INTO {MIGRATIONS_TABLE}
+                                  (filename, checksum, applied_at, execution_ms)
+                                VALUES (:filename, :checksum, now(), :elapsed)
+                                ON CONFLICT (filename) DO UPDATE
+                                SET checksum = EXCLUDED.checksum,
+                                    applied_at = EXCLUDED.applied_at,
+                                    execution_ms = EXCLUDED.execution_ms
+                                """
+                            ),
+                            {
+                                "filename": script.filename,
+                                "checksum": script.checksum,
+                                "elapsed": elapsed,
+                            },
+                        )
+                finally:
+                    cursor.close()
+        return pending
@@ -135,6 +135,8 @@ class Assessment(Base):
     description = Column(Text, nullable=False)
     date_created = Column(DateTime(timezone=True), nullable=False)
     license_uri = Column(String, nullable=False)
+    #: SHA-256 of the canonical JSON document, used to skip re-submissions.
+    content_hash = Column(String(64), nullable=True, unique=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -166,7 +168,7 @@ class AssessmentCreator(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     assessment_id = Column(
-        Integer, ForeignKey(f"{SCHEMA_NAME}.assessments.id"), nullable=False
+        Integer, ForeignKey(f"{SCHEMA_NAME}.assessments.id"), nullable=False, index=True
     )
     type = Column(String, nullable=True)
     name = Column(String, nullable=False)
@@ -205,7 +207,7 @@ class AssessmentCheck(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     assessment_id = Column(
-        Integer, ForeignKey(f"{SCHEMA_NAME}.assessments.id"), nullable=False
+        Integer, ForeignKey(f"{SCHEMA_NAME}.assessments.id"), nullable=False, index=True
     )
     type = Column(String, nullable=True)
     indicator_uri = Column(String, nullable=False)
@@ -5,7 +5,7 @@ Indicator model with Pydantic validation and SQLAlchemy persistence.
 from typing import Any, Dict, Optional
 from datetime import datetime
 from pydantic import BaseModel as PydanticBaseModel
-from sqlalchemy import Column, String, Integer, Text, DateTime
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import JSONB
 from .base import Base
 
@@ -19,6 +19,7 @@ class IndicatorModel(PydanticBaseModel):
     description: Optional[str] = None
     status: Optional[str] = None
     quality_dimension: Optional[str] = None
+    dimension_id: Optional[int] = None
     contact: Optional[Dict[str, Any]] = None
     source: Optional[Dict[str, Any]] = None
 
@@ -38,6 +39,10 @@ class Indicator(Base):
     description = Column(Text)
     status = Column(String)
     quality_dimension = Column(String)
+    # resolved from quality_dimension by a database trigger
+    dimension_id = Column(
+        Integer, ForeignKey(f"{SCHEMA_NAME}.dimensions.id", ondelete="SET NULL"), index=True
+    )
     contact = Column(JSONB)
     source = Column(JSONB)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,233 @@
+"""
+Module: parquet_export
+Writes the check and assessment views and the reference tables to Parquet.
+
+Each relation is read through a server-side cursor, ``row_group_size`` rows at
+a time, and every chunk is written as one Parquet row group, so memory stays
+bounded by a single row group however many checks there are. Column types are
+taken from the catalog rather than guessed from the rows, which keeps the
+schema identical across row groups and files. The low-cardinality columns of
+DICTIONARY_COLUMNS are dictionary encoded in Arrow and in Parquet; JSONB
+columns are exported as JSON text.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+#: Views and tables that can be exported, in export order.
+EXPORTS = (
+    "checks_detailed",
+    "assessments_detailed",
+    "software",
+    "dimensions",
+    "indicators",
+    "indicator_dimensions",
+)
+#: Columns repeated across millions of rows with a few thousand distinct values.
+DICTIONARY_COLUMNS = frozenset(
+    {
+        "indicator_id",
+        "status",
+        "software_name",
+        "check_type",
+        "checking_software",
+        "process",
+        "quality_dimension",
+        "dimension_name",
+    }
+)
+DEFAULT_ROW_GROUP_SIZE = 100_000
+COMPRESSIONS = ("zstd", "snappy", "gzip", "none")
+
+#: PostgreSQL type (format_type without modifiers) -> Arrow type.
+ARROW_TYPES = {
+    "smallint": pa.int16(),
+    "integer": pa.int32(),
+    "bigint": pa.int64(),
+    "real": pa.float32(),
+    "double precision": pa.float64(),
+    "boolean": pa.bool_(),
+    "date": pa.date32(),
+    "timestamp without time zone": pa.timestamp("us"),
+    "timestamp with time zone": pa.timestamp("us", tz="UTC"),
+    "text": pa.string(),
+    "character varying": pa.string(),
+    "character varying[]": pa.list_(pa.string()),
+    "text[]": pa.list_(pa.string()),
+}
+
+
+@dataclass
+class ExportResult:
+    """Outcome of exporting one relation."""
+
+    name: str
+    path: Path
+    rows: int
+    row_groups: int
+    bytes: int
+    seconds: float
+
+
+def relation_columns(connection: Connection, schema: str, name: str) -> List[Tuple[str, str]]:
+    """Names and PostgreSQL types (without modifiers) of the columns of a view or table."""
+    rows = connection.execute(
+        text(
+            """
+            SELECT a.attname, format_type(a.atttypid, NULL)
+            FROM pg_attribute a
+            WHERE a.attrelid = to_regclass(:relation)
+              AND a.attnum > 0 AND NOT a.attisdropped
+            ORDER BY a.attnum
+            """
+        ),
+        {"relation": f"{schema}.{name}"},
+    ).all()
+    if not rows:
+        raise ValueError(f"Relation {schema}.{name} does not exist")
+    return [(column, type_) for column, type_ in rows]
+
+
+def arrow_field(column: str, pg_type: str) -> pa.Field:
+    """The Arrow field for a column; types without a mapping are exported as text."""
+    if column in DICTIONARY_COLUMNS and pg_type in ("text", "character varying"):
+        return pa.field(column, pa.dictionary(pa.int32(), pa.string()))
+    return pa.field(column, ARROW_TYPES.get(pg_type, pa.string()))
+
+
+def select_statement(schema: str, name: str, columns: Sequence[Tuple[str, str]]) -> str:
+    """SELECT of ``columns``, casting those without an Arrow mapping to text."""
+    expressions = [
+        f'"{column}"' if pg_type in ARROW_TYPES else f'"{column}"::text AS "{column}"'
+        for column, pg_type in columns
+    ]
+    return f"SELECT {', '.join(expressions)} FROM {schema}.{name}"
+
+
+def _record_batch(rows: List[tuple], schema: pa.Schema) -> pa.RecordBatch:
+    arrays = []
+    for index, field in enumerate(schema):
+        values = [row[index] for row in rows]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def query_columns(
+    connection: Connection, sql: str, params: Dict[str, Any]
+) -> List[Tuple[str, str]]:
+    """Names and PostgreSQL types of the columns ``sql`` returns, without reading rows."""
+    result = connection.execute(text(f"SELECT * FROM ({sql}) AS query LIMIT 0"), params)
+    description = result.cursor.description
+    result.close()
+    type_names = dict(
+        connection.execute(
+            text("SELECT oid::integer, format_type(oid, NULL) FROM pg_type WHERE oid = ANY(:oids)"),
+            {"oids": sorted({column[1] for column in description})},
+        ).all()
+    )
+    return [(column[0], type_names[column[1]]) for column in description]
+
+
+def write_parquet(
+    connection: Connection,
+    sql: str,
+    params: Dict[str, Any],
+    columns: Sequence[Tuple[str, str]],
+    path: Path,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    compression: str = "zstd",
+) -> Tuple[int, int]:
+    """
+    Stream the rows of ``sql`` into ``path``, one row group per fetched chunk.
+
+    ``columns`` are the names and PostgreSQL types of the result, e.g. from
+    relation_columns or query_columns. Returns the rows and row groups written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write next to the target so an interrupted export never replaces a good file.
+    temporary = path.with_name(f"{path.name}.tmp")
+    schema = pa.schema([arrow_field(column, pg_type) for column, pg_type in columns])
+    result = connection.execute(
+        text(sql),
+        params,
+        execution_options={"stream_results": True, "max_row_buffer": row_group_size},
+    )
+    dictionary_columns = [field.name for field in schema if pa.types.is_dictionary(field.type)]
+    rows = row_groups = 0
+    with pq.ParquetWriter(
+        temporary,
+        schema,
+        compression=None if compression == "none" else compression,
+        use_dictionary=dictionary_columns,
+    ) as writer:
+        for chunk in result.partitions(row_group_size):
+            writer.write_batch(_record_batch(chunk, schema), row_group_size=len(chunk))
+            rows += len(chunk)
+            row_groups += 1
+    os.replace(temporary, path)
+    return rows, row_groups
+
+
+class ParquetExporter:
+    """
+    Stream views and tables into one Parquet file each.
+
+    Attributes:
+        db: The EverseDB to export from; reads use ``db.read_connection()``,
+            so a replica serves the export when one is configured.
+        output_dir (Path): Directory receiving ``<name>.parquet``.
+        row_group_size (int): Rows fetched per round trip and per row group.
+        compression (str): Parquet compression codec, or ``none``.
+    """
+
+    def __init__(
+        self,
+        db,
+        output_dir: Path,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "zstd",
+    ):
+        self.db = db
+        self.output_dir = Path(output_dir)
+        self.row_group_size = row_group_size
+        self.compression = compression
+
+    def export(self, name: str) -> ExportResult:
+        """Write ``name`` to ``<output_dir>/<name>.parquet``."""
+        started = time.perf_counter()
+        path = self.output_dir / f"{name}.parquet"
+        with self.db.read_connection() as connection:
+            columns = relation_columns(connection, self.db.schema, name)
+            rows, row_groups = write_parquet(
+                connection,
+                select_statement(self.db.schema, name, columns),
+                {},
+                columns,
+                path,
+                self.row_group_size,
+                self.compression,
+            )
+        return ExportResult(
+            name=name,
+            path=path,
+            rows=rows,
+            row_groups=row_groups,
+            bytes=path.stat().st_size,
+            seconds=round(time.perf_counter() - started, 3),
+        )
+
+    def export_all(self, names: Sequence[str] = EXPORTS) -> Dict[str, ExportResult]:
+        return {name: self.export(name) for name in names}
@@ -0,0 +1,180 @@
+"""
+Module: partitions
+Manages the monthly partitions of assessment_raw and check_facts.
+
+Both tables are range partitioned on ``created_at`` (sql/schema/002). Every
+assessment_raw partition has a check_facts partition with the same name suffix
+and bounds, e.g. ``assessment_raw_p202501`` and ``check_facts_p202501``, so a
+month of history is retired by detaching two tables instead of deleting rows.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .config import DEFAULT_SCHEMA_NAME
+
+PARENT_TABLE = "assessment_raw"
+#: Tables partitioned alongside assessment_raw; detached before it.
+DEPENDENT_TABLES = ("check_facts",)
+RETIRE_MODES = ("detach", "archive", "drop")
+
+_RANGE_BOUND = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+def _parse_bound(value: str) -> Optional[datetime]:
+    """Parse one side of a partition bound; MINVALUE/MAXVALUE become None."""
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(value.strip("'"))
+
+
+@dataclass
+class Partition:
+    """One partition of assessment_raw and the range of created_at it holds."""
+
+    name: str
+    lower: Optional[datetime]
+    upper: Optional[datetime]
+    is_default: bool
+    estimated_rows: int
+
+    @property
+    def suffix(self) -> str:
+        return self.name[len(PARENT_TABLE) + 1 :]
+
+
+class PartitionManager:
+    """
+    Create, list and retire assessment partitions.
+
+    Attributes:
+        engine: The SQLAlchemy engine used for partition DDL.
+        schema (str): The schema holding the partitioned tables.
+    """
+
+    def __init__(self, engine: Engine, schema: str = DEFAULT_SCHEMA_NAME):
+        self.engine = engine
+        self.schema = schema
+
+    def ensure(self, months_ahead: int = 3, months_back: int = 0) -> List[str]:
+        """
+        Create the monthly partitions from ``months_back`` months ago to
+        ``months_ahead`` months from now; return the new tables.
+        """
+        with self.engine.begin() as connection:
+            rows = connection.execute(
+                text(
+                    f"SELECT * FROM {self.schema}.ensure_assessment_partitions("
+                    ":months_ahead, :months_back)"
+                ),
+                {"months_ahead": months_ahead, "months_back": months_back},
+            )
+            return [row[0] for row in rows]
+
+    def list_partitions(self) -> List[Partition]:
+        """Partitions of assessment_raw ordered by their lower bound, default last."""
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                text(
+                    """
+                    SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint
+                    FROM pg_inherits h
+                    JOIN pg_class c ON c.oid = h.inhrelid
+                    JOIN pg_class p ON p.oid = h.inhparent
+                    JOIN pg_namespace n ON n.oid = p.relnamespace
+                    WHERE n.nspname = :schema AND p.relname = :parent
+                    """
+                ),
+                {"schema": self.schema, "parent": PARENT_TABLE},
+            ).all()
+        partitions = []
+        for name, bound, reltuples in rows:
+            match = _RANGE_BOUND.search(bound)
+            partitions.append(
+                Partition(
+                    name=name,
+                    lower=_parse_bound(match.group(1)) if match else None,
+                    upper=_parse_bound(match.group(2)) if match else None,
+                    is_default=match is None,
+                    estimated_rows=max(reltuples, 0),
+                )
+            )
+        return sorted(partitions, key=lambda p: (p.is_default, p.lower or datetime.min))
+
+    def _table_exists(self, connection: Connection, name: str) -> bool:
+        return connection.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f"{self.schema}.{name}"}
+        ).scalar()
+
+    def retire(
+        self, before: datetime, mode: str = "detach", archive_schema: str = "archive"
+    ) -> List[str]:
+        """
+        Retire every partition holding only rows created before ``before``.
+
+        ``detach`` leaves the partitions as standalone tables, ``archive`` also
+        moves them to ``archive_schema`` and ``drop`` removes them. The
+        fingerprints of retired assessments are deleted, so their content can
+        be submitted again. Each month is retired in its own transaction.
+        Detaching bypasses the rollup triggers, so the month's rollup counts
+        are subtracted first in the same transaction; only writers to the
+        retired partitions wait for it.
+        """
+        if mode not in RETIRE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(RETIRE_MODES)}")
+        retired = []
+        for partition in self.list_partitions():
+            if partition.is_default or partition.upper is None or partition.upper > before:
+                continue
+            conditions = ["created_at < :upper"]
+            if partition.lower is not None:
+                conditions.append("created_at >= :lower")
+            with self.engine.begin() as connection:
+                connection.execute(
+                    text(
+                        f"DELETE FROM {self.schema}.assessment_fingerprints "
+                        f"WHERE {' AND '.join(conditions)}"
+                    ),
+                    {"lower": partition.lower, "upper": partition.upper},
+                )
+                facts = f"{DEPENDENT_TABLES[0]}_{partition.suffix}"
+                connection.execute(
+                    text(
+                        f"SELECT {self.schema}.subtract_partition_rollups("
+                        "CAST(:raw AS regclass), CAST(:facts AS regclass))"
+                    ),
+                    {
+                        "raw": f'{self.schema}."{partition.name}"',
+                        "facts": (
+                            f'{self.schema}."{facts}"'
+                            if self._table_exists(connection, facts)
+                            else None
+                        ),
+                    },
+                )
+                for parent in DEPENDENT_TABLES + (PARENT_TABLE,):
+                    name = f"{parent}_{partition.suffix}"
+                    if not self._table_exists(connection, name):
+                        continue
+                    connection.execute(
+                        text(
+                            f"ALTER TABLE {self.schema}.{parent} "
+                            f'DETACH PARTITION {self.schema}."{name}"'
+                        )
+                    )
+                    if mode == "archive":
+                        connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+                        connection.execute(
+                            text(f'ALTER TABLE {self.schema}."{name}" SET SCHEMA "{archive_schema}"')
+                        )
+                    elif mode == "drop":
+                        connection.execute(text(f'DROP TABLE {self.schema}."{name}"'))
+                    retired.append(name)
+        return retired
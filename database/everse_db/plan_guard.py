@@ -0,0 +1,225 @@
+"""
+Module: plan_guard
+Detects plan regressions in the query catalog by comparing EXPLAIN output.
+
+Each catalog query is explained with ``EXPLAIN (FORMAT JSON)`` and reduced to
+its shape: node types, join types, scanned relations and indexes, without
+costs or row counts. Partitions are folded into their parent table and the
+identical children of an Append are collapsed, so adding a month of
+partitions does not change a shape. The shape's hash is the query's
+fingerprint.
+
+A query whose fingerprint differs from the baseline is ``changed``. It is
+``degraded`` when a table read through an index in the baseline is now
+sequentially scanned, or when hash or merge joins were replaced by nested
+loops. It is ``costlier`` when the planner's total cost grew by more than the
+threshold.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .config import DEFAULT_SCHEMA_NAME
+from .query_catalog import CatalogQuery, dashboard_queries
+
+#: Plan node fields that make up a shape.
+SHAPE_KEYS = (
+    "Node Type",
+    "Join Type",
+    "Strategy",
+    "Partial Mode",
+    "Relation Name",
+    "Index Name",
+    "CTE Name",
+    "Subplan Name",
+)
+INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Heap Scan")
+SET_JOINS = ("Hash Join", "Merge Join")
+APPEND_NODES = ("Append", "Merge Append")
+DEFAULT_COST_THRESHOLD = 0.25
+
+# assessment_raw_p202501 -> assessment_raw, check_facts_default_pkey -> check_facts_pkey
+_PARTITION_PART = re.compile(r"_(p\d{6}|default|legacy)(?=_|$)")
+
+
+def _fold_partition(name: str) -> str:
+    return _PARTITION_PART.sub("", name)
+
+
+def plan_shape(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an EXPLAIN JSON plan node and its children to their shape."""
+    shape = {}
+    for key in SHAPE_KEYS:
+        if key in node:
+            value = node[key]
+            shape[key] = _fold_partition(value) if key in ("Relation Name", "Index Name") else value
+    children = [plan_shape(child) for child in node.get("Plans", [])]
+    if node["Node Type"] in APPEND_NODES:
+        # One child per partition; keep each distinct shape once.
+        unique = {json.dumps(child, sort_keys=True): child for child in children}
+        children = [unique[key] for key in sorted(unique)]
+    if children:
+        shape["Plans"] = children
+    return shape
+
+
+def fingerprint(shape: Dict[str, Any]) -> str:
+    """Stable hash of a plan shape."""
+    return hashlib.sha256(json.dumps(shape, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def render_shape(shape: Dict[str, Any], depth: int = 0) -> List[str]:
+    """Indented one-line-per-node rendering of a shape, for diffs."""
+    details = " ".join(
+        f"{key}={shape[key]}" for key in SHAPE_KEYS[1:] if key in shape
+    )
+    lines = [f"{'  ' * depth}{shape['Node Type']} {details}".rstrip()]
+    for child in shape.get("Plans", []):
+        lines += render_shape(child, depth + 1)
+    return lines
+
+
+def _walk(shape: Dict[str, Any]):
+    yield shape
+    for child in shape.get("Plans", []):
+        yield from _walk(child)
+
+
+def degradations(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Reasons why ``current`` is a worse plan shape than ``baseline``."""
+    def scans(shape):
+        found: Dict[str, set] = {}
+        for node in _walk(shape):
+            if "Relation Name" in node:
+                found.setdefault(node["Relation Name"], set()).add(node["Node Type"])
+        return found
+
+    reasons = []
+    before, after = scans(baseline), scans(current)
+    for relation, methods in sorted(after.items()):
+        previous = before.get(relation, set())
+        # Partitions of one table may mix scan methods; flag losing every index scan.
+        if "Seq Scan" in methods and previous & set(INDEX_SCANS) and not methods & set(INDEX_SCANS):
+            reasons.append(f"sequential scan on {relation} replaced an index scan")
+
+    joins_before = Counter(node["Node Type"] for node in _walk(baseline))
+    joins_after = Counter(node["Node Type"] for node in _walk(current))
+    set_joins_lost = sum(joins_before[j] for j in SET_JOINS) - sum(joins_after[j] for j in SET_JOINS)
+    loops_gained = joins_after["Nested Loop"] - joins_before["Nested Loop"]
+    if set_joins_lost > 0 and loops_gained > 0:
+        reasons.append(f"{min(set_joins_lost, loops_gained)} hash/merge join(s) became nested loops")
+    return reasons
+
+
+@dataclass
+class PlanResult:
+    """Outcome of comparing one query's plan with the baseline."""
+
+    name: str
+    status: str
+    fingerprint: str
+    total_cost: float
+    baseline_cost: Optional[float] = None
+    reasons: List[str] = field(default_factory=list)
+    diff: List[str] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return self.status in ("degraded", "costlier", "missing")
+
+
+class PlanGuard:
+    """
+    Explain the query catalog and compare the plans with a baseline.
+
+    Attributes:
+        engine: The SQLAlchemy engine of a seeded and analysed database.
+        schema (str): The schema holding the EVERSE tables.
+        cost_threshold (float): Allowed relative growth of the total cost.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        schema: str = DEFAULT_SCHEMA_NAME,
+        cost_threshold: float = DEFAULT_COST_THRESHOLD,
+    ):
+        self.engine = engine
+        self.schema = schema
+        self.cost_threshold = cost_threshold
+
+    def explain(self, query: CatalogQuery) -> Dict[str, Any]:
+        """Shape, fingerprint and total cost of one query's plan."""
+        with self.engine.connect() as connection:
+            plan = connection.execute(
+                text(f"EXPLAIN (FORMAT JSON) {query.sql}"), query.params
+            ).scalar_one()[0]["Plan"]
+        shape = plan_shape(plan)
+        return {
+            "fingerprint": fingerprint(shape),
+            "total_cost": plan["Total Cost"],
+            "shape": shape,
+        }
+
+    def snapshot(self, dataset: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Plans of every catalog query, in the baseline file format."""
+        with self.engine.connect() as connection:
+            server_version = connection.execute(text("SHOW server_version")).scalar_one()
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "server_version": server_version,
+            "dataset": dataset or {},
+            "queries": {
+                query.name: self.explain(query) for query in dashboard_queries(self.schema)
+            },
+        }
+
+    def compare(self, baseline: Dict[str, Any], current: Dict[str, Any]) -> List[PlanResult]:
+        """Compare a snapshot with the baseline, query by query."""
+        results = []
+        for name, plan in current["queries"].items():
+            expected = baseline["queries"].get(name)
+            result = PlanResult(name, "ok", plan["fingerprint"], plan["total_cost"])
+            if expected is None:
+                result.status = "new"
+                results.append(result)
+                continue
+            result.baseline_cost = expected["total_cost"]
+            if plan["fingerprint"] != expected["fingerprint"]:
+                result.status = "changed"
+                result.reasons = degradations(expected["shape"], plan["shape"])
+                result.diff = _diff(expected["shape"], plan["shape"])
+                if result.reasons:
+                    result.status = "degraded"
+            limit = expected["total_cost"] * (1 + self.cost_threshold)
+            if result.status != "degraded" and plan["total_cost"] > limit:
+                result.status = "costlier"
+                result.reasons.append(
+                    f"total cost {plan['total_cost']:.0f} exceeds baseline "
+                    f"{expected['total_cost']:.0f} by more than {self.cost_threshold:.0%}"
+                )
+            results.append(result)
+        for name in baseline["queries"].keys() - current["queries"].keys():
+            results.append(
+                PlanResult(name, "missing", "", 0.0, reasons=["query is no longer in the catalog"])
+            )
+        return results
+
+
+def _diff(before: Dict[str, Any], after: Dict[str, Any]) -> List[str]:
+    return list(
+        difflib.unified_diff(
+            render_shape(before), render_shape(after), "baseline", "current", lineterm=""
+        )
+    )
@@ -0,0 +1,138 @@
+"""
+Module: pool
+A QueuePool that records how connections are used, for sizing pools.
+
+Every process holding a pool can use up to ``pool_size + max_overflow``
+connections. The counters below show how close a workload gets to that: how
+long checkouts wait for a free connection, how often and how far the pool
+overflows, and how old its connections are. The auth-service image includes
+this package and uses this pool as well.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+@dataclass
+class PoolStats:
+    """Snapshot of a MonitoredQueuePool."""
+
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    peak_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_ms_total: float
+    wait_ms_max: float
+    connections_opened: int
+    connections_closed: int
+    oldest_connection_s: float
+    mean_connection_age_s: float
+
+    @property
+    def wait_ms_mean(self) -> float:
+        return self.wait_ms_total / self.checkouts if self.checkouts else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["wait_ms_mean"] = round(self.wait_ms_mean, 3)
+        return data
+
+
+class MonitoredQueuePool(QueuePool):
+    """
+    QueuePool that times checkouts and tracks overflow and connection age.
+
+    The counters belong to the pool instance, so ``engine.dispose()``, which
+    replaces the pool, starts them from zero.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._records = weakref.WeakSet()
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._peak_overflow = 0
+        self._opened = 0
+        self._closed = 0
+
+    def _create_connection(self):
+        record = super()._create_connection()
+        with self._stats_lock:
+            self._opened += 1
+            self._records.add(record)
+        return record
+
+    def _close_connection(self, connection, *args, **kwargs) -> None:
+        with self._stats_lock:
+            self._closed += 1
+        super()._close_connection(connection, *args, **kwargs)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        waited = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._peak_overflow = max(self._peak_overflow, self.overflow())
+        return record
+
+    def stats(self) -> PoolStats:
+        """Current counters; ages are over the connections still open."""
+        now = time.time()
+        with self._stats_lock:
+            # starttime is reset when a record reconnects after a recycle.
+            ages = [
+                now - record.starttime
+                for record in list(self._records)
+                if record.dbapi_connection is not None
+            ]
+            return PoolStats(
+                pool_size=self.size(),
+                max_overflow=self._max_overflow,
+                checked_out=self.checkedout(),
+                checked_in=self.checkedin(),
+                overflow=max(self.overflow(), 0),
+                peak_overflow=max(self._peak_overflow, 0),
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                wait_ms_total=round(self._wait_total, 3),
+                wait_ms_max=round(self._wait_max, 3),
+                connections_opened=self._opened,
+                connections_closed=self._closed,
+                oldest_connection_s=round(max(ages, default=0.0), 3),
+                mean_connection_age_s=round(sum(ages) / len(ages), 3) if ages else 0.0,
+            )
+
+    def reset_stats(self) -> None:
+        """Zero the counters, e.g. between load test phases."""
+        with self._stats_lock:
+            self._reset_counters()
+
+
+class MonitoredAsyncQueuePool(MonitoredQueuePool, AsyncAdaptedQueuePool):
+    """MonitoredQueuePool for asyncio engines (see async_db_helper)."""
@@ -0,0 +1,113 @@
+"""
+Module: query_catalog
+The analytical queries DashVERSE serves, used by the benchmark and plan checks.
+
+The catalog covers a full read of every view in sql/schema/006 and of the
+materialized copies the dashboards use (sql/schema/008), and the PostgREST
+requests documented in docs/API_examples.md written as the SQL PostgREST runs
+for them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from .config import DEFAULT_SCHEMA_NAME
+
+#: Views defined in sql/schema/006_create_views.sql.
+VIEWS = (
+    "assessments_detailed",
+    "checks_detailed",
+    "assessment_summary",
+    "dimension_coverage",
+    "indicator_results",
+    "software_quality_scores",
+    "assessment_trends",
+    "software_trends",
+    "dimension_trends",
+    "software_languages",
+    "common_issues",
+)
+#: Materialized views defined in sql/schema/008_create_materialized_views.sql.
+MATERIALIZED_VIEWS = (
+    "assessment_summary_mv",
+    "dimension_coverage_mv",
+    "indicator_results_mv",
+    "software_quality_scores_mv",
+    "common_issues_mv",
+)
+
+
+@dataclass(frozen=True)
+class CatalogQuery:
+    """
+    One catalog entry.
+
+    Attributes:
+        name (str): Stable key used in reports and baselines.
+        source (str): ``view``, ``materialized_view`` or ``api``.
+        sql (str): The statement, with ``:name`` bind parameters.
+        params (dict): Values for the bind parameters.
+        request (str): The PostgREST request, for API queries.
+    """
+
+    name: str
+    source: str
+    sql: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    request: str = ""
+
+
+def dashboard_queries(schema: str = DEFAULT_SCHEMA_NAME) -> List[CatalogQuery]:
+    """Return the catalog for tables in ``schema``."""
+    queries = [
+        CatalogQuery(f"view:{view}", "view", f"SELECT * FROM {schema}.{view}")
+        for view in VIEWS
+    ]
+    queries += [
+        CatalogQuery(f"mv:{view}", "materialized_view", f"SELECT * FROM {schema}.{view}")
+        for view in MATERIALIZED_VIEWS
+    ]
+    queries += [
+        CatalogQuery(
+            "api:indicators_by_dimension",
+            "api",
+            f"SELECT * FROM {schema}.indicators WHERE quality_dimension = :dimension",
+            {"dimension": "DIM-TST"},
+            "/indicators?quality_dimension=eq.DIM-TST",
+        ),
+        CatalogQuery(
+            "api:assessment_summary_by_software",
+            "api",
+            f"SELECT * FROM {schema}.assessment_summary WHERE software_name = :software_name",
+            {"software_name": "example-tool"},
+            "/assessment_summary?software_name=eq.example-tool",
+        ),
+        CatalogQuery(
+            "api:failed_checks",
+            "api",
+            f"SELECT * FROM {schema}.checks_detailed WHERE status LIKE :status",
+            {"status": "%Fail%"},
+            "/checks_detailed?status=like.*Fail*",
+        ),
+        CatalogQuery(
+            "api:software_first_page",
+            "api",
+            f"SELECT * FROM {schema}.software LIMIT 10",
+            request="/software?limit=10",
+        ),
+        CatalogQuery(
+            "api:software_second_page",
+            "api",
+            f"SELECT * FROM {schema}.software LIMIT 10 OFFSET 10",
+            request="/software?limit=10&offset=10",
+        ),
+        CatalogQuery(
+            "api:software_names",
+            "api",
+            f"SELECT name, identifier FROM {schema}.software",
+            request="/software?select=name,identifier",
+        ),
+    ]
+    return queries
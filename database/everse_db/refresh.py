@@ -0,0 +1,155 @@
+"""
+Module: refresh
+Keeps the materialized dashboard views (sql/schema/008) up to date.
+
+Every materialized view depends on a few source tables. A watermark is taken
+for each source (the id range, row count and change counter of
+``assessment_raw``; row count and latest ``updated_at`` for the small catalog
+tables) and stored per view after each refresh. Only views whose sources moved past their stored watermark are
+refreshed, using ``REFRESH MATERIALIZED VIEW CONCURRENTLY`` so dashboards keep
+reading the previous contents meanwhile.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .config import DEFAULT_SCHEMA_NAME
+
+#: Materialized view -> source tables whose changes make it stale.
+MATERIALIZED_VIEWS: Dict[str, tuple] = {
+    "assessment_summary_mv": ("assessment_raw",),
+    "dimension_coverage_mv": ("assessment_raw", "indicators", "dimensions"),
+    "indicator_results_mv": ("assessment_raw", "indicators", "dimensions"),
+    "software_quality_scores_mv": ("assessment_raw", "indicators", "dimensions"),
+    "common_issues_mv": ("assessment_raw", "indicators", "dimensions"),
+}
+
+STATE_TABLE = "public.mv_refresh_state"
+
+
+def current_watermarks(connection: Connection, schema: str = DEFAULT_SCHEMA_NAME) -> Dict[str, str]:
+    """
+    Per-source change markers.
+
+    The assessment_raw marker combines ``min(id)``/``max(id)``, ``count(*)``
+    and ``assessment_raw_changes.changes``. The counter is bumped by every
+    statement that inserts, updates or deletes rows, including transactions
+    that commit after a refresh with ids below the current maximum. The id
+    range and count also catch partitions retired without triggers.
+    ``count(*)`` scans an index of every partition, the costliest part.
+    """
+    row = connection.execute(
+        text(
+            f"""
+            SELECT
+              (SELECT COALESCE(MIN(id), 0) || '-' || COALESCE(MAX(id), 0)
+                      || '#' || COUNT(*)
+                      || '@' || (SELECT changes FROM {schema}.assessment_raw_changes)
+                 FROM {schema}.assessment_raw),
+              (SELECT COUNT(*) || '@' || COALESCE(MAX(updated_at)::text, '')
+                 FROM {schema}.indicators),
+              (SELECT COUNT(*) || '@' || COALESCE(MAX(updated_at)::text, '')
+                 FROM {schema}.dimensions)
+            """
+        )
+    ).one()
+    return {
+        "assessment_raw": row[0],
+        "indicators": row[1],
+        "dimensions": row[2],
+    }
+
+
+class MaterializedViewRefresher:
+    """
+    Refresh materialized dashboard views whose source data changed.
+
+    Attributes:
+        engine: The SQLAlchemy engine used to run refreshes.
+        schema (str): The schema holding the views and their sources.
+    """
+
+    def __init__(self, engine: Engine, schema: str = DEFAULT_SCHEMA_NAME):
+        self.engine = engine
+        self.schema = schema
+
+    def current_watermarks(self, connection: Connection) -> Dict[str, str]:
+        return current_watermarks(connection, self.schema)
+
+    def installed(self) -> bool:
+        """Whether the views and their state table exist (sql/schema/008)."""
+        with self.engine.connect() as connection:
+            return connection.execute(
+                text("SELECT to_regclass(:state) IS NOT NULL AND to_regclass(:view) IS NOT NULL"),
+                {"state": STATE_TABLE, "view": f"{self.schema}.{next(iter(MATERIALIZED_VIEWS))}"},
+            ).scalar_one()
+
+    def stored_watermarks(self, connection: Connection) -> Dict[str, Dict[str, str]]:
+        rows = connection.execute(text(f"SELECT view_name, watermarks FROM {STATE_TABLE}"))
+        return {view_name: watermarks for view_name, watermarks in rows}
+
+    def stale_views(self, connection: Connection) -> List[str]:
+        """Views with at least one source whose watermark moved since the last refresh."""
+        current = self.current_watermarks(connection)
+        stored = self.stored_watermarks(connection)
+        stale = []
+        for view_name, sources in MATERIALIZED_VIEWS.items():
+            previous = stored.get(view_name)
+            if previous is None or any(
+                previous.get(source) != current[source] for source in sources
+            ):
+                stale.append(view_name)
+        return stale
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """
+        Refresh stale views (or all of them with ``force``) and return their names.
+
+        The watermark is read before each refresh, so rows arriving during a
+        refresh are seen as new on the next run.
+        """
+        with self.engine.connect() as connection:
+            views = list(MATERIALIZED_VIEWS) if force else self.stale_views(connection)
+            connection.commit()
+            for view_name in views:
+                watermarks = self.current_watermarks(connection)
+                sources = MATERIALIZED_VIEWS[view_name]
+                connection.execute(
+                    text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self.schema}.{view_name}")
+                )
+                connection.execute(
+                    text(
+                        f"""
+                        INSERT INTO {STATE_TABLE} (view_name, watermarks, refreshed_at)
+                        VALUES (:view_name, CAST(:watermarks AS JSONB), CURRENT_TIMESTAMP)
+                        ON CONFLICT (view_name) DO UPDATE SET
+                          watermarks = EXCLUDED.watermarks,
+                          refreshed_at = EXCLUDED.refreshed_at
+                        """
+                    ),
+                    {
+                        "view_name": view_name,
+                        "watermarks": json.dumps(
+                            {source: watermarks[source] for source in sources}
+                        ),
+                    },
+                )
+                connection.commit()
+        return views
+
+
+def refresh_stale_views(engine: Engine, schema: str = DEFAULT_SCHEMA_NAME) -> Optional[List[str]]:
+    """
+    Refresh the views made stale by a load, as the ingest and import CLIs do
+    when they finish. Returns None when the views are not installed, e.g. on
+    a database created from the ORM models only.
+    """
+    refresher = MaterializedViewRefresher(engine, schema=schema)
+    if not refresher.installed():
+        return None
+    return refresher.refresh()
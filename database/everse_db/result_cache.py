@@ -0,0 +1,257 @@
+"""
+Module: result_cache
+Caches the results of the aggregate dashboard queries between ingestions.
+
+The aggregate views (dimension_coverage, software_quality_scores,
+assessment_trends, ...) only change when assessments or the indicator catalog
+change. Every cached result is stored with the data watermark it was computed
+at, the per-source markers the materialized view refresher uses
+(refresh.current_watermarks). A lookup reads the current watermark, a few
+index lookups, and serves the stored result while it matches. Once new
+assessments arrive the watermark moves and the next lookup runs the query
+again, so no explicit invalidation is needed after an ingestion.
+
+Results are kept in an in-process LRU and, optionally, in a shared backend so
+one computation serves every process: PostgresCacheBackend keeps them in the
+UNLOGGED table public.query_result_cache (sql/schema/009).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from .refresh import current_watermarks
+
+CACHE_TABLE = "public.query_result_cache"
+DEFAULT_MAX_ENTRIES = 128
+#: Views of sql/schema/006 that aggregate over every assessment.
+AGGREGATE_VIEWS = (
+    "assessment_summary",
+    "dimension_coverage",
+    "indicator_results",
+    "software_quality_scores",
+    "assessment_trends",
+    "common_issues",
+)
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    """
+    A query result and the watermark it is valid for.
+
+    Attributes:
+        columns (list): Column names.
+        rows (list): Rows as tuples.
+        watermark (str): The data watermark when the query ran.
+        source (str): Where this lookup found it: ``memory``, ``shared`` or
+            ``database`` when the query had to run.
+    """
+
+    columns: List[str]
+    rows: List[tuple]
+    watermark: str
+    source: str = "database"
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+
+@dataclass
+class CacheStats:
+    """Lookup counters of a ResultCache."""
+
+    memory_hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    backend_errors: int = 0
+    entries: int = 0
+
+
+def cache_key(sql: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """sha256 of the statement and its parameters."""
+    material = json.dumps([sql.strip(), params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def data_watermark(connection: Connection, schema: str) -> str:
+    """The watermarks of refresh.current_watermarks as one comparable string."""
+    return json.dumps(current_watermarks(connection, schema), sort_keys=True)
+
+
+def _encode_value(value: Any) -> Dict[str, str]:
+    # Keep the types the views return (numeric, timestamp) across the JSON round trip.
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Cannot cache values of type {type(value).__name__}")
+
+
+def _decode_value(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        (tag, value), = obj.items()
+        if tag == "$decimal":
+            return Decimal(value)
+        if tag == "$datetime":
+            return datetime.fromisoformat(value)
+        if tag == "$date":
+            return date.fromisoformat(value)
+    return obj
+
+
+class PostgresCacheBackend:
+    """
+    Shared cache in an UNLOGGED table on the primary.
+
+    UNLOGGED tables skip the WAL, so they are cheap to write, are not copied
+    to replicas and are emptied after a crash, all fine for a cache.
+
+    Attributes:
+        engine: The engine of the primary holding ``public.query_result_cache``.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def get(self, key: str, watermark: str) -> Optional[CachedResult]:
+        with self.engine.connect() as connection:
+            payload = connection.execute(
+                text(
+                    f"SELECT payload FROM {CACHE_TABLE} "
+                    "WHERE key = :key AND watermark = :watermark"
+                ),
+                {"key": key, "watermark": watermark},
+            ).scalar()
+        if payload is None:
+            return None
+        data = json.loads(payload, object_hook=_decode_value)
+        return CachedResult(data["columns"], [tuple(row) for row in data["rows"]], watermark)
+
+    def put(self, key: str, result: CachedResult) -> None:
+        payload = json.dumps(
+            {"columns": result.columns, "rows": result.rows}, default=_encode_value
+        )
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    f"""
+                    INSERT INTO {CACHE_TABLE} (key, watermark, payload, created_at)
+                    VALUES (:key, :watermark, :payload, now())
+                    ON CONFLICT (key) DO UPDATE SET
+                      watermark = EXCLUDED.watermark,
+                      payload = EXCLUDED.payload,
+                      created_at = EXCLUDED.created_at
+                    """
+                ),
+                {"key": key, "watermark": result.watermark, "payload": payload},
+            )
+
+    def prune(self, watermark: str) -> int:
+        """Delete entries of other watermarks; returns how many."""
+        with self.engine.begin() as connection:
+            return connection.execute(
+                text(f"DELETE FROM {CACHE_TABLE} WHERE watermark <> :watermark"),
+                {"watermark": watermark},
+            ).rowcount
+
+    def clear(self) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(text(f"DELETE FROM {CACHE_TABLE}"))
+
+
+class ResultCache:
+    """
+    Serve query results from memory or the shared backend while the data is unchanged.
+
+    Queries and watermarks run on ``db.read_connection()``, so replicas are
+    used when configured. The watermark is read before the query: rows
+    committed in between make the stored result newer than its watermark,
+    and the next lookup merely runs the query again.
+
+    Attributes:
+        db: The EverseDB to query.
+        max_entries (int): Results kept in memory; the least recently used go first.
+        backend: Optional shared cache, e.g. a PostgresCacheBackend. Its
+            failures are counted and otherwise ignored.
+    """
+
+    def __init__(self, db, max_entries: int = DEFAULT_MAX_ENTRIES, backend=None):
+        self.db = db
+        self.max_entries = max_entries
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self._stats = CacheStats()
+
+    def _remember(self, key: str, result: CachedResult) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _recall(self, key: str, watermark: str) -> Optional[CachedResult]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None or result.watermark != watermark:
+                return None
+            self._entries.move_to_end(key)
+            self._stats.memory_hits += 1
+            return replace(result, source="memory")
+
+    def fetch(self, sql: str, params: Optional[Dict[str, Any]] = None) -> CachedResult:
+        """The result of ``sql``, computed at most once per data watermark."""
+        key = cache_key(sql, params)
+        with self.db.read_connection() as connection:
+            watermark = data_watermark(connection, self.db.schema)
+            result = self._recall(key, watermark)
+            if result is not None:
+                return result
+            if self.backend is not None:
+                try:
+                    result = self.backend.get(key, watermark)
+                except DBAPIError:
+                    self._stats.backend_errors += 1
+                if result is not None:
+                    self._stats.shared_hits += 1
+                    self._remember(key, result)
+                    return replace(result, source="shared")
+            rows = connection.execute(text(sql), params or {})
+            result = CachedResult(list(rows.keys()), [tuple(row) for row in rows], watermark)
+        self._stats.misses += 1
+        self._remember(key, result)
+        if self.backend is not None:
+            try:
+                self.backend.put(key, result)
+            except (DBAPIError, TypeError):
+                self._stats.backend_errors += 1
+        return result
+
+    def view(self, name: str) -> CachedResult:
+        """Every row of the view ``name`` in the database's schema."""
+        return self.fetch(f"SELECT * FROM {self.db.schema}.{name}")
+
+    def clear(self) -> None:
+        """Forget every result, in memory and in the backend."""
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return replace(self._stats, entries=len(self._entries))
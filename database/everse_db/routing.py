@@ -0,0 +1,120 @@
+"""
+Module: routing
+Sends read-only work to read replicas and everything else to the primary.
+
+Replicas are taken in round-robin order. A replica that refuses a connection
+is skipped for ``retry_after`` seconds and the next one is tried; when no
+replica is available, reads fall back to the primary. Read connections run
+their transactions as ``READ ONLY``, so a write sent down the read path fails
+instead of silently landing on a replica.
+
+Replicas lag behind the primary. Read paths are for reports, listings and
+exports, not for reading back rows the same request just wrote.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from .pool import MonitoredQueuePool
+
+DEFAULT_RETRY_AFTER = 30.0
+
+
+class ReplicaRouter:
+    """
+    Choose the engine for read-only work.
+
+    Attributes:
+        primary: The engine of the primary; used for reads when no replica is up.
+        replicas (list): One engine per replica URL.
+        retry_after (float): Seconds a failed replica is skipped for.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replica_urls: Optional[List[str]] = None,
+        engine_options: Optional[Dict[str, Any]] = None,
+        retry_after: float = DEFAULT_RETRY_AFTER,
+    ):
+        self.primary = primary
+        self.replicas = [
+            create_engine(url, poolclass=MonitoredQueuePool, **(engine_options or {}))
+            for url in replica_urls or []
+        ]
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._next = itertools.cycle(range(len(self.replicas)))
+        # replica index -> monotonic time until which it is skipped
+        self._down_until: Dict[int, float] = {}
+
+    def _candidates(self) -> List[int]:
+        """Healthy replicas, starting with the next one in round-robin order."""
+        if not self.replicas:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._next)
+            order = [(start + offset) % len(self.replicas) for offset in range(len(self.replicas))]
+            return [index for index in order if self._down_until.get(index, 0.0) <= now]
+
+    def _mark_down(self, index: int) -> None:
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_after
+
+    @contextmanager
+    def read_connection(self) -> Iterator[Connection]:
+        """A read-only connection to a healthy replica, or to the primary."""
+        for index in self._candidates():
+            try:
+                connection = self.replicas[index].connect()
+            except OperationalError:
+                self._mark_down(index)
+                continue
+            with connection:
+                yield connection.execution_options(postgresql_readonly=True)
+            return
+        with self.primary.connect() as connection:
+            yield connection.execution_options(postgresql_readonly=True)
+
+    @contextmanager
+    def read_session(self) -> Iterator[Session]:
+        """An ORM session on a read connection; it is rolled back, never committed."""
+        with self.read_connection() as connection:
+            session = Session(bind=connection, autoflush=False)
+            try:
+                yield session
+            finally:
+                session.close()
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Host, health and pool statistics of every replica."""
+        now = time.monotonic()
+        rows = []
+        for index, engine in enumerate(self.replicas):
+            url = make_url(engine.url)
+            down_for = self._down_until.get(index, 0.0) - now
+            rows.append(
+                {
+                    "replica": f"{url.host}:{url.port or 5432}",
+                    "healthy": down_for <= 0,
+                    "skipped for (s)": round(max(down_for, 0.0), 1),
+                    "checkouts": engine.pool.stats().checkouts,
+                }
+            )
+        return rows
+
+    def dispose(self) -> None:
+        for engine in self.replicas:
+            engine.dispose()
@@ -0,0 +1,106 @@
+"""
+Module: schema_fingerprint
+Runs ``metadata.create_all`` only when the declarative models changed.
+
+``create_all`` checks every table for existence before creating it, a catalog
+round trip per table on every start. Instead, the DDL the models compile to is
+hashed and the hash stored in ``public.schema_fingerprints`` under a name per
+application. A start whose hash matches the stored one reads a single row and
+skips ``create_all``; otherwise ``create_all`` runs under an advisory lock and
+the new hash is stored. Like ``create_all``, this creates missing tables and
+indexes but never alters existing ones; columns added to existing models are
+brought in by the idempotent ``upgrades`` statements run right after it.
+
+The auth-service image includes this package and calls this module for its
+own models under the name "auth-service".
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import MetaData, text
+from sqlalchemy.engine import Connection, Dialect
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+FINGERPRINT_TABLE = "public.schema_fingerprints"
+#: pg_advisory_xact_lock key serialising create_all between processes.
+LOCK_KEY = 0x4D455441444154  # "METADAT"
+
+
+def metadata_fingerprint(metadata: MetaData, dialect: Dialect) -> str:
+    """sha256 of the CREATE TABLE and CREATE INDEX statements of ``metadata``."""
+    statements = []
+    for table in metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)).strip())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            statements.append(str(CreateIndex(index).compile(dialect=dialect)).strip())
+    return hashlib.sha256("\n".join(statements).encode("utf-8")).hexdigest()
+
+
+def stored_fingerprint(connection: Connection, name: str) -> Optional[str]:
+    """The fingerprint stored for ``name``, or None when there is none yet."""
+    try:
+        return connection.execute(
+            text(f"SELECT fingerprint FROM {FINGERPRINT_TABLE} WHERE name = :name"),
+            {"name": name},
+        ).scalar()
+    except ProgrammingError:
+        # The table does not exist before the first cold start.
+        connection.rollback()
+        return None
+
+
+def create_all_if_changed(
+    connection: Connection,
+    metadata: MetaData,
+    name: str,
+    schemas: Iterable[str] = (),
+    upgrades: Sequence[str] = (),
+) -> bool:
+    """
+    Create the tables of ``metadata`` (and ``schemas``) unless the stored
+    fingerprint for ``name`` matches, then run the ``upgrades`` statements
+    (e.g. ``ADD COLUMN IF NOT EXISTS``). Returns whether ``create_all`` ran.
+    """
+    fingerprint = metadata_fingerprint(metadata, connection.dialect)
+    matches = stored_fingerprint(connection, name) == fingerprint
+    connection.rollback()
+    if matches:
+        return False
+
+    with connection.begin():
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": LOCK_KEY})
+        connection.execute(
+            text(
+                f"""
+                CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE} (
+                  name TEXT PRIMARY KEY,
+                  fingerprint TEXT NOT NULL,
+                  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+        )
+        # Another process may have finished while this one waited for the lock.
+        if stored_fingerprint(connection, name) == fingerprint:
+            return False
+        for schema in schemas:
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        metadata.create_all(connection)
+        for statement in upgrades:
+            connection.execute(text(statement))
+        connection.execute(
+            text(
+                f"""
+                INSERT INTO {FINGERPRINT_TABLE} (name, fingerprint, updated_at)
+                VALUES (:name, :fingerprint, now())
+                ON CONFLICT (name) DO UPDATE
+                SET fingerprint = EXCLUDED.fingerprint, updated_at = EXCLUDED.updated_at
+                """
+            ),
+            {"name": name, "fingerprint": fingerprint},
+        )
+    return True
@@ -0,0 +1,289 @@
+"""
+Module: scoring
+Computes quality scores from check_facts with NumPy and stores them in
+``api.quality_scores`` (sql/schema/010).
+
+The software_quality_scores view matches status strings with LIKE on every
+query. Here the check facts are copied out once, each column is dictionary
+encoded, and statuses and outputs are classified per distinct value rather
+than per row. A check then scores:
+
+- 1 when its status contains ``Pass``, 0 when it contains ``Fail``
+  (e.g. ``schema:FailedActionStatus``: the check could not be completed);
+- for ``schema:CompletedActionStatus``, the value of its output: 1 for
+  ``true``/``valid``/``pass``..., 0 for ``false``/``invalid``/``fail``...,
+  and a number read as a fraction (0-1) or a percentage (above 1);
+- nothing otherwise: it counts as a check but not as a scored one.
+
+Scores are the mean value of the scored checks, as a percentage, per
+software and indicator, per software and dimension, and per software. The
+software score is the mean of its dimension scores weighted by the
+dimension weights (1 unless configured, 0 leaves a dimension out). Group-bys
+are ``np.unique``/``np.bincount`` over integer codes.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from sqlalchemy import text
+
+SCORES_TABLE = "quality_scores"
+#: Columns copied out of check_facts, in COPY order.
+FACT_COLUMNS = ("software_name", "dimension", "indicator_id", "status", "output")
+
+PASS_OUTPUTS = frozenset({"true", "valid", "pass", "passed", "yes", "ok"})
+FAIL_OUTPUTS = frozenset({"false", "invalid", "fail", "failed", "no"})
+COMPLETED_STATUSES = frozenset({"schema:completedactionstatus", "completedactionstatus"})
+
+
+def status_value(status: str) -> Optional[float]:
+    """Fixed value of a status, or None when the output decides."""
+    lowered = status.lower()
+    if "pass" in lowered:
+        return 1.0
+    if "fail" in lowered:
+        return 0.0
+    return None
+
+
+def output_value(output: str) -> float:
+    """Value of the output of a completed check; NaN when it cannot be scored."""
+    lowered = output.strip().lower()
+    if lowered in PASS_OUTPUTS:
+        return 1.0
+    if lowered in FAIL_OUTPUTS:
+        return 0.0
+    try:
+        number = float(lowered)
+    except ValueError:
+        return np.nan
+    if np.isnan(number):
+        return np.nan
+    return min(max(number / 100 if number > 1 else number, 0.0), 1.0)
+
+
+def load_weights(path: str) -> Dict[str, float]:
+    """Dimension weights from a JSON object of dimension identifier -> weight."""
+    with open(path, "r", encoding="utf-8") as handle:
+        weights = json.load(handle)
+    if not isinstance(weights, dict):
+        raise ValueError(f"{path} must hold a JSON object of dimension identifier -> weight")
+    return {str(dimension): float(weight) for dimension, weight in weights.items()}
+
+
+@dataclass
+class ScoreRun:
+    """Outcome of a scoring run."""
+
+    checks: int
+    scored_checks: int
+    software: int
+    rows_written: int
+    load_seconds: float
+    compute_seconds: float
+    write_seconds: float
+
+
+def _encode(table: pa.Table, column: str) -> Tuple[np.ndarray, List[str]]:
+    """Integer codes of a string column and the distinct values they index."""
+    encoded = table.column(column).combine_chunks().dictionary_encode()
+    return encoded.indices.to_numpy(zero_copy_only=False), encoded.dictionary.to_pylist()
+
+
+def _group(keys: np.ndarray, values: np.ndarray, scored: np.ndarray):
+    """Distinct keys with their check count, scored count and sum of values."""
+    groups, inverse = np.unique(keys, return_inverse=True)
+    checks = np.bincount(inverse, minlength=len(groups))
+    scored_checks = np.bincount(inverse, weights=scored, minlength=len(groups))
+    sums = np.bincount(inverse, weights=values, minlength=len(groups))
+    return groups, checks, scored_checks.astype(np.int64), sums
+
+
+def _scores(sums: np.ndarray, scored_checks: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(scored_checks > 0, 100.0 * sums / scored_checks, np.nan)
+
+
+class ScoringEngine:
+    """
+    Score every software from its check facts and store the scores.
+
+    Attributes:
+        db: The EverseDB to score; facts are read with ``db.read_connection()``
+            and scores written to the primary.
+        weights (dict): Dimension identifier -> weight in the software score.
+    """
+
+    def __init__(self, db, weights: Optional[Dict[str, float]] = None):
+        self.db = db
+        self.weights = weights or {}
+
+    def load_facts(self) -> pa.Table:
+        """The columns of FACT_COLUMNS for every check, copied out as CSV."""
+        schema = self.db.schema
+        query = f"""
+            SELECT coalesce(f.software_name, ''), coalesce(d.identifier, ''),
+                   coalesce(f.indicator_id, ''), coalesce(f.status, ''),
+                   coalesce(left(f.output, 64), '')
+            FROM {schema}.check_facts f
+            LEFT JOIN {schema}.dimensions d ON d.id = f.dimension_id
+        """
+        with tempfile.TemporaryFile() as buffer:
+            with self.db.read_connection() as connection:
+                cursor = connection.connection.cursor()
+                try:
+                    cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", buffer)
+                finally:
+                    cursor.close()
+            if buffer.tell() == 0:
+                # No check facts yet; read_csv rejects an empty file.
+                return pa.table({column: pa.array([], pa.string()) for column in FACT_COLUMNS})
+            buffer.seek(0)
+            return pa_csv.read_csv(
+                buffer,
+                read_options=pa_csv.ReadOptions(column_names=list(FACT_COLUMNS)),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types={column: pa.string() for column in FACT_COLUMNS},
+                    quoted_strings_can_be_null=False,
+                ),
+            )
+
+    def check_values(self, facts: pa.Table) -> np.ndarray:
+        """Value of every check in [0, 1], NaN for checks that are not scored."""
+        status_codes, statuses = _encode(facts, "status")
+        output_codes, outputs = _encode(facts, "output")
+        # Classify each distinct status and output once, then index by code.
+        fixed = np.array([status_value(status) for status in statuses], dtype=float)
+        completed = np.array([status.lower() in COMPLETED_STATUSES for status in statuses])
+        by_output = np.array([output_value(output) for output in outputs])
+        values = fixed[status_codes]
+        from_output = completed[status_codes]
+        values[from_output] = by_output[output_codes[from_output]]
+        return values
+
+    def compute(self, facts: pa.Table) -> List[tuple]:
+        """Rows of (level, software_name, item, checks, scored_checks, score)."""
+        if facts.num_rows == 0:
+            return []
+        values = self.check_values(facts)
+        scored = ~np.isnan(values)
+        values = np.where(scored, values, 0.0)
+        software, software_names = _encode(facts, "software_name")
+        dimension, dimensions = _encode(facts, "dimension")
+        indicator, indicators = _encode(facts, "indicator_id")
+        software = software.astype(np.int64)
+        rows = []
+
+        groups, checks, scored_checks, sums = _group(
+            software * len(indicators) + indicator, values, scored
+        )
+        for group, count, scored_count, score in zip(
+            groups, checks, scored_checks, _scores(sums, scored_checks)
+        ):
+            name, item = divmod(int(group), len(indicators))
+            rows.append(
+                (
+                    "indicator",
+                    software_names[name],
+                    indicators[item],
+                    int(count),
+                    int(scored_count),
+                    score,
+                )
+            )
+
+        groups, checks, scored_checks, sums = _group(
+            software * len(dimensions) + dimension, values, scored
+        )
+        dimension_scores = _scores(sums, scored_checks)
+        group_software, group_dimension = np.divmod(groups, len(dimensions))
+        for name, item, count, scored_count, score in zip(
+            group_software, group_dimension, checks, scored_checks, dimension_scores
+        ):
+            if dimensions[item]:
+                rows.append(
+                    (
+                        "dimension",
+                        software_names[name],
+                        dimensions[item],
+                        int(count),
+                        int(scored_count),
+                        score,
+                    )
+                )
+
+        # Software scores: weighted mean of the scored dimension scores.
+        weights = np.array(
+            [self.weights.get(identifier, 1.0) if identifier else 0.0 for identifier in dimensions]
+        )[group_dimension]
+        weights = np.where(np.isnan(dimension_scores), 0.0, weights)
+        weighted = np.bincount(
+            group_software,
+            weights=weights * np.nan_to_num(dimension_scores),
+            minlength=len(software_names),
+        )
+        total_weight = np.bincount(group_software, weights=weights, minlength=len(software_names))
+        software_checks = np.bincount(software, minlength=len(software_names))
+        software_scored = np.bincount(software, weights=scored, minlength=len(software_names))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            software_scores = np.where(total_weight > 0, weighted / total_weight, np.nan)
+        for name, count, scored_count, score in zip(
+            software_names, software_checks, software_scored, software_scores
+        ):
+            rows.append(("software", name, "", int(count), int(scored_count), score))
+        return rows
+
+    def write(self, rows: Iterable[tuple]) -> int:
+        """Replace the contents of the scores table with ``rows`` in one transaction."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        count = 0
+        for level, software_name, item, checks, scored_checks, score in rows:
+            score = "" if np.isnan(score) else f"{score:.2f}"
+            writer.writerow([level, software_name, item, checks, scored_checks, score])
+            count += 1
+        buffer.seek(0)
+        table = f"{self.db.schema}.{SCORES_TABLE}"
+        with self.db.engine.begin() as connection:
+            # TRUNCATE makes readers wait for the commit instead of seeing an empty table.
+            connection.execute(text(f"TRUNCATE {table}"))
+            cursor = connection.connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY {table} (level, software_name, item, checks, scored_checks, score) "
+                    "FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (software_name, item))",
+                    buffer,
+                )
+            finally:
+                cursor.close()
+        return count
+
+    def run(self) -> ScoreRun:
+        """Load, score and store; return counts and the time of each stage."""
+        started = time.perf_counter()
+        facts = self.load_facts()
+        loaded = time.perf_counter()
+        rows = self.compute(facts)
+        computed = time.perf_counter()
+        written = self.write(rows)
+        finished = time.perf_counter()
+        software_rows = [row for row in rows if row[0] == "software"]
+        return ScoreRun(
+            checks=facts.num_rows,
+            scored_checks=sum(row[4] for row in software_rows),
+            software=len(software_rows),
+            rows_written=written,
+            load_seconds=round(loaded - started, 3),
+            compute_seconds=round(computed - loaded, 3),
+            write_seconds=round(finished - computed, 3),
+        )
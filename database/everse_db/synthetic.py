@@ -0,0 +1,532 @@
+"""
+Module: synthetic
+High-volume synthetic data for load testing.
+
+Reference tables (dimensions, indicators, software, content_relation) are small
+and generated in the calling process. Assessments and their creators, software
+and checks are generated in chunks by worker processes, each chunk with its own
+seed derived from the base seed and the chunk number, so the output does not
+depend on the number of workers. Workers write CSV files which the calling
+process loads with COPY.
+
+The ``layout`` setting selects where assessments go: the normalised ORM tables,
+``assessment_raw`` as JSON-LD payloads (which the dashboard views read), or
+both. Raw payloads carry the same values as the normalised rows.
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Sequence, Tuple
+
+from faker import Faker
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .config import DEFAULT_SCHEMA_NAME
+
+CHECK_DISTRIBUTIONS = ("uniform", "normal", "fixed")
+LAYOUTS = ("normalized", "raw", "both")
+CONTEXT_URI = "https://w3id.org/everse/rsqa/0.0.1/"
+INDICATOR_BASE_URI = "https://w3id.org/everse/i/indicators/"
+DIMENSION_BASE_URI = "https://w3id.org/everse/i/dimensions/"
+STATUSES = ("schema:CompletedActionStatus", "schema:FailedActionStatus")
+OUTPUTS = ("true", "valid", "false")
+#: Number of distinct fake strings drawn once per worker and reused.
+POOL_SIZE = 500
+#: Assessment dates are spread over two years from this date.
+SYNTHETIC_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SYNTHETIC_SPAN = timedelta(days=730)
+
+DIMENSION_COLUMNS = ("id", "identifier", "name", "description", "status", "source")
+INDICATOR_COLUMNS = (
+    "id",
+    "identifier",
+    "name",
+    "description",
+    "status",
+    "quality_dimension",
+    "contact",
+    "source",
+)
+SOFTWARE_COLUMNS = (
+    "id",
+    "identifier",
+    "name",
+    "description",
+    "version",
+    "license",
+    "repository_url",
+    "homepage_url",
+    "programming_language",
+)
+CONTENT_RELATION_COLUMNS = ("indicator_id", "dimension_id", "software_id")
+ASSESSMENT_COLUMNS = (
+    "id",
+    "context",
+    "type",
+    "name",
+    "description",
+    "date_created",
+    "license_uri",
+)
+CREATOR_COLUMNS = ("assessment_id", "type", "name", "email")
+ASSESSED_SOFTWARE_COLUMNS = (
+    "assessment_id",
+    "type",
+    "name",
+    "version",
+    "url",
+    "identifier_uri",
+)
+CHECK_COLUMNS = (
+    "assessment_id",
+    "type",
+    "indicator_uri",
+    "checking_software_type",
+    "checking_software_name",
+    "checking_software_uri",
+    "checking_software_version",
+    "process",
+    "status_uri",
+    "output",
+    "evidence",
+)
+RAW_COLUMNS = ("payload", "created_at")
+#: Tables of the ORM models the generator writes, emptied by clear_tables().
+DATA_TABLES = (
+    "content_relation",
+    "assessment_checks",
+    "assessment_software",
+    "assessment_creators",
+    "assessments",
+    "indicators",
+    "dimensions",
+    "software",
+)
+#: Stored assessments and the tables derived from them (sql/schema), emptied by
+#: clear_tables() only with ``include_raw``: they hold ingested data, and do not
+#: exist in databases set up from the ORM models alone.
+RAW_TABLES = (
+    "check_facts",
+    "check_monthly_dimension",
+    "assessment_monthly_software",
+    "assessment_monthly",
+    "assessment_fingerprints",
+    "assessment_raw",
+)
+
+
+@dataclass
+class SyntheticConfig:
+    """Shape of the generated dataset."""
+
+    num_dimensions: int = 10
+    num_indicators: int = 50
+    num_software: int = 1000
+    num_content_relations: int = 1000
+    num_assessments: int = 100_000
+    #: Distinct software names that assessments are spread over.
+    num_distinct_software: int = 1000
+    #: 0 spreads assessments evenly; larger values favour the first software
+    #: names following 1 / rank ** skew, like a few heavily assessed projects.
+    software_skew: float = 0.0
+    checks_distribution: str = "uniform"
+    checks_min: int = 1
+    checks_max: int = 10
+    checks_mean: float = 5.0
+    seed: int = 0
+    workers: int = os.cpu_count() or 1
+    chunk_size: int = 10_000
+    layout: str = "normalized"
+
+
+@dataclass
+class SyntheticResult:
+    """Row counts per table and elapsed time for a generation run."""
+
+    rows: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def add(self, table: str, count: int) -> None:
+        self.rows[table] = self.rows.get(table, 0) + count
+
+
+def chunk_seed(seed: int, chunk: int) -> int:
+    """Deterministic seed for a chunk, independent of the worker that runs it."""
+    return seed * 1_000_003 + chunk
+
+
+def draw_check_count(rng: random.Random, config: SyntheticConfig) -> int:
+    """Number of checks for one assessment under the configured distribution."""
+    if config.checks_distribution == "fixed":
+        return min(max(int(round(config.checks_mean)), config.checks_min), config.checks_max)
+    if config.checks_distribution == "normal":
+        spread = max((config.checks_max - config.checks_min) / 4, 0.5)
+        value = int(round(rng.gauss(config.checks_mean, spread)))
+        return min(max(value, config.checks_min), config.checks_max)
+    return rng.randint(config.checks_min, config.checks_max)
+
+
+def software_cum_weights(count: int, skew: float) -> List[float]:
+    """Cumulative assessment frequency for ``count`` distinct software names."""
+    if skew <= 0:
+        weights = [1.0] * count
+    else:
+        weights = [1.0 / rank ** skew for rank in range(1, count + 1)]
+    return list(itertools.accumulate(weights))
+
+
+def raw_payload(assessment, creator, assessed, checks) -> Dict:
+    """JSON-LD assessment document for rows produced by generate_assessment_chunk."""
+    _, context, type_, name, description, date_created, license_uri = assessment
+    return {
+        "@context": context,
+        "@type": type_,
+        "name": name,
+        "description": description,
+        "dateCreated": date_created,
+        "license": {"@id": license_uri},
+        "author": [{"@type": creator[1], "name": creator[2], "email": creator[3]}],
+        "assessedSoftware": {
+            "@type": assessed[1],
+            "name": assessed[2],
+            "softwareVersion": assessed[3],
+            "url": assessed[4],
+            "schema:identifier": {"@id": assessed[5]},
+        },
+        "checks": [
+            {
+                "@type": check[1],
+                # Views join on the bare identifier, as in the API examples.
+                "assessesIndicator": {"@id": check[2][len(INDICATOR_BASE_URI):]},
+                "checkingSoftware": {
+                    "@type": check[3],
+                    "name": check[4],
+                    "@id": check[5],
+                    "softwareVersion": check[6],
+                },
+                "process": check[7],
+                "status": {"@id": check[8]},
+                "output": check[9],
+                "evidence": check[10],
+            }
+            for check in checks
+        ],
+    }
+
+
+def _write_csv(path: str, rows) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _pg_array(values: Sequence[str]) -> str:
+    return "{" + ",".join('"' + value.replace('"', '\\"') + '"' for value in values) + "}"
+
+
+def generate_assessment_chunk(
+    chunk: int,
+    first_id: int,
+    count: int,
+    config: SyntheticConfig,
+    indicator_identifiers: Sequence[str],
+    software_names: Sequence[str],
+    output_dir: str,
+) -> Dict[str, Tuple[str, int]]:
+    """
+    Worker entry point: write CSV files for ``count`` assessments starting at
+    ``first_id`` and return ``{table: (csv path, row count)}``.
+    """
+    rng = random.Random(chunk_seed(config.seed, chunk))
+    fake = Faker()
+    fake.seed_instance(chunk_seed(config.seed, chunk))
+    people = [(fake.name(), fake.email()) for _ in range(POOL_SIZE)]
+    sentences = [fake.sentence(nb_words=8) for _ in range(POOL_SIZE)]
+    paragraphs = [fake.paragraph(nb_sentences=3) for _ in range(POOL_SIZE)]
+    tools = [fake.word() for _ in range(50)]
+    cum_weights = software_cum_weights(len(software_names), config.software_skew)
+    span_seconds = int(SYNTHETIC_SPAN.total_seconds())
+
+    assessments, creators, assessed, checks, raw = [], [], [], [], []
+    for assessment_id in range(first_id, first_id + count):
+        date_created = SYNTHETIC_EPOCH + timedelta(seconds=rng.randrange(span_seconds))
+        first_check = len(checks)
+        assessments.append(
+            (
+                assessment_id,
+                CONTEXT_URI,
+                "SoftwareQualityAssessment",
+                f"Quality Assessment #{assessment_id}",
+                rng.choice(paragraphs),
+                date_created.isoformat(),
+                f"https://example.org/license/{assessment_id}",
+            )
+        )
+        name, email = rng.choice(people)
+        creators.append((assessment_id, "schema:Person", name, email))
+        software_name = rng.choices(software_names, cum_weights=cum_weights)[0]
+        assessed.append(
+            (
+                assessment_id,
+                "schema:SoftwareApplication",
+                software_name,
+                f"{rng.randint(0, 3)}.{rng.randint(0, 9)}.{rng.randint(0, 9)}",
+                f"https://github.com/example/{software_name}",
+                f"https://doi.org/10.1234/{assessment_id}",
+            )
+        )
+        for indicator in rng.sample(
+            indicator_identifiers,
+            min(draw_check_count(rng, config), len(indicator_identifiers)),
+        ):
+            tool = rng.choice(tools)
+            checks.append(
+                (
+                    assessment_id,
+                    "CheckResult",
+                    INDICATOR_BASE_URI + indicator,
+                    "schema:SoftwareApplication",
+                    tool,
+                    f"https://w3id.org/everse/tools/{tool}",
+                    f"0.{rng.randint(0, 99)}",
+                    rng.choice(sentences),
+                    rng.choice(STATUSES),
+                    rng.choice(OUTPUTS),
+                    rng.choice(sentences),
+                )
+            )
+        if config.layout != "normalized":
+            payload = raw_payload(assessments[-1], creators[-1], assessed[-1], checks[first_check:])
+            raw.append((json.dumps(payload), date_created.replace(tzinfo=None).isoformat()))
+
+    tables = []
+    if config.layout != "raw":
+        tables += [
+            ("assessments", assessments),
+            ("assessment_creators", creators),
+            ("assessment_software", assessed),
+            ("assessment_checks", checks),
+        ]
+    if config.layout != "normalized":
+        tables.append(("assessment_raw", raw))
+    outputs = {}
+    for table, rows in tables:
+        path = os.path.join(output_dir, f"{table}_{chunk:06d}.csv")
+        outputs[table] = (path, _write_csv(path, rows))
+    return outputs
+
+
+def clear_tables(
+    connection: Connection, schema: str = DEFAULT_SCHEMA_NAME, include_raw: bool = False
+) -> None:
+    """
+    Empty the DATA_TABLES, and the RAW_TABLES with ``include_raw``, and reset
+    their id sequences.
+    """
+    names = DATA_TABLES + RAW_TABLES if include_raw else DATA_TABLES
+    tables = ", ".join(f"{schema}.{table}" for table in names)
+    connection.execute(text(f"TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE"))
+
+
+def copy_csv(connection: Connection, table: str, columns: Sequence[str], path: str) -> None:
+    """
+    Load a CSV file into ``table`` with COPY FROM STDIN, inside the transaction
+    the caller has begun on ``connection``.
+    """
+    # The COPY runs on the DBAPI cursor, which SQLAlchemy does not track: without
+    # a transaction begun on the Connection, its commit() would not commit it.
+    if not connection.in_transaction():
+        raise RuntimeError("copy_csv needs a transaction begun on the connection")
+    cursor = connection.connection.cursor()
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as handle:
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                handle,
+            )
+    finally:
+        cursor.close()
+
+
+class SyntheticDataGenerator:
+    """
+    Generate and COPY a synthetic dataset into the EVERSE tables.
+
+    Attributes:
+        engine: The SQLAlchemy engine used for loading.
+        config (SyntheticConfig): Dataset shape and parallelism.
+        schema (str): The database schema holding the tables.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        config: SyntheticConfig,
+        schema: str = DEFAULT_SCHEMA_NAME,
+    ):
+        if config.checks_distribution not in CHECK_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown checks distribution {config.checks_distribution!r}; "
+                f"expected one of {', '.join(CHECK_DISTRIBUTIONS)}"
+            )
+        if config.layout not in LAYOUTS:
+            raise ValueError(
+                f"Unknown layout {config.layout!r}; expected one of {', '.join(LAYOUTS)}"
+            )
+        if not 1 <= config.num_distinct_software <= config.num_software:
+            raise ValueError(
+                f"num_distinct_software must be between 1 and num_software "
+                f"({config.num_software}), got {config.num_distinct_software}"
+            )
+        self.engine = engine
+        self.config = config
+        self.schema = schema
+
+    def _table(self, name: str) -> str:
+        return f"{self.schema}.{name}"
+
+    def _next_id(self, connection: Connection, table: str) -> int:
+        return connection.execute(
+            text(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {self._table(table)}")
+        ).scalar_one()
+
+    def _sync_sequence(self, connection: Connection, table: str) -> None:
+        # Rows were written with explicit ids, so move the sequence past them.
+        connection.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence(:table, 'id'), "
+                f"(SELECT COALESCE(MAX(id), 1) FROM {self._table(table)}))"
+            ),
+            {"table": self._table(table)},
+        )
+
+    def _reference_rows(self, first_ids: Dict[str, int]):
+        config = self.config
+        rng = random.Random(chunk_seed(config.seed, -1))
+        fake = Faker()
+        fake.seed_instance(chunk_seed(config.seed, -1))
+        dimension_ids = list(
+            range(first_ids["dimensions"], first_ids["dimensions"] + config.num_dimensions)
+        )
+        indicator_ids = list(
+            range(first_ids["indicators"], first_ids["indicators"] + config.num_indicators)
+        )
+        software_ids = list(
+            range(first_ids["software"], first_ids["software"] + config.num_software)
+        )
+        langs = ["Python", "JavaScript", "Go", "Rust", "Java", "C++"]
+
+        dimensions = [
+            (pk, f"DIM-{pk:06d}", fake.sentence(nb_words=2).rstrip("."),
+             fake.text(max_nb_chars=80), "Active", json.dumps({"url": fake.url()}))
+            for pk in dimension_ids
+        ]
+        indicators = [
+            (pk, f"IND-{pk:06d}", fake.sentence(nb_words=3).rstrip("."),
+             fake.text(max_nb_chars=100), "Active",
+             json.dumps({"@id": f"{DIMENSION_BASE_URI}DIM-{rng.choice(dimension_ids):06d}"}),
+             json.dumps({"name": fake.name(), "email": fake.email()}),
+             json.dumps({"url": fake.url()}))
+            for pk in indicator_ids
+        ]
+        software = [
+            (pk, f"SW-{pk:06d}", f"{fake.slug()}-{pk}", fake.text(max_nb_chars=100),
+             f"{rng.randint(0, 3)}.{rng.randint(0, 9)}.{rng.randint(0, 9)}",
+             rng.choice(["MIT", "GPL-3.0", "Apache-2.0", "BSD-3-Clause"]),
+             f"https://github.com/example/sw-{pk}", fake.url(),
+             _pg_array(rng.sample(langs, rng.randint(1, 3))))
+            for pk in software_ids
+        ]
+        relations = [
+            (rng.choice(indicator_ids), rng.choice(dimension_ids), rng.choice(software_ids))
+            for _ in range(config.num_content_relations)
+        ]
+        return dimensions, indicators, software, relations
+
+    def generate(self) -> SyntheticResult:
+        """Generate the dataset and load it; returns row counts per table."""
+        config = self.config
+        result = SyntheticResult()
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="everse-synthetic-") as output_dir, \
+                self.engine.connect() as connection:
+            with connection.begin():
+                first_ids = {
+                    table: self._next_id(connection, table)
+                    for table in ("dimensions", "indicators", "software", "assessments")
+                }
+                dimensions, indicators, software, relations = self._reference_rows(first_ids)
+                for table, columns, rows in (
+                    ("dimensions", DIMENSION_COLUMNS, dimensions),
+                    ("indicators", INDICATOR_COLUMNS, indicators),
+                    ("software", SOFTWARE_COLUMNS, software),
+                    ("content_relation", CONTENT_RELATION_COLUMNS, relations),
+                ):
+                    path = os.path.join(output_dir, f"{table}.csv")
+                    result.add(table, _write_csv(path, rows))
+                    copy_csv(connection, self._table(table), columns, path)
+                for table in ("dimensions", "indicators", "software"):
+                    self._sync_sequence(connection, table)
+
+            indicator_identifiers = [row[1] for row in indicators]
+            software_names = [row[2] for row in software][: config.num_distinct_software]
+
+            chunks = [
+                (number, first_ids["assessments"] + offset,
+                 min(config.chunk_size, config.num_assessments - offset))
+                for number, offset in enumerate(
+                    range(0, config.num_assessments, config.chunk_size)
+                )
+            ]
+            columns = {
+                "assessments": ASSESSMENT_COLUMNS,
+                "assessment_creators": CREATOR_COLUMNS,
+                "assessment_software": ASSESSED_SOFTWARE_COLUMNS,
+                "assessment_checks": CHECK_COLUMNS,
+                "assessment_raw": RAW_COLUMNS,
+            }
+            pending = iter(chunks)
+            in_flight: deque = deque()
+            with ProcessPoolExecutor(max_workers=config.workers) as executor:
+                while True:
+                    # Keep two chunks per worker queued so spooled CSV files
+                    # never pile up faster than they are loaded.
+                    for number, first_id, count in itertools.islice(
+                        pending, config.workers * 2 - len(in_flight)
+                    ):
+                        in_flight.append(
+                            executor.submit(
+                                generate_assessment_chunk, number, first_id, count,
+                                config, indicator_identifiers, software_names, output_dir,
+                            )
+                        )
+                    if not in_flight:
+                        break
+                    # One transaction per chunk, loaded in chunk order.
+                    outputs = in_flight.popleft().result()
+                    with connection.begin():
+                        for table, (path, count) in outputs.items():
+                            copy_csv(connection, self._table(table), columns[table], path)
+                            os.remove(path)
+                            result.add(table, count)
+            if config.layout != "raw":
+                with connection.begin():
+                    self._sync_sequence(connection, "assessments")
+        result.seconds = time.perf_counter() - started
+        return result
@@ -0,0 +1,92 @@
+"""
+Export the assessments and checks stored since the previous export.
+
+A watermark of the last exported assessment is kept in a state file and only
+advanced after both files are written, so a failed night is retried by the
+next run. Assessments updated or deleted after their export are not exported
+again; see everse_db/incremental_export.py.
+"""
+
+import argparse
+from tabulate import tabulate
+from everse_db.config import (
+    load_config,
+    build_database_url,
+    build_replica_urls,
+    engine_options,
+    DEFAULT_SCHEMA_NAME,
+)
+from everse_db.db_helper import EverseDB
+from everse_db.incremental_export import DEFAULT_SETTLE_SECONDS, FORMATS, IncrementalExporter
+from everse_db.parquet_export import DEFAULT_ROW_GROUP_SIZE
+
+
+def main():
+    """
+    Parse command-line arguments and export what is new since the stored watermark.
+    """
+    parser = argparse.ArgumentParser(
+        description="Export assessments and checks added since the last export."
+    )
+    parser.add_argument(
+        "--config",
+        help="Path to JSON config file. If omitted, environment variables are used.",
+        required=False,
+    )
+    parser.add_argument(
+        "--output-dir", default="export", help="Directory receiving the exported files"
+    )
+    parser.add_argument(
+        "--state-file", help="Watermark file (default: <output-dir>/watermark.json)"
+    )
+    parser.add_argument("--format", choices=FORMATS, default="ndjson", help="Output format")
+    parser.add_argument(
+        "--settle-seconds",
+        type=int,
+        default=DEFAULT_SETTLE_SECONDS,
+        help="Leave rows younger than this for the next run, so that slow "
+        "ingestion transactions are not skipped",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_ROW_GROUP_SIZE,
+        help="Rows fetched per round trip (and per Parquet row group)",
+    )
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    database_url = build_database_url(config)
+    schema_name = config.get("schema_name", DEFAULT_SCHEMA_NAME)
+
+    db = EverseDB(
+        database_url=database_url,
+        schema=schema_name,
+        engine_options=engine_options(config),
+        replica_urls=build_replica_urls(config),
+    )
+    exporter = IncrementalExporter(
+        db,
+        args.output_dir,
+        state_path=args.state_file,
+        format=args.format,
+        settle_seconds=args.settle_seconds,
+        chunk_size=args.chunk_size,
+    )
+    result = exporter.export()
+    if not result.files:
+        print(f"Nothing new since {result.after.created_at} (id {result.after.id}).")
+        return
+    rows = [
+        {"file": result.files[0], "rows": result.assessments},
+        {"file": result.files[1], "rows": result.checks},
+    ]
+    print(tabulate(rows, headers="keys", tablefmt="pretty"))
+    print(
+        f"Watermark advanced to {result.until.created_at} (id {result.until.id}) "
+        f"in {result.seconds}s."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Export the check and assessment views and the reference tables to Parquet.
+
+Rows are streamed through server-side cursors and written in row groups, so
+millions of checks export in bounded memory. See everse_db/parquet_export.py.
+"""
+
+import argparse
+from tabulate import tabulate
+from everse_db.config import (
+    load_config,
+    build_database_url,
+    build_replica_urls,
+    engine_options,
+    DEFAULT_SCHEMA_NAME,
+)
+from everse_db.db_helper import EverseDB
+from everse_db.parquet_export import (
+    COMPRESSIONS,
+    DEFAULT_ROW_GROUP_SIZE,
+    EXPORTS,
+    ParquetExporter,
+)
+
+
+def main():
+    """
+    Parse command-line arguments and export the requested relations.
+    """
+    parser = argparse.ArgumentParser(description="Export DashVERSE data to Parquet files.")
+    parser.add_argument(
+        "--config",
+        help="Path to JSON config file. If omitted, environment variables are used.",
+        required=False,
+    )
+    parser.add_argument(
+        "relations",
+        nargs="*",
+        metavar="relation",
+        help=f"Views and tables to export (default: {', '.join(EXPORTS)})",
+    )
+    parser.add_argument(
+        "--output-dir", default="export", help="Directory receiving <relation>.parquet"
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=DEFAULT_ROW_GROUP_SIZE,
+        help="Rows fetched per round trip and written per row group",
+    )
+    parser.add_argument(
+        "--compression", choices=COMPRESSIONS, default="zstd", help="Parquet compression codec"
+    )
+    args = parser.parse_args()
+    unknown = sorted(set(args.relations) - set(EXPORTS))
+    if unknown:
+        parser.error(f"cannot export {', '.join(unknown)}; choose from {', '.join(EXPORTS)}")
+
+    config = load_config(args.config)
+    database_url = build_database_url(config)
+    schema_name = config.get("schema_name", DEFAULT_SCHEMA_NAME)
+
+    db = EverseDB(
+        database_url=database_url,
+        schema=schema_name,
+        engine_options=engine_options(config),
+        replica_urls=build_replica_urls(config),
+    )
+    exporter = ParquetExporter(
+        db, args.output_dir, row_group_size=args.row_group_size, compression=args.compression
+    )
+    rows = []
+    for relation in args.relations or EXPORTS:
+        result = exporter.export(relation)
+        rows.append(
+            {
+                "relation": result.name,
+                "file": str(result.path),
+                "rows": result.rows,
+                "row groups": result.row_groups,
+                "MB": round(result.bytes / 1_000_000, 2),
+                "seconds": result.seconds,
+            }
+        )
+    print(tabulate(rows, headers="keys", tablefmt="pretty"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Import EVERSE dimensions and indicators downloaded by the sync job.
+
+Each JSON file is parsed once and validated; the rows are upserted in batches
+with multi-row INSERT ... ON CONFLICT statements. With --dry-run the SQL is
+printed instead, which is what scripts/import-everse.sh pipes into psql.
+"""
+
+import argparse
+import sys
+from everse_db.arguments import positive_int
+from everse_db.config import load_config, build_database_url, engine_options
+from everse_db.db_helper import EverseDB
+from everse_db.everse_import import import_catalog, load_catalog, render_catalog_sql
+from everse_db.refresh import refresh_stale_views
+
+
+def main():
+    """
+    Parse command-line arguments, load the catalog and apply or print it.
+    """
+    parser = argparse.ArgumentParser(
+        description="Import EVERSE dimensions and indicators into the database."
+    )
+    parser.add_argument(
+        "input_dir",
+        nargs="?",
+        default="/tmp/everse-sync",
+        help="Directory with dimensions/ and indicators/ subdirectories.",
+    )
+    parser.add_argument(
+        "--config",
+        help="Path to JSON config file. If omitted, environment variables are used.",
+        required=False,
+    )
+    parser.add_argument(
+        "--batch-size", type=positive_int, default=500, help="Rows per INSERT statement"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the SQL to stdout instead of executing it",
+    )
+    parser.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="Leave the materialized dashboard views for the next refresh-views run",
+    )
+    args = parser.parse_args()
+
+    catalog = load_catalog(args.input_dir)
+    for message in catalog.skipped:
+        print(f"Skipped {message}", file=sys.stderr)
+
+    if args.dry_run:
+        print("SET search_path TO api, public;\n")
+        print(render_catalog_sql(catalog, batch_size=args.batch_size))
+        return
+
+    config = load_config(args.config)
+    db = EverseDB(
+        database_url=build_database_url(config),
+        schema=config["schema_name"],
+        engine_options=engine_options(config),
+    )
+    counts = import_catalog(db.engine, catalog, batch_size=args.batch_size)
+    for table, count in counts.items():
+        print(f"Upserted {count} rows into {table}.")
+    if not args.no_refresh:
+        refreshed = refresh_stale_views(db.engine, db.schema)
+        if refreshed:
+            print(f"Refreshed: {', '.join(refreshed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Stream EVERSE assessment documents into the database.
+
+Documents are read from an NDJSON file, from stdin (``-``) or from a directory of
+``.json`` files and pass through a generator pipeline (parse, validate, batch,
+write), so memory use stays flat regardless of the input size. All batches share
+one database connection. With ``--workers`` the decode and validation stage runs
+in a process pool while this process stays the only database writer; the stage
+timings printed at the end show whether validation or writing is the bottleneck.
+"""
+
+import argparse
+from everse_db.arguments import non_negative_int, positive_int
+from everse_db.config import load_config, build_database_url, engine_options, DEFAULT_SCHEMA_NAME
+from everse_db.db_helper import EverseDB
+from everse_db.refresh import refresh_stale_views
+from everse_db.ingest import (
+    BulkAssessmentLoader,
+    IngestStats,
+    iter_raw_documents,
+    parallel_parse_documents,
+    parse_documents,
+    time_stage,
+)
+
+
+def print_stats(stats: IngestStats) -> None:
+    """Print a short summary of an ingestion run."""
+    print(
+        f"Received {stats.received} documents: {stats.loaded} loaded, "
+        f"{stats.duplicates} duplicates skipped, {stats.invalid} invalid, "
+        f"{stats.checks} checks."
+    )
+    print(f"Wrote {stats.rows} rows in {stats.seconds:.2f}s ({stats.rows_per_second:.0f} rows/s).")
+    throughput = stats.stage_throughput()
+    for stage, seconds in stats.stage_seconds.items():
+        print(f"  {stage:<9} {seconds:8.2f}s busy  {throughput[stage]:10.0f} docs/s")
+    for message in stats.errors:
+        print(f"  - {message}")
+
+
+def main():
+    """
+    Parse command-line arguments and ingest assessments from the given source.
+    """
+    parser = argparse.ArgumentParser(
+        description="Ingest assessments from NDJSON, stdin or a directory of JSON files."
+    )
+    parser.add_argument(
+        "source",
+        help="NDJSON file, directory of .json files, or '-' to read NDJSON from stdin.",
+    )
+    parser.add_argument(
+        "--config",
+        help="Path to JSON config file. If omitted, environment variables are used.",
+        required=False,
+    )
+    parser.add_argument(
+        "--batch-size", type=positive_int, default=1000, help="Assessments per COPY batch"
+    )
+    parser.add_argument(
+        "--commit-interval",
+        type=positive_int,
+        default=10,
+        help="Number of batches written per transaction",
+    )
+    parser.add_argument(
+        "--workers",
+        type=non_negative_int,
+        default=0,
+        help="Validate in this many worker processes (0 validates in the writer process)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=positive_int,
+        default=500,
+        help="Documents per work unit sent to a validation worker",
+    )
+    parser.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="Leave the materialized dashboard views for the next refresh-views run",
+    )
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    database_url = build_database_url(config)
+    schema_name = config.get("schema_name", DEFAULT_SCHEMA_NAME)
+
+    db = EverseDB(
+        database_url=database_url, schema=schema_name, engine_options=engine_options(config)
+    )
+    # Creates the assessment tables, or adds columns newer loaders rely on.
+    db.init_db()
+    loader = BulkAssessmentLoader(db.engine, schema=schema_name)
+
+    stats = IngestStats()
+    raw_documents = iter_raw_documents(args.source)
+    if args.workers > 0:
+        assessments = parallel_parse_documents(
+            raw_documents, stats, workers=args.workers, chunk_size=args.chunk_size
+        )
+    else:
+        assessments = parse_documents(time_stage(raw_documents, stats, "read"), stats)
+    loader.ingest(
+        assessments,
+        batch_size=args.batch_size,
+        commit_interval=args.commit_interval,
+        stats=stats,
+    )
+    print_stats(stats)
+    if not args.no_refresh:
+        refreshed = refresh_stale_views(db.engine, db.schema)
+        if refreshed:
+            print(f"Refreshed: {', '.join(refreshed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,13 @@ builds the connection string, and initializes the database schema and tables.
 """
 
 import argparse
-from everse_db.config import load_config, build_database_url, DEFAULT_SCHEMA_NAME
+from everse_db.config import (
+    load_config,
+    build_database_url,
+    build_replica_urls,
+    engine_options,
+    DEFAULT_SCHEMA_NAME,
+)
 from everse_db.db_helper import EverseDB
 
 
@@ -31,7 +37,12 @@ def main():
     # Use the provided schema name if available; otherwise, use the default.
     schema_name = config.get("schema_name", DEFAULT_SCHEMA_NAME)
 
-    db = EverseDB(database_url=database_url, schema=schema_name)
+    db = EverseDB(
+        database_url=database_url,
+        schema=schema_name,
+        engine_options=engine_options(config),
+        replica_urls=build_replica_urls(config),
+    )
     db.init_db()
     db.print_tables_and_columns()
 
@@ -0,0 +1,301 @@
+"""
+Routine database maintenance tasks for DashVERSE.
+
+Subcommands:
+  refresh-views       refresh materialized dashboard views whose sources changed
+  ensure-partitions   create assessment partitions for the coming months
+  list-partitions     show assessment partitions and their date ranges
+  retire-partitions   detach, archive or drop partitions older than a date
+  connections         compare server connections with max_connections
+  duplicates          count, or with --delete remove, stored copies of one payload
+  warm-cache          compute the aggregate views into the shared result cache
+  score               recompute api.quality_scores from the check facts
+  rebuild-rollups     recompute the monthly assessment and check rollups
+"""
+
+import argparse
+import time
+from datetime import datetime
+from sqlalchemy import text
+from tabulate import tabulate
+from everse_db.config import load_config, build_database_url, engine_options, DEFAULT_SCHEMA_NAME
+from everse_db.db_helper import EverseDB
+from everse_db.partitions import PartitionManager, RETIRE_MODES
+from everse_db.refresh import MaterializedViewRefresher
+from everse_db.scoring import ScoringEngine, load_weights
+from everse_db.result_cache import (
+    AGGREGATE_VIEWS,
+    PostgresCacheBackend,
+    ResultCache,
+    data_watermark,
+)
+
+
+def refresh_views(db: EverseDB, args) -> None:
+    """Refresh stale materialized views, or all of them with --force."""
+    refreshed = MaterializedViewRefresher(db.engine, schema=db.schema).refresh(force=args.force)
+    if refreshed:
+        print(f"Refreshed: {', '.join(refreshed)}")
+    else:
+        print("All materialized views are up to date.")
+
+
+def ensure_partitions(db: EverseDB, args) -> None:
+    """Create missing monthly partitions from --months-back to --months-ahead."""
+    manager = PartitionManager(db.engine, schema=db.schema)
+    created = manager.ensure(args.months_ahead, args.months_back)
+    if created:
+        print(f"Created: {', '.join(created)}")
+    else:
+        print("All partitions exist.")
+
+
+def list_partitions(db: EverseDB, args) -> None:
+    """Print the assessment_raw partitions with their bounds."""
+    rows = [
+        {
+            "partition": partition.name,
+            "from": "DEFAULT" if partition.is_default else partition.lower or "MINVALUE",
+            "to": "" if partition.is_default else partition.upper or "MAXVALUE",
+            "rows (est.)": partition.estimated_rows,
+        }
+        for partition in PartitionManager(db.engine, schema=db.schema).list_partitions()
+    ]
+    print(tabulate(rows, headers="keys", tablefmt="pretty"))
+
+
+def retire_partitions(db: EverseDB, args) -> None:
+    """Retire partitions whose rows were all created before --before."""
+    manager = PartitionManager(db.engine, schema=db.schema)
+    retired = manager.retire(args.before, mode=args.mode, archive_schema=args.archive_schema)
+    if retired:
+        print(f"Retired ({args.mode}): {', '.join(retired)}")
+    else:
+        print("No partitions to retire.")
+
+
+def connections(db: EverseDB, args) -> None:
+    """Print the server's connections per user and application against max_connections."""
+    with db.engine.connect() as connection:
+        max_connections = int(connection.execute(text("SHOW max_connections")).scalar_one())
+        reserved = int(
+            connection.execute(text("SHOW superuser_reserved_connections")).scalar_one()
+        )
+        rows = connection.execute(
+            text(
+                """
+                SELECT usename AS "user", application_name AS application,
+                       count(*) AS connections,
+                       count(*) FILTER (WHERE state = 'active') AS active,
+                       count(*) FILTER (WHERE state = 'idle') AS idle
+                FROM pg_stat_activity
+                WHERE backend_type = 'client backend'
+                GROUP BY 1, 2
+                ORDER BY 3 DESC
+                """
+            )
+        ).mappings().all()
+    print(tabulate([dict(row) for row in rows], headers="keys", tablefmt="pretty"))
+    in_use = sum(row["connections"] for row in rows)
+    stats = db.pool_stats()
+    print(
+        f"{in_use} of {max_connections - reserved} connections in use "
+        f"(max_connections {max_connections}, {reserved} reserved for superusers)."
+    )
+    print(
+        f"Each process with these pool settings can open up to "
+        f"{stats.pool_size + stats.max_overflow} connections "
+        f"(pool_size {stats.pool_size} + max_overflow {stats.max_overflow})."
+    )
+
+
+def duplicates(db: EverseDB, args) -> None:
+    """Report assessments repeating an older stored payload; delete them with --delete."""
+    copies = f"""
+        SELECT a.id, a.created_at
+        FROM {db.schema}.assessment_raw a
+        JOIN {db.schema}.assessment_fingerprints f ON f.content_hash = a.content_hash
+        WHERE a.id <> f.assessment_id
+    """
+    with db.engine.begin() as connection:
+        if not args.delete:
+            count = connection.execute(text(f"SELECT count(*) FROM ({copies}) c")).scalar_one()
+            print(f"{count} assessment(s) repeat an older stored payload.")
+            if count:
+                print("Run with --delete to remove them; the oldest copy is kept.")
+            return
+        # The delete triggers remove their check facts and update the rollups.
+        deleted = connection.execute(
+            text(
+                f"""
+                DELETE FROM {db.schema}.assessment_raw a
+                USING ({copies}) c
+                WHERE a.id = c.id AND a.created_at = c.created_at
+                """
+            )
+        ).rowcount
+    print(f"Deleted {deleted} duplicate assessment(s).")
+
+
+def warm_cache(db: EverseDB, args) -> None:
+    """Fill the shared result cache with the aggregate views at the current watermark."""
+    backend = PostgresCacheBackend(db.engine)
+    cache = ResultCache(db, backend=backend)
+    if args.clear:
+        cache.clear()
+    rows = []
+    for view in args.views or AGGREGATE_VIEWS:
+        started = time.perf_counter()
+        result = cache.view(view)
+        rows.append(
+            {
+                "view": view,
+                "rows": len(result.rows),
+                "source": result.source,
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+        )
+    print(tabulate(rows, headers="keys", tablefmt="pretty"))
+    with db.read_connection() as connection:
+        pruned = backend.prune(data_watermark(connection, db.schema))
+    if pruned:
+        print(f"Removed {pruned} result(s) of older data.")
+
+
+def score(db: EverseDB, args) -> None:
+    """Recompute the quality scores, weighting dimensions with --weights."""
+    weights = load_weights(args.weights) if args.weights else None
+    run = ScoringEngine(db, weights=weights).run()
+    print(
+        f"Scored {run.software} software from {run.checks} checks "
+        f"({run.scored_checks} scored); wrote {run.rows_written} rows."
+    )
+    print(
+        f"load {run.load_seconds}s, compute {run.compute_seconds}s, "
+        f"write {run.write_seconds}s"
+    )
+
+
+def rebuild_rollups(db: EverseDB, args) -> None:
+    """Recompute the monthly rollups behind assessment_trends from scratch."""
+    started = time.perf_counter()
+    with db.engine.begin() as connection:
+        connection.execute(text(f"SELECT {db.schema}.rebuild_assessment_rollups()"))
+        months = connection.execute(
+            text(f"SELECT count(*) FROM {db.schema}.assessment_monthly")
+        ).scalar()
+    print(f"Rebuilt rollups for {months} month(s) in {time.perf_counter() - started:.2f}s.")
+
+
+def main():
+    """
+    Parse command-line arguments and run the requested maintenance task.
+    """
+    parser = argparse.ArgumentParser(description="DashVERSE database maintenance.")
+    parser.add_argument(
+        "--config",
+        help="Path to JSON config file. If omitted, environment variables are used.",
+        required=False,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    refresh_parser = subparsers.add_parser(
+        "refresh-views", help="Refresh materialized views affected by new data"
+    )
+    refresh_parser.add_argument(
+        "--force", action="store_true", help="Refresh every view regardless of watermarks"
+    )
+    refresh_parser.set_defaults(handler=refresh_views)
+
+    ensure_parser = subparsers.add_parser(
+        "ensure-partitions", help="Create assessment partitions for the coming months"
+    )
+    ensure_parser.add_argument(
+        "--months-ahead", type=int, default=3, help="Months after the current one to create"
+    )
+    ensure_parser.add_argument(
+        "--months-back",
+        type=int,
+        default=0,
+        help="Months before the current one to create, e.g. before loading history",
+    )
+    ensure_parser.set_defaults(handler=ensure_partitions)
+
+    list_parser = subparsers.add_parser("list-partitions", help="Show assessment partitions")
+    list_parser.set_defaults(handler=list_partitions)
+
+    retire_parser = subparsers.add_parser(
+        "retire-partitions", help="Detach, archive or drop old assessment partitions"
+    )
+    retire_parser.add_argument(
+        "--before",
+        type=datetime.fromisoformat,
+        required=True,
+        help="Retire partitions whose rows were all created before this date (YYYY-MM-DD)",
+    )
+    retire_parser.add_argument(
+        "--mode",
+        choices=RETIRE_MODES,
+        default="detach",
+        help="detach: keep as standalone tables; archive: also move to --archive-schema; "
+        "drop: delete them",
+    )
+    retire_parser.add_argument(
+        "--archive-schema", default="archive", help="Schema receiving archived partitions"
+    )
+    retire_parser.set_defaults(handler=retire_partitions)
+
+    connections_parser = subparsers.add_parser(
+        "connections", help="Compare server connections with max_connections"
+    )
+    connections_parser.set_defaults(handler=connections)
+
+    duplicates_parser = subparsers.add_parser(
+        "duplicates", help="Count stored assessments that repeat an older payload"
+    )
+    duplicates_parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="Delete the copies, keeping the oldest assessment of each payload",
+    )
+    duplicates_parser.set_defaults(handler=duplicates)
+
+    cache_parser = subparsers.add_parser(
+        "warm-cache", help="Compute the aggregate views into the shared result cache"
+    )
+    cache_parser.add_argument(
+        "views", nargs="*", help=f"Views to cache (default: {', '.join(AGGREGATE_VIEWS)})"
+    )
+    cache_parser.add_argument(
+        "--clear", action="store_true", help="Empty the cache before filling it"
+    )
+    cache_parser.set_defaults(handler=warm_cache)
+
+    score_parser = subparsers.add_parser(
+        "score", help="Recompute api.quality_scores from the check facts"
+    )
+    score_parser.add_argument(
+        "--weights",
+        help="JSON file of dimension identifier -> weight in the software score (default 1)",
+    )
+    score_parser.set_defaults(handler=score)
+
+    rollup_parser = subparsers.add_parser(
+        "rebuild-rollups", help="Recompute the monthly rollups behind assessment_trends"
+    )
+    rollup_parser.set_defaults(handler=rebuild_rollups)
+
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    database_url = build_database_url(config)
+    schema_name = config.get("schema_name", DEFAULT_SCHEMA_NAME)
+
+    db = EverseDB(
+        database_url=database_url, schema=schema_name, engine_options=engine_options(config)
+    )
+    args.handler(db, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Apply the SQL schema scripts in sql/schema that are new or changed.
+
+Applied scripts and their checksums are recorded in public.schema_migrations,
+so redeploying an unchanged schema runs no DDL. See everse_db/migrations.py.
+"""
+
+import argparse
+import sys
+import psycopg2
+from tabulate import tabulate
+from sqlalchemy.exc import DBAPIError
+from everse_db.config import load_config, build_database_url, engine_options, DEFAULT_SCHEMA_NAME
+from everse_db.db_helper import EverseDB
+from everse_db.migrations import DEFAULT_SQL_DIR, MigrationRunner
+
+
+def main():
+    """
+    Parse command-line arguments and apply or list the schema scripts.
+    """
+    parser = argparse.ArgumentParser(description="Apply new and changed SQL schema scripts.")
+    parser.add_argument(
+        "--config",
+        help="Path to JSON config file. If omitted, environment variables are used.",
+        required=False,
+    )
+    parser.add_argument(
+        "--sql-dir", default=str(DEFAULT_SQL_DIR), help="Directory with the numbered scripts"
+    )
+    parser.add_argument(
+        "--status", action="store_true", help="Only list the scripts and their state"
+    )
+    parser.add_argument(
+        "--all", action="store_true", help="Apply every script, changed or not"
+    )
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    database_url = build_database_url(config)
+    schema_name = config.get("schema_name", DEFAULT_SCHEMA_NAME)
+
+    db = EverseDB(
+        database_url=database_url, schema=schema_name, engine_options=engine_options(config)
+    )
+    runner = MigrationRunner(db.engine, args.sql_dir)
+
+    if args.status:
+        scripts = runner.scripts()
+        pending = {script.filename for script in runner.pending(scripts, args.all)}
+        rows = [
+            {
+                "script": script.filename,
+                "state": script.state,
+                "will run": "yes" if script.filename in pending else "",
+            }
+            for script in scripts
+        ]
+        print(tabulate(rows, headers="keys", tablefmt="pretty"))
+        return
+
+    try:
+        applied = runner.migrate(reapply_all=args.all)
+    except (DBAPIError, psycopg2.Error) as exc:
+        # Scripts run on the DBAPI cursor, so their errors arrive unwrapped.
+        sys.exit(f"Migration failed, nothing was applied: {getattr(exc, 'orig', exc)}")
+    if applied:
+        print(f"Applied {len(applied)} script(s).")
+    else:
+        print("Schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
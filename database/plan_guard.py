@@ -0,0 +1,139 @@
+"""
+Check the query plans of the dashboard views and API queries against a baseline.
+
+Runs EXPLAIN for every query of everse_db/query_catalog.py, fingerprints the
+plan shapes and compares them with plan_baseline.json. Exits with status 1
+when a plan degraded (an index scan became a sequential scan, a hash or merge
+join became a nested loop), its estimated cost grew past --cost-threshold, or
+a baseline query disappeared.
+
+Plans depend on the data, so check and record baselines against the same
+seeded dataset: --load N --reset replaces the data of the target database
+with the benchmark dataset of N assessments first.
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import replace
+from tabulate import tabulate
+from everse_db.config import load_config, build_database_url, engine_options, DEFAULT_SCHEMA_NAME
+from everse_db.db_helper import EverseDB
+from everse_db.benchmark import PRODUCTION_LIKE, BenchmarkRunner
+from everse_db.plan_guard import DEFAULT_COST_THRESHOLD, PlanGuard
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plan_baseline.json")
+
+
+def main():
+    """
+    Parse command-line arguments, explain the catalog and compare or record it.
+    """
+    parser = argparse.ArgumentParser(description="Guard the query plans against regressions.")
+    parser.add_argument(
+        "--config",
+        help="Path to JSON config file. If omitted, environment variables are used.",
+        required=False,
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline plan file")
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help="Record the current plans as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--cost-threshold",
+        type=float,
+        default=DEFAULT_COST_THRESHOLD,
+        help="Allowed relative growth of a query's estimated cost (default: 0.25)",
+    )
+    parser.add_argument(
+        "--load",
+        type=int,
+        metavar="N",
+        help="Load the benchmark dataset with N assessments first (needs --reset)",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Confirm that all data in the target database may be deleted",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic dataset")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Data generation processes"
+    )
+    parser.add_argument("--diff", action="store_true", help="Print the shape diff of changed plans")
+    args = parser.parse_args()
+
+    if args.load and not args.reset:
+        sys.exit("--load deletes all data in the target database; pass --reset to confirm.")
+
+    config = load_config(args.config)
+    database_url = build_database_url(config)
+    schema_name = config.get("schema_name", DEFAULT_SCHEMA_NAME)
+
+    db = EverseDB(
+        database_url=database_url, schema=schema_name, engine_options=engine_options(config)
+    )
+    dataset = {}
+    if args.load:
+        db.init_db()
+        shape = replace(PRODUCTION_LIKE, seed=args.seed, workers=args.workers)
+        print(f"Loading {args.load} assessments...")
+        BenchmarkRunner(db.engine, schema=schema_name, dataset=shape).load(args.load)
+        dataset = {"assessments": args.load, "seed": args.seed}
+
+    guard = PlanGuard(db.engine, schema=schema_name, cost_threshold=args.cost_threshold)
+    current = guard.snapshot(dataset)
+
+    if args.write_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(current, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"Recorded {len(current['queries'])} plans in {args.baseline}")
+        return
+
+    with open(args.baseline, "r", encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    if baseline.get("dataset") and baseline["dataset"] != dataset:
+        print(
+            f"Warning: baseline was recorded on dataset {baseline['dataset']}, "
+            f"not {dataset or 'the current data'}"
+        )
+    if baseline["server_version"].split(".")[0] != current["server_version"].split(".")[0]:
+        print(
+            f"Warning: baseline was recorded on PostgreSQL {baseline['server_version']}, "
+            f"this is {current['server_version']}"
+        )
+
+    results = guard.compare(baseline, current)
+    print(
+        tabulate(
+            [
+                {
+                    "query": result.name,
+                    "status": result.status,
+                    "cost": round(result.total_cost, 1),
+                    "baseline cost": result.baseline_cost,
+                    "reasons": "; ".join(result.reasons),
+                }
+                for result in results
+            ],
+            headers="keys",
+            tablefmt="pretty",
+        )
+    )
+    if args.diff:
+        for result in results:
+            if result.diff:
+                print(f"\n{result.name}:")
+                print("\n".join(result.diff))
+
+    failed = [result.name for result in results if result.failed]
+    if failed:
+        sys.exit(f"Plan regressions in: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,22 +12,45 @@ Models populated:
   - Assessment
   - ContentRelation (relations among Indicator, Dimension, and Software)
 
-An optional command-line argument (--clear) will remove all existing entries from all tables
-and then exit without adding new entries.
+An optional command-line argument (--clear) will remove all existing entries from the tables
+above and then exit without adding new entries. --clear_raw also empties assessment_raw and
+the tables derived from it (check facts, fingerprints, monthly rollups), which hold ingested
+assessments.
+
+With --bulk the data is produced for load testing instead: worker processes generate
+chunks of assessments with deterministic per-chunk seeds and the rows are loaded with
+COPY. --checks_distribution/--checks_min/--checks_max/--checks_mean shape the number of
+checks per assessment and --num_distinct_software/--software_skew how assessments are
+spread over software.
 
 After insertion (or clearing), the script queries and prints the entries in a formatted table.
 """
 
 import argparse
+import os
 import random
 from datetime import datetime, timezone
 from faker import Faker
 from tabulate import tabulate
-from sqlalchemy import text
+from sqlalchemy import func, select
 
 # Import configuration and database helper
-from everse_db.config import load_config, build_database_url, DEFAULT_SCHEMA_NAME
+from everse_db.config import (
+    load_config,
+    build_database_url,
+    build_replica_urls,
+    engine_options,
+    DEFAULT_SCHEMA_NAME,
+)
+from everse_db.arguments import positive_int
 from everse_db.db_helper import EverseDB
+from everse_db.synthetic import (
+    CHECK_DISTRIBUTIONS,
+    LAYOUTS,
+    SyntheticConfig,
+    SyntheticDataGenerator,
+    clear_tables,
+)
 
 # Import models
 from everse_db.models.indicator import Indicator
@@ -147,53 +170,110 @@ def create_fake_content_relation(indicator_ids: list, dimension_ids: list, softw
     )
     return relation
 
-def print_entries(session, model, title: str) -> None:
+#: Rows fetched from the server per round trip when printing entries.
+PAGE_SIZE = 500
+
+def assessment_summary_query(session):
+    """
+    One query returning id, name, check count, creators and software per assessment.
+
+    Counts and names come from correlated subqueries and an outer join, so each
+    displayed assessment costs index lookups instead of lazy-loading its
+    relationships.
     """
-    Query and print all entries for a given model in a formatted table.
+    check_count = (
+        select(func.count(AssessmentCheck.id))
+        .where(AssessmentCheck.assessment_id == Assessment.id)
+        .scalar_subquery()
+    )
+    creators = (
+        select(func.string_agg(AssessmentCreator.name, ", "))
+        .where(AssessmentCreator.assessment_id == Assessment.id)
+        .scalar_subquery()
+    )
+    return (
+        session.query(
+            Assessment.id,
+            Assessment.name,
+            check_count.label("checks"),
+            creators.label("creator"),
+            AssessmentSoftware.name.label("software"),
+        )
+        .outerjoin(AssessmentSoftware, AssessmentSoftware.assessment_id == Assessment.id)
+    )
+
+def print_entries(session, model, title: str, max_rows: int = 50, page: int = 1) -> None:
     """
-    entries = session.query(model).all()
-    if not entries:
+    Print one page of entries for a given model in a formatted table.
+
+    At most ``max_rows`` rows are fetched, streamed in chunks of PAGE_SIZE, so
+    the report stays usable on tables with millions of rows.
+    """
+    total = session.query(func.count(model.id)).scalar()
+    if not total:
         print(f"\n=== {title} (No entries found) ===")
         return
 
+    if model is Assessment:
+        query = assessment_summary_query(session)
+    else:
+        query = session.query(model)
+    query = (
+        query.order_by(model.id)
+        .offset((page - 1) * max_rows)
+        .limit(max_rows)
+        .yield_per(PAGE_SIZE)
+    )
+
     data = []
     if model is Assessment:
-        for entry in entries:
-            row = {
-                "id": entry.id,
-                "name": entry.name,
-                "checks": len(entry.checks),
-                "creator": ", ".join(c.name for c in entry.creators),
-                "software": entry.assessed_software.name if entry.assessed_software else None,
-            }
-            data.append(row)
+        data = [row._asdict() for row in query]
     else:
-        for entry in entries:
+        for entry in query:
             row = {k: v for k, v in entry.__dict__.items() if not k.startswith("_")}
             data.append(row)
 
-    print(f"\n=== {title} ({len(entries)} entries) ===")
-    print(tabulate(data, headers="keys", tablefmt="pretty"))
+    shown = f"showing {len(data)} of {total} entries" if len(data) < total else f"{total} entries"
+    print(f"\n=== {title} ({shown}) ===")
+    if data:
+        print(tabulate(data, headers="keys", tablefmt="pretty"))
 
-def clear_existing_entries(session, schema: str) -> None:
+def clear_existing_entries(session, schema: str, include_raw: bool = False) -> None:
     """
-    Remove all existing entries from all tables using TRUNCATE ... CASCADE.
+    Remove all existing entries from the model tables (and, with include_raw,
+    from the stored assessments) using TRUNCATE ... CASCADE.
     """
-    truncate_query = text(f"""
-        TRUNCATE TABLE {schema}.content_relation,
-                       {schema}.assessment_checks,
-                       {schema}.assessment_software,
-                       {schema}.assessment_creators,
-                       {schema}.assessments,
-                       {schema}.indicators,
-                       {schema}.dimensions,
-                       {schema}.software
-        RESTART IDENTITY CASCADE;
-    """)
-    session.execute(truncate_query)
+    clear_tables(session.connection(), schema, include_raw=include_raw)
     session.commit()
     print("All existing entries have been cleared from the database.")
 
+def populate_bulk(db: EverseDB, args, schema: str) -> None:
+    """
+    Generate a large synthetic dataset in parallel and load it with COPY.
+    """
+    config = SyntheticConfig(
+        num_dimensions=args.num_dimension,
+        num_indicators=args.num_indicator,
+        num_software=args.num_software,
+        num_content_relations=args.num_content_relation,
+        num_assessments=args.num_assessment,
+        num_distinct_software=args.num_distinct_software or args.num_software,
+        software_skew=args.software_skew,
+        checks_distribution=args.checks_distribution,
+        checks_min=args.checks_min,
+        checks_max=args.checks_max,
+        checks_mean=args.checks_mean,
+        seed=args.seed,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        layout=args.layout,
+    )
+    result = SyntheticDataGenerator(db.engine, config, schema=schema).generate()
+    rows = [{"table": table, "rows": count} for table, count in result.rows.items()]
+    print(tabulate(rows, headers="keys", tablefmt="pretty"))
+    total = sum(result.rows.values())
+    print(f"Loaded {total} rows in {result.seconds:.1f}s ({total / max(result.seconds, 1e-9):.0f} rows/s).")
+
 def main():
     """
     Main function to parse arguments, optionally clear existing data,
@@ -212,8 +292,24 @@ def main():
     parser.add_argument("--num_software", type=int, default=5, help="Number of Software entries to create")
     parser.add_argument("--num_assessment", type=int, default=5, help="Number of Assessment entries to create")
     parser.add_argument("--num_content_relation", type=int, default=5, help="Number of ContentRelation entries to create")
-    parser.add_argument("--clear", action="store_true", help="Clear all existing entries in all tables and do not add new data")
+    parser.add_argument("--clear", action="store_true", help="Clear all existing entries in the model tables and do not add new data")
+    parser.add_argument("--clear_raw", action="store_true", help="With --clear, also empty assessment_raw and its check facts, fingerprints and rollups")
+    parser.add_argument("--max_rows", type=positive_int, default=50, help="Maximum number of entries printed per table")
+    parser.add_argument("--page", type=positive_int, default=1, help="Page of entries to print (pages are --max_rows long)")
+    parser.add_argument("--bulk", action="store_true", help="Generate in parallel worker processes and load with COPY")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for --bulk")
+    parser.add_argument("--chunk_size", type=int, default=10000, help="Assessments per worker chunk for --bulk")
+    parser.add_argument("--seed", type=int, default=0, help="Base random seed for --bulk")
+    parser.add_argument("--checks_distribution", choices=CHECK_DISTRIBUTIONS, default="uniform", help="Distribution of checks per assessment for --bulk")
+    parser.add_argument("--checks_min", type=int, default=1, help="Minimum checks per assessment for --bulk")
+    parser.add_argument("--checks_max", type=int, default=4, help="Maximum checks per assessment for --bulk")
+    parser.add_argument("--checks_mean", type=float, default=2.5, help="Mean checks per assessment (normal/fixed) for --bulk")
+    parser.add_argument("--num_distinct_software", type=int, default=None, help="Distinct software names assessed for --bulk (default: --num_software)")
+    parser.add_argument("--software_skew", type=float, default=0.0, help="Zipf-like skew of assessments over software for --bulk (0 = even)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="normalized", help="Write assessments to the normalised tables, to assessment_raw as JSON-LD (read by the dashboard views), or both, for --bulk")
     args = parser.parse_args()
+    if args.clear_raw and not args.clear:
+        parser.error("--clear_raw only applies together with --clear")
 
     # Load configuration and build database URL.
     config = load_config(args.config)
@@ -221,14 +317,22 @@ def main():
     schema_name = config.get("schema_name", DEFAULT_SCHEMA_NAME)
 
     # Initialize database.
-    db = EverseDB(database_url=database_url, schema=schema_name)
+    db = EverseDB(
+        database_url=database_url,
+        schema=schema_name,
+        engine_options=engine_options(config),
+        replica_urls=build_replica_urls(config),
+    )
     db.init_db()
     session = db.SessionLocal()
 
     try:
         if args.clear:
-            clear_existing_entries(session, schema_name)
+            clear_existing_entries(session, schema_name, include_raw=args.clear_raw)
             print("Database has been cleared. No new entries were added.")
+        elif args.bulk:
+            populate_bulk(db, args, schema_name)
+            return
         else:
             # Create Indicator entries.
             for i in range(1, args.num_indicator + 1):
@@ -265,12 +369,13 @@ def main():
                 session.add(content_relation)
             session.commit()
 
-        # Display added entries for each model.
-        print_entries(session, Indicator, "Indicators")
-        print_entries(session, Dimension, "Dimensions")
-        print_entries(session, Software, "Software")
-        print_entries(session, Assessment, "Assessments")
-        print_entries(session, ContentRelation, "Content Relations")
+        # Display added entries for each model, read from a replica if configured.
+        with db.read_session() as read_session:
+            print_entries(read_session, Indicator, "Indicators", args.max_rows, args.page)
+            print_entries(read_session, Dimension, "Dimensions", args.max_rows, args.page)
+            print_entries(read_session, Software, "Software", args.max_rows, args.page)
+            print_entries(read_session, Assessment, "Assessments", args.max_rows, args.page)
+            print_entries(read_session, ContentRelation, "Content Relations", args.max_rows, args.page)
 
     except Exception as e:
         session.rollback()
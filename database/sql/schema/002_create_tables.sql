@@ -35,19 +35,448 @@ CREATE TABLE IF NOT EXISTS indicators (
   description TEXT,
   status VARCHAR,
   quality_dimension VARCHAR,
+  dimension_id INTEGER REFERENCES dimensions(id) ON DELETE SET NULL,
   contact JSONB,
   source JSONB,
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- base table for assessment storage (resqui compatible)
+-- resolved dimension for deployments created before the column existed
+ALTER TABLE indicators
+  ADD COLUMN IF NOT EXISTS dimension_id INTEGER REFERENCES dimensions(id) ON DELETE SET NULL;
+
+-- every dimension an indicator references, in the order of quality_dimension
+-- (indicators.dimension_id is the first one)
+CREATE TABLE IF NOT EXISTS indicator_dimensions (
+  indicator_id INTEGER NOT NULL REFERENCES indicators(id) ON DELETE CASCADE,
+  dimension_id INTEGER NOT NULL REFERENCES dimensions(id) ON DELETE CASCADE,
+  position INTEGER NOT NULL,
+  PRIMARY KEY (indicator_id, dimension_id)
+);
+
+-- assessment_raw used to be a plain table. Rename an existing one so it can
+-- be attached as the first partition of the partitioned table below. Its
+-- triggers and keys are replaced by those on the parent, and check_facts
+-- (derived data) is rebuilt from it in 003.
+DO $$
+DECLARE
+  legacy REGCLASS := to_regclass('assessment_raw');
+  trg RECORD;
+BEGIN
+  IF legacy IS NULL OR (SELECT relkind FROM pg_class WHERE oid = legacy) = 'p' THEN
+    RETURN;
+  END IF;
+  DROP TABLE IF EXISTS check_facts CASCADE;
+  FOR trg IN SELECT tgname FROM pg_trigger WHERE tgrelid = legacy AND NOT tgisinternal LOOP
+    EXECUTE format('DROP TRIGGER %I ON assessment_raw', trg.tgname);
+  END LOOP;
+  DROP INDEX IF EXISTS idx_assessment_content_hash;
+  ALTER TABLE assessment_raw ADD COLUMN IF NOT EXISTS content_hash TEXT;
+  UPDATE assessment_raw SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+  ALTER TABLE assessment_raw ALTER COLUMN created_at SET NOT NULL;
+  ALTER TABLE assessment_raw DROP CONSTRAINT IF EXISTS assessment_raw_pkey;
+  ALTER INDEX IF EXISTS idx_assessment_payload RENAME TO assessment_raw_legacy_payload_idx;
+  ALTER INDEX IF EXISTS idx_assessment_created RENAME TO assessment_raw_legacy_created_idx;
+  ALTER INDEX IF EXISTS idx_assessment_software RENAME TO assessment_raw_legacy_software_idx;
+  ALTER INDEX IF EXISTS idx_assessment_checks RENAME TO assessment_raw_legacy_checks_idx;
+  ALTER TABLE assessment_raw RENAME TO assessment_raw_legacy;
+END $$;
+
+-- base table for assessment storage (resqui compatible), partitioned by month
+-- of created_at; partitions are managed by ensure_assessment_partitions()
+-- and `maintenance.py`
+CREATE SEQUENCE IF NOT EXISTS assessment_raw_id_seq;
+
 CREATE TABLE IF NOT EXISTS assessment_raw (
-  id SERIAL PRIMARY KEY,
+  id INTEGER NOT NULL DEFAULT nextval('assessment_raw_id_seq'),
   payload JSONB NOT NULL,
-  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+  content_hash TEXT,
+  created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+ALTER SEQUENCE assessment_raw_id_seq OWNED BY assessment_raw.id;
+
+-- attach a renamed pre-partitioning table, covering everything up to the end
+-- of the month of its newest row
+DO $$
+DECLARE
+  upper_bound TIMESTAMP;
+BEGIN
+  IF to_regclass('assessment_raw_legacy') IS NULL
+     OR EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass('assessment_raw_legacy')) THEN
+    RETURN;
+  END IF;
+  SELECT date_trunc('month', COALESCE(MAX(created_at), CURRENT_TIMESTAMP)) + INTERVAL '1 month'
+  INTO upper_bound FROM assessment_raw_legacy;
+  EXECUTE format(
+    'ALTER TABLE assessment_raw ATTACH PARTITION assessment_raw_legacy FOR VALUES FROM (MINVALUE) TO (%L)',
+    upper_bound
+  );
+END $$;
+
+CREATE TABLE IF NOT EXISTS assessment_raw_default PARTITION OF assessment_raw DEFAULT;
+
+-- one row per stored payload hash; a global unique index is not possible on
+-- the partitioned table, so re-submissions are detected here
+CREATE TABLE IF NOT EXISTS assessment_fingerprints (
+  content_hash TEXT PRIMARY KEY,
+  assessment_id INTEGER NOT NULL,
+  created_at TIMESTAMP NOT NULL
+);
+
+-- counts the statements that inserted, updated or deleted assessment_raw rows
+-- (bumped by the rollup triggers in 004); part of the data watermark of the
+-- materialized views and the result cache (everse_db.refresh), so updates,
+-- deletes and late commits move it even when the id range stays the same
+CREATE TABLE IF NOT EXISTS assessment_raw_changes (
+  singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+  changes BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO assessment_raw_changes DEFAULT VALUES ON CONFLICT DO NOTHING;
+
+-- sha256 of the canonical jsonb text (keys are sorted and whitespace normalised)
+CREATE OR REPLACE FUNCTION assessment_content_hash(doc JSONB)
+RETURNS TEXT AS $$
+  SELECT encode(sha256(convert_to(doc::text, 'UTF8')), 'hex');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- one row per check of every stored assessment, kept in sync by triggers on
+-- assessment_raw and indicators so dashboard views do not unnest JSONB;
+-- partitioned like assessment_raw (created_at is that of the assessment)
+CREATE TABLE IF NOT EXISTS check_facts (
+  assessment_id INTEGER NOT NULL,
+  check_index INTEGER NOT NULL,
+  created_at TIMESTAMP NOT NULL,
+  software_name TEXT,
+  software_url TEXT,
+  assessment_date TEXT,
+  date_created TIMESTAMP,
+  check_type TEXT,
+  indicator_id TEXT,
+  dimension_id INTEGER,
+  checking_software TEXT,
+  process TEXT,
+  status TEXT,
+  output TEXT,
+  evidence TEXT,
+  PRIMARY KEY (assessment_id, check_index, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS check_facts_default PARTITION OF check_facts DEFAULT;
+
+-- dimension identifiers referenced by indicators.quality_dimension, which holds
+-- a JSON-LD reference ({"@id": ".../dimensions/x"} or an array of them) or a
+-- plain identifier
+CREATE OR REPLACE FUNCTION dimension_identifiers(quality_dimension TEXT)
+RETURNS TEXT[] AS $$
+DECLARE
+  ref JSONB;
+  result TEXT[];
+BEGIN
+  IF quality_dimension IS NULL OR btrim(quality_dimension) = '' THEN
+    RETURN '{}';
+  END IF;
+  IF ltrim(quality_dimension) !~ '^[\[{"]' THEN
+    RETURN ARRAY[split_part(quality_dimension, '/', -1)];
+  END IF;
+  BEGIN
+    ref := quality_dimension::jsonb;
+  EXCEPTION WHEN invalid_text_representation THEN
+    RETURN '{}';
+  END;
+  IF jsonb_typeof(ref) <> 'array' THEN
+    ref := jsonb_build_array(ref);
+  END IF;
+  SELECT COALESCE(array_agg(identifier ORDER BY ordinality), '{}') INTO result
+  FROM (
+    SELECT NULLIF(split_part(
+             CASE jsonb_typeof(item)
+               WHEN 'object' THEN item->>'@id'
+               WHEN 'string' THEN item #>> '{}'
+             END, '/', -1), '') AS identifier,
+           ordinality
+    FROM jsonb_array_elements(ref) WITH ORDINALITY AS r(item, ordinality)
+  ) refs
+  WHERE identifier IS NOT NULL;
+  RETURN result;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- the first (primary) dimension identifier of an indicator
+CREATE OR REPLACE FUNCTION resolve_dimension_identifier(quality_dimension TEXT)
+RETURNS TEXT AS $$
+  SELECT (dimension_identifiers(quality_dimension))[1];
+$$ LANGUAGE sql IMMUTABLE;
+
+-- dateCreated as a timestamp, NULL when it is missing or not a valid date
+CREATE OR REPLACE FUNCTION safe_timestamp(value TEXT)
+RETURNS TIMESTAMP AS $$
+BEGIN
+  IF value IS NULL OR value !~ '^\d{4}-\d{2}-\d{2}' THEN
+    RETURN NULL;
+  END IF;
+  RETURN value::timestamp;
+EXCEPTION WHEN OTHERS THEN
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- check_facts rows for one assessment payload
+CREATE OR REPLACE FUNCTION extract_check_facts(raw_id INTEGER, raw_created_at TIMESTAMP, doc JSONB)
+RETURNS SETOF check_facts AS $$
+  SELECT
+    raw_id,
+    (c.ordinality - 1)::integer,
+    raw_created_at,
+    doc->'assessedSoftware'->>'name',
+    doc->'assessedSoftware'->>'url',
+    doc->>'dateCreated',
+    t.date_created,
+    c.item->>'@type',
+    c.item->'assessesIndicator'->>'@id',
+    i.dimension_id,
+    c.item->'checkingSoftware'->>'name',
+    c.item->>'process',
+    c.item->'status'->>'@id',
+    c.item->>'output',
+    c.item->>'evidence'
+  FROM (SELECT safe_timestamp(doc->>'dateCreated') AS date_created) t
+  CROSS JOIN LATERAL jsonb_array_elements(
+    CASE WHEN jsonb_typeof(doc->'checks') = 'array' THEN doc->'checks' ELSE '[]'::jsonb END
+  ) WITH ORDINALITY AS c(item, ordinality)
+  LEFT JOIN indicators i ON i.identifier = c.item->'assessesIndicator'->>'@id';
+$$ LANGUAGE sql STABLE;
+
+-- monthly rollups of assessments and checks, kept up to date by statement
+-- triggers on assessment_raw and check_facts (004) so that trend charts read
+-- one row per month instead of every stored payload; months are those of
+-- dateCreated, NULL when it is missing or invalid
+CREATE TABLE IF NOT EXISTS assessment_monthly_software (
+  month TIMESTAMP,
+  software_name TEXT,
+  assessments INTEGER NOT NULL,
+  checks BIGINT NOT NULL,
+  with_checks INTEGER NOT NULL,
+  UNIQUE NULLS NOT DISTINCT (month, software_name)
 );
 
+CREATE TABLE IF NOT EXISTS assessment_monthly (
+  month TIMESTAMP,
+  assessments INTEGER NOT NULL,
+  software_count INTEGER NOT NULL,
+  checks BIGINT NOT NULL,
+  with_checks INTEGER NOT NULL,
+  UNIQUE NULLS NOT DISTINCT (month)
+);
+
+CREATE TABLE IF NOT EXISTS check_monthly_dimension (
+  month TIMESTAMP,
+  dimension_id INTEGER,
+  checks BIGINT NOT NULL,
+  passed BIGINT NOT NULL,
+  failed BIGINT NOT NULL,
+  UNIQUE NULLS NOT DISTINCT (month, dimension_id)
+);
+
+-- month of an assessment and the length of its checks array (NULL when
+-- checks is not an array)
+CREATE OR REPLACE FUNCTION assessment_month(doc JSONB)
+RETURNS TIMESTAMP AS $$
+  SELECT date_trunc('month', safe_timestamp(doc->>'dateCreated'));
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION assessment_check_count(doc JSONB)
+RETURNS INTEGER AS $$
+  SELECT CASE WHEN jsonb_typeof(doc->'checks') = 'array'
+              THEN jsonb_array_length(doc->'checks') END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- add (sign 1) or subtract (sign -1) per month and software counts; a software
+-- is counted in a month while it has at least one assessment there. Rows are
+-- locked in key order so concurrent writers cannot deadlock.
+CREATE OR REPLACE FUNCTION apply_assessment_rollup(
+  deltas assessment_monthly_software[],
+  sign INTEGER
+)
+RETURNS VOID AS $$
+  WITH delta AS (
+    SELECT month, software_name,
+           sign * sum(assessments) AS assessments,
+           sign * sum(checks) AS checks,
+           sign * sum(with_checks) AS with_checks
+    FROM unnest(deltas)
+    GROUP BY month, software_name
+  ),
+  software AS (
+    INSERT INTO assessment_monthly_software AS t
+      (month, software_name, assessments, checks, with_checks)
+    SELECT month, software_name, assessments, checks, with_checks
+    FROM delta
+    ORDER BY month, software_name
+    ON CONFLICT (month, software_name) DO UPDATE SET
+      assessments = t.assessments + EXCLUDED.assessments,
+      checks = t.checks + EXCLUDED.checks,
+      with_checks = t.with_checks + EXCLUDED.with_checks
+    RETURNING t.month, t.software_name, t.assessments
+  ),
+  counted AS (
+    SELECT s.month,
+           sum(CASE
+                 WHEN s.assessments > 0 AND s.assessments - d.assessments <= 0 THEN 1
+                 WHEN s.assessments <= 0 AND s.assessments - d.assessments > 0 THEN -1
+                 ELSE 0
+               END) AS software_count
+    FROM software s
+    JOIN delta d ON d.software_name = s.software_name
+                AND d.month IS NOT DISTINCT FROM s.month
+    GROUP BY s.month
+  )
+  INSERT INTO assessment_monthly AS t
+    (month, assessments, software_count, checks, with_checks)
+  SELECT d.month, sum(d.assessments), coalesce(max(c.software_count), 0),
+         sum(d.checks), sum(d.with_checks)
+  FROM delta d
+  LEFT JOIN counted c ON c.month IS NOT DISTINCT FROM d.month
+  GROUP BY d.month
+  ORDER BY d.month
+  ON CONFLICT (month) DO UPDATE SET
+    assessments = t.assessments + EXCLUDED.assessments,
+    software_count = t.software_count + EXCLUDED.software_count,
+    checks = t.checks + EXCLUDED.checks,
+    with_checks = t.with_checks + EXCLUDED.with_checks;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION apply_check_rollup(deltas check_monthly_dimension[], sign INTEGER)
+RETURNS VOID AS $$
+  INSERT INTO check_monthly_dimension AS t (month, dimension_id, checks, passed, failed)
+  SELECT month, dimension_id, sign * sum(checks), sign * sum(passed), sign * sum(failed)
+  FROM unnest(deltas)
+  GROUP BY month, dimension_id
+  ORDER BY month, dimension_id
+  ON CONFLICT (month, dimension_id) DO UPDATE SET
+    checks = t.checks + EXCLUDED.checks,
+    passed = t.passed + EXCLUDED.passed,
+    failed = t.failed + EXCLUDED.failed;
+$$ LANGUAGE sql;
+
+-- recompute every rollup from assessment_raw and check_facts, e.g. after
+-- changing the rollup definitions; writers wait meanwhile
+CREATE OR REPLACE FUNCTION rebuild_assessment_rollups()
+RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE assessment_raw, check_facts IN SHARE MODE;
+  TRUNCATE assessment_monthly_software, assessment_monthly, check_monthly_dimension;
+  PERFORM apply_assessment_rollup(ARRAY(
+    SELECT ROW(assessment_month(payload), payload->'assessedSoftware'->>'name',
+               count(*), coalesce(sum(assessment_check_count(payload)), 0),
+               count(assessment_check_count(payload)))::assessment_monthly_software
+    FROM assessment_raw
+    GROUP BY assessment_month(payload), payload->'assessedSoftware'->>'name'
+  ), 1);
+  PERFORM apply_check_rollup(ARRAY(
+    SELECT ROW(date_trunc('month', date_created), dimension_id, count(*),
+               count(*) FILTER (WHERE status LIKE '%Pass%'),
+               count(*) FILTER (WHERE status LIKE '%Fail%'))::check_monthly_dimension
+    FROM check_facts
+    GROUP BY date_trunc('month', date_created), dimension_id
+  ), 1);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+-- subtract the rollups of one assessment_raw partition and its check_facts
+-- partition (NULL when there is none) before they are detached, which
+-- bypasses the triggers; writers to these partitions wait until the caller's
+-- transaction ends, other months and readers are not blocked
+CREATE OR REPLACE FUNCTION subtract_partition_rollups(
+  raw_partition REGCLASS,
+  facts_partition REGCLASS
+)
+RETURNS VOID AS $$
+BEGIN
+  EXECUTE format('LOCK TABLE %s IN SHARE MODE', raw_partition);
+  EXECUTE format($sql$
+    SELECT apply_assessment_rollup(ARRAY(
+      SELECT ROW(assessment_month(payload), payload->'assessedSoftware'->>'name',
+                 count(*), coalesce(sum(assessment_check_count(payload)), 0),
+                 count(assessment_check_count(payload)))::assessment_monthly_software
+      FROM %s
+      GROUP BY assessment_month(payload), payload->'assessedSoftware'->>'name'
+    ), -1)
+  $sql$, raw_partition);
+  IF facts_partition IS NOT NULL THEN
+    EXECUTE format('LOCK TABLE %s IN SHARE MODE', facts_partition);
+    EXECUTE format($sql$
+      SELECT apply_check_rollup(ARRAY(
+        SELECT ROW(date_trunc('month', date_created), dimension_id, count(*),
+                   count(*) FILTER (WHERE status LIKE '%%Pass%%'),
+                   count(*) FILTER (WHERE status LIKE '%%Fail%%'))::check_monthly_dimension
+        FROM %s
+        GROUP BY date_trunc('month', date_created), dimension_id
+      ), -1)
+    $sql$, facts_partition);
+  END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+-- create monthly assessment_raw partitions from months_back months before the
+-- current month to months_ahead months after it, and a check_facts partition
+-- with the same bounds for every assessment_raw partition; returns the names
+-- of created tables
+DROP FUNCTION IF EXISTS ensure_assessment_partitions(INTEGER);
+CREATE OR REPLACE FUNCTION ensure_assessment_partitions(
+  months_ahead INTEGER DEFAULT 3,
+  months_back INTEGER DEFAULT 0
+)
+RETURNS SETOF TEXT AS $$
+DECLARE
+  month_start TIMESTAMP;
+  partition_name TEXT;
+  part RECORD;
+BEGIN
+  FOR step IN -months_back..months_ahead LOOP
+    month_start := date_trunc('month', CURRENT_TIMESTAMP) + make_interval(months => step);
+    partition_name := 'assessment_raw_p' || to_char(month_start, 'YYYYMM');
+    CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+    BEGIN
+      EXECUTE format(
+        'CREATE TABLE %I PARTITION OF assessment_raw FOR VALUES FROM (%L) TO (%L)',
+        partition_name, month_start, month_start + INTERVAL '1 month'
+      );
+      RETURN NEXT partition_name;
+    EXCEPTION
+      -- overlaps the attached pre-partitioning table
+      WHEN invalid_object_definition THEN NULL;
+      -- rows for this month already landed in the default partition
+      WHEN check_violation THEN
+        RAISE WARNING 'assessment_raw_default holds rows for %, not creating %',
+          to_char(month_start, 'YYYY-MM'), partition_name;
+    END;
+  END LOOP;
+
+  FOR part IN
+    SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) AS bound
+    FROM pg_inherits h
+    JOIN pg_class c ON c.oid = h.inhrelid
+    WHERE h.inhparent = 'assessment_raw'::regclass
+      AND c.relname <> 'assessment_raw_default'
+  LOOP
+    partition_name := 'check_facts_' || substr(part.relname, length('assessment_raw_') + 1);
+    CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+    BEGIN
+      EXECUTE format('CREATE TABLE %I PARTITION OF check_facts %s', partition_name, part.bound);
+      RETURN NEXT partition_name;
+    EXCEPTION WHEN check_violation THEN
+      RAISE WARNING 'check_facts_default holds rows for %, not creating %',
+        part.bound, partition_name;
+    END;
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql SET search_path = api, public;
+
+DO $$ BEGIN PERFORM ensure_assessment_partitions(3); END $$;
+
 -- view for resqui compatibility
 -- PostgREST exposes this as /assessment endpoint
 CREATE OR REPLACE VIEW assessment AS
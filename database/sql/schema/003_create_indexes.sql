@@ -10,11 +10,68 @@ CREATE INDEX IF NOT EXISTS idx_dimensions_identifier ON dimensions(identifier);
 -- indicators indexes
 CREATE INDEX IF NOT EXISTS idx_indicators_identifier ON indicators(identifier);
 CREATE INDEX IF NOT EXISTS idx_indicators_dimension ON indicators(quality_dimension);
+CREATE INDEX IF NOT EXISTS idx_indicators_dimension_id ON indicators(dimension_id);
+CREATE INDEX IF NOT EXISTS idx_indicator_dimensions_dimension ON indicator_dimensions(dimension_id);
+
+-- resolve indicators stored before dimension_id existed
+UPDATE indicators i SET dimension_id = d.id
+FROM dimensions d
+WHERE i.dimension_id IS NULL
+  AND d.identifier = resolve_dimension_identifier(i.quality_dimension);
+
+INSERT INTO indicator_dimensions (indicator_id, dimension_id, position)
+SELECT i.id, d.id, MIN(r.ordinality)
+FROM indicators i
+CROSS JOIN LATERAL unnest(dimension_identifiers(i.quality_dimension))
+  WITH ORDINALITY AS r(identifier, ordinality)
+JOIN dimensions d ON d.identifier = r.identifier
+GROUP BY i.id, d.id
+ON CONFLICT (indicator_id, dimension_id) DO NOTHING;
 
 -- assessment indexes
 CREATE INDEX IF NOT EXISTS idx_assessment_payload ON assessment_raw USING GIN (payload);
 CREATE INDEX IF NOT EXISTS idx_assessment_created ON assessment_raw(created_at);
 
+-- content hash deduplication: hash rows stored before the column existed and
+-- fingerprint the oldest copy of each document; copies stored earlier are kept
+-- (see `maintenance.py duplicates`)
+UPDATE assessment_raw SET content_hash = assessment_content_hash(payload)
+WHERE content_hash IS NULL;
+
+INSERT INTO assessment_fingerprints (content_hash, assessment_id, created_at)
+SELECT DISTINCT ON (content_hash) content_hash, id, created_at
+FROM assessment_raw
+ORDER BY content_hash, id
+ON CONFLICT (content_hash) DO NOTHING;
+
+CREATE INDEX IF NOT EXISTS idx_assessment_fingerprints_created ON assessment_fingerprints(created_at);
+
 -- jsonb path indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_assessment_software ON assessment_raw USING GIN ((payload->'assessedSoftware'));
 CREATE INDEX IF NOT EXISTS idx_assessment_checks ON assessment_raw USING GIN ((payload->'checks'));
+
+-- check fact indexes for dashboard grouping and filtering
+CREATE INDEX IF NOT EXISTS idx_check_facts_indicator ON check_facts(indicator_id);
+CREATE INDEX IF NOT EXISTS idx_check_facts_dimension ON check_facts(dimension_id);
+CREATE INDEX IF NOT EXISTS idx_check_facts_software ON check_facts(software_name);
+CREATE INDEX IF NOT EXISTS idx_check_facts_status ON check_facts(status);
+CREATE INDEX IF NOT EXISTS idx_check_facts_date ON check_facts(date_created);
+
+-- check facts for assessments stored before the table existed
+INSERT INTO check_facts
+SELECT f.*
+FROM assessment_raw a
+CROSS JOIN LATERAL extract_check_facts(a.id, a.created_at, a.payload) f
+WHERE NOT EXISTS (
+  SELECT 1 FROM check_facts cf
+  WHERE cf.assessment_id = a.id AND cf.created_at = a.created_at
+);
+
+-- monthly rollups of assessments stored before the rollup triggers existed
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM assessment_monthly)
+     AND EXISTS (SELECT 1 FROM assessment_raw) THEN
+    PERFORM rebuild_assessment_rollups();
+  END IF;
+END $$;
@@ -25,6 +25,276 @@ CREATE TRIGGER tr_indicators_updated
   BEFORE UPDATE ON indicators
   FOR EACH ROW EXECUTE FUNCTION update_updated_at();
 
+-- content hash for every stored assessment, however it is inserted; exact
+-- re-submissions of a stored assessment are skipped, while rewriting a payload
+-- into a copy of another stored assessment is an error, as an update that
+-- silently did nothing would hide the conflict from the caller
+CREATE OR REPLACE FUNCTION assessment_hash_fn()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.content_hash = assessment_content_hash(NEW.payload);
+  IF TG_OP = 'UPDATE' THEN
+    IF NEW.content_hash IS DISTINCT FROM OLD.content_hash THEN
+      DELETE FROM assessment_fingerprints
+      WHERE content_hash = OLD.content_hash AND assessment_id = OLD.id;
+      INSERT INTO assessment_fingerprints (content_hash, assessment_id, created_at)
+      VALUES (NEW.content_hash, NEW.id, NEW.created_at)
+      ON CONFLICT (content_hash) DO NOTHING;
+      IF NOT FOUND THEN
+        RAISE EXCEPTION 'assessment % would duplicate stored assessment %', OLD.id, (
+          SELECT assessment_id FROM assessment_fingerprints
+          WHERE content_hash = NEW.content_hash
+        )
+          USING ERRCODE = 'unique_violation',
+                HINT = 'Delete the stored copy first, or change the payload.';
+      END IF;
+    END IF;
+    RETURN NEW;
+  END IF;
+  INSERT INTO assessment_fingerprints (content_hash, assessment_id, created_at)
+  VALUES (NEW.content_hash, NEW.id, NEW.created_at)
+  ON CONFLICT (content_hash) DO NOTHING;
+  IF NOT FOUND THEN
+    RETURN NULL;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+DROP TRIGGER IF EXISTS tr_assessment_raw_hash ON assessment_raw;
+CREATE TRIGGER tr_assessment_raw_hash
+  BEFORE INSERT OR UPDATE OF payload ON assessment_raw
+  FOR EACH ROW EXECUTE FUNCTION assessment_hash_fn();
+
+-- check facts for inserted or rewritten assessments, one statement per batch
+CREATE OR REPLACE FUNCTION check_facts_assessment_fn()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'UPDATE' THEN
+    DELETE FROM check_facts f USING old_rows o
+    WHERE f.assessment_id = o.id AND f.created_at = o.created_at;
+  END IF;
+  INSERT INTO check_facts
+  SELECT f.*
+  FROM new_rows n
+  CROSS JOIN LATERAL extract_check_facts(n.id, n.created_at, n.payload) f;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+DROP TRIGGER IF EXISTS tr_assessment_raw_facts_insert ON assessment_raw;
+CREATE TRIGGER tr_assessment_raw_facts_insert
+  AFTER INSERT ON assessment_raw
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION check_facts_assessment_fn();
+
+DROP TRIGGER IF EXISTS tr_assessment_raw_facts_update ON assessment_raw;
+CREATE TRIGGER tr_assessment_raw_facts_update
+  AFTER UPDATE ON assessment_raw
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION check_facts_assessment_fn();
+
+-- check facts and fingerprints of deleted assessments (dropping a partition
+-- bypasses this; see everse_db.partitions)
+CREATE OR REPLACE FUNCTION assessment_delete_fn()
+RETURNS TRIGGER AS $$
+BEGIN
+  DELETE FROM check_facts f USING old_rows o
+  WHERE f.assessment_id = o.id AND f.created_at = o.created_at;
+  DELETE FROM assessment_fingerprints p USING old_rows o
+  WHERE p.content_hash = o.content_hash AND p.assessment_id = o.id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+DROP TRIGGER IF EXISTS tr_assessment_raw_delete ON assessment_raw;
+CREATE TRIGGER tr_assessment_raw_delete
+  AFTER DELETE ON assessment_raw
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION assessment_delete_fn();
+
+-- monthly rollups of inserted, rewritten and deleted assessments (dropping a
+-- partition bypasses this; see everse_db.partitions); also counts the change
+-- in assessment_raw_changes. Concurrent writers already update the same
+-- monthly rollup rows, so the extra row adds no new serialisation.
+CREATE OR REPLACE FUNCTION assessment_rollup_fn()
+RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE assessment_raw_changes SET changes = changes + 1;
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM apply_assessment_rollup(ARRAY(
+      SELECT ROW(assessment_month(payload), payload->'assessedSoftware'->>'name',
+                 count(*), coalesce(sum(assessment_check_count(payload)), 0),
+                 count(assessment_check_count(payload)))::assessment_monthly_software
+      FROM old_rows
+      GROUP BY assessment_month(payload), payload->'assessedSoftware'->>'name'
+    ), -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM apply_assessment_rollup(ARRAY(
+      SELECT ROW(assessment_month(payload), payload->'assessedSoftware'->>'name',
+                 count(*), coalesce(sum(assessment_check_count(payload)), 0),
+                 count(assessment_check_count(payload)))::assessment_monthly_software
+      FROM new_rows
+      GROUP BY assessment_month(payload), payload->'assessedSoftware'->>'name'
+    ), 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+DROP TRIGGER IF EXISTS tr_assessment_raw_rollup_insert ON assessment_raw;
+CREATE TRIGGER tr_assessment_raw_rollup_insert
+  AFTER INSERT ON assessment_raw
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION assessment_rollup_fn();
+
+DROP TRIGGER IF EXISTS tr_assessment_raw_rollup_update ON assessment_raw;
+CREATE TRIGGER tr_assessment_raw_rollup_update
+  AFTER UPDATE ON assessment_raw
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION assessment_rollup_fn();
+
+DROP TRIGGER IF EXISTS tr_assessment_raw_rollup_delete ON assessment_raw;
+CREATE TRIGGER tr_assessment_raw_rollup_delete
+  AFTER DELETE ON assessment_raw
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION assessment_rollup_fn();
+
+-- monthly per dimension check counts, following every change to check_facts
+CREATE OR REPLACE FUNCTION check_rollup_fn()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM apply_check_rollup(ARRAY(
+      SELECT ROW(date_trunc('month', date_created), dimension_id, count(*),
+                 count(*) FILTER (WHERE status LIKE '%Pass%'),
+                 count(*) FILTER (WHERE status LIKE '%Fail%'))::check_monthly_dimension
+      FROM old_rows
+      GROUP BY date_trunc('month', date_created), dimension_id
+    ), -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM apply_check_rollup(ARRAY(
+      SELECT ROW(date_trunc('month', date_created), dimension_id, count(*),
+                 count(*) FILTER (WHERE status LIKE '%Pass%'),
+                 count(*) FILTER (WHERE status LIKE '%Fail%'))::check_monthly_dimension
+      FROM new_rows
+      GROUP BY date_trunc('month', date_created), dimension_id
+    ), 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+DROP TRIGGER IF EXISTS tr_check_facts_rollup_insert ON check_facts;
+CREATE TRIGGER tr_check_facts_rollup_insert
+  AFTER INSERT ON check_facts
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION check_rollup_fn();
+
+DROP TRIGGER IF EXISTS tr_check_facts_rollup_update ON check_facts;
+CREATE TRIGGER tr_check_facts_rollup_update
+  AFTER UPDATE ON check_facts
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION check_rollup_fn();
+
+DROP TRIGGER IF EXISTS tr_check_facts_rollup_delete ON check_facts;
+CREATE TRIGGER tr_check_facts_rollup_delete
+  AFTER DELETE ON check_facts
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION check_rollup_fn();
+
+-- resolve the dimension of an indicator from its quality_dimension reference
+CREATE OR REPLACE FUNCTION indicator_dimension_fn()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.dimension_id := (
+    SELECT d.id FROM dimensions d
+    WHERE d.identifier = resolve_dimension_identifier(NEW.quality_dimension)
+  );
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+DROP TRIGGER IF EXISTS tr_indicators_dimension ON indicators;
+CREATE TRIGGER tr_indicators_dimension
+  BEFORE INSERT OR UPDATE OF quality_dimension ON indicators
+  FOR EACH ROW EXECUTE FUNCTION indicator_dimension_fn();
+
+-- rebuild the indicator_dimensions rows of an indicator
+CREATE OR REPLACE FUNCTION indicator_dimensions_fn()
+RETURNS TRIGGER AS $$
+BEGIN
+  DELETE FROM indicator_dimensions WHERE indicator_id = NEW.id;
+  INSERT INTO indicator_dimensions (indicator_id, dimension_id, position)
+  SELECT NEW.id, d.id, MIN(r.ordinality)
+  FROM unnest(dimension_identifiers(NEW.quality_dimension))
+    WITH ORDINALITY AS r(identifier, ordinality)
+  JOIN dimensions d ON d.identifier = r.identifier
+  GROUP BY d.id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+DROP TRIGGER IF EXISTS tr_indicators_dimensions ON indicators;
+CREATE TRIGGER tr_indicators_dimensions
+  AFTER INSERT OR UPDATE OF quality_dimension ON indicators
+  FOR EACH ROW EXECUTE FUNCTION indicator_dimensions_fn();
+
+-- indicators imported before their dimension are resolved once it arrives
+CREATE OR REPLACE FUNCTION dimension_indicators_fn()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'UPDATE' THEN
+    UPDATE indicators SET dimension_id = NULL WHERE dimension_id = NEW.id;
+    DELETE FROM indicator_dimensions WHERE dimension_id = NEW.id;
+  END IF;
+  UPDATE indicators SET dimension_id = NEW.id
+  WHERE dimension_id IS NULL
+    AND resolve_dimension_identifier(quality_dimension) = NEW.identifier;
+  INSERT INTO indicator_dimensions (indicator_id, dimension_id, position)
+  SELECT i.id, NEW.id, MIN(r.ordinality)
+  FROM indicators i
+  CROSS JOIN LATERAL unnest(dimension_identifiers(i.quality_dimension))
+    WITH ORDINALITY AS r(identifier, ordinality)
+  WHERE r.identifier = NEW.identifier
+  GROUP BY i.id
+  ON CONFLICT (indicator_id, dimension_id) DO NOTHING;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+DROP TRIGGER IF EXISTS tr_dimensions_indicators ON dimensions;
+CREATE TRIGGER tr_dimensions_indicators
+  AFTER INSERT OR UPDATE OF identifier ON dimensions
+  FOR EACH ROW EXECUTE FUNCTION dimension_indicators_fn();
+
+-- keep the dimension of check facts in step with the indicator catalog
+CREATE OR REPLACE FUNCTION check_facts_indicator_fn()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    UPDATE check_facts SET dimension_id = NULL
+    WHERE indicator_id = OLD.identifier AND dimension_id IS NOT NULL;
+    RETURN NULL;
+  END IF;
+  IF TG_OP = 'UPDATE' AND OLD.identifier <> NEW.identifier THEN
+    UPDATE check_facts SET dimension_id = NULL
+    WHERE indicator_id = OLD.identifier AND dimension_id IS NOT NULL;
+  END IF;
+  UPDATE check_facts SET dimension_id = NEW.dimension_id
+  WHERE indicator_id = NEW.identifier
+    AND dimension_id IS DISTINCT FROM NEW.dimension_id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = api, public;
+
+DROP TRIGGER IF EXISTS tr_indicators_facts ON indicators;
+CREATE TRIGGER tr_indicators_facts
+  AFTER INSERT OR UPDATE OR DELETE ON indicators
+  FOR EACH ROW EXECUTE FUNCTION check_facts_indicator_fn();
+
 -- assessment view insert trigger (for resqui)
 CREATE OR REPLACE FUNCTION assessment_insert_fn()
 RETURNS TRIGGER AS $$
@@ -22,6 +22,12 @@ ALTER TABLE software ENABLE ROW LEVEL SECURITY;
 ALTER TABLE dimensions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE indicators ENABLE ROW LEVEL SECURITY;
 ALTER TABLE assessment_raw ENABLE ROW LEVEL SECURITY;
+ALTER TABLE check_facts ENABLE ROW LEVEL SECURITY;
+ALTER TABLE assessment_monthly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE assessment_monthly_software ENABLE ROW LEVEL SECURITY;
+ALTER TABLE check_monthly_dimension ENABLE ROW LEVEL SECURITY;
+ALTER TABLE assessment_fingerprints ENABLE ROW LEVEL SECURITY;
+ALTER TABLE indicator_dimensions ENABLE ROW LEVEL SECURITY;
 
 -- public read policies
 DROP POLICY IF EXISTS read_software ON software;
@@ -36,6 +42,21 @@ CREATE POLICY read_indicators ON indicators FOR SELECT TO web_anon, web_user USI
 DROP POLICY IF EXISTS read_assessment ON assessment_raw;
 CREATE POLICY read_assessment ON assessment_raw FOR SELECT TO web_anon, web_user USING (true);
 
+DROP POLICY IF EXISTS read_check_facts ON check_facts;
+CREATE POLICY read_check_facts ON check_facts FOR SELECT TO web_anon, web_user USING (true);
+
+DROP POLICY IF EXISTS read_assessment_monthly ON assessment_monthly;
+CREATE POLICY read_assessment_monthly ON assessment_monthly FOR SELECT TO web_anon, web_user USING (true);
+
+DROP POLICY IF EXISTS read_assessment_monthly_software ON assessment_monthly_software;
+CREATE POLICY read_assessment_monthly_software ON assessment_monthly_software FOR SELECT TO web_anon, web_user USING (true);
+
+DROP POLICY IF EXISTS read_check_monthly_dimension ON check_monthly_dimension;
+CREATE POLICY read_check_monthly_dimension ON check_monthly_dimension FOR SELECT TO web_anon, web_user USING (true);
+
+DROP POLICY IF EXISTS read_indicator_dimensions ON indicator_dimensions;
+CREATE POLICY read_indicator_dimensions ON indicator_dimensions FOR SELECT TO web_anon, web_user USING (true);
+
 -- authenticated write policies
 DROP POLICY IF EXISTS write_software ON software;
 CREATE POLICY write_software ON software FOR ALL TO web_user
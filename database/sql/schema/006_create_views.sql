@@ -15,45 +15,37 @@ SELECT
   a.created_at
 FROM assessment_raw a;
 
--- checks detailed view (unnested)
+-- checks detailed view (one row per check, from check_facts)
 CREATE OR REPLACE VIEW checks_detailed AS
 SELECT
-  a.id AS assessment_id,
-  a.payload->'assessedSoftware'->>'name' AS software_name,
-  a.payload->>'dateCreated' AS assessment_date,
-  check_item->>'@type' AS check_type,
-  check_item->'assessesIndicator'->>'@id' AS indicator_id,
-  check_item->'checkingSoftware'->>'name' AS checking_software,
-  check_item->>'process' AS process,
-  check_item->'status'->>'@id' AS status,
-  check_item->>'output' AS output,
-  check_item->>'evidence' AS evidence,
+  f.assessment_id,
+  f.software_name,
+  f.assessment_date,
+  f.check_type,
+  f.indicator_id,
+  f.checking_software,
+  f.process,
+  f.status,
+  f.output,
+  f.evidence,
   i.name AS indicator_name,
   i.quality_dimension,
   d.name AS dimension_name
-FROM assessment_raw a
-CROSS JOIN LATERAL jsonb_array_elements(a.payload->'checks') AS check_item
-LEFT JOIN indicators i ON (check_item->'assessesIndicator'->>'@id') = i.identifier
-LEFT JOIN dimensions d ON d.identifier = split_part(
-  CASE WHEN jsonb_typeof(i.quality_dimension::jsonb) = 'array'
-       THEN i.quality_dimension::jsonb->0->>'@id'
-       ELSE i.quality_dimension::jsonb->>'@id'
-  END, '/', -1);
+FROM check_facts f
+LEFT JOIN indicators i ON i.identifier = f.indicator_id
+LEFT JOIN dimensions d ON d.id = f.dimension_id;
 
 -- assessment summary per software
 CREATE OR REPLACE VIEW assessment_summary AS
 SELECT
-  a.payload->'assessedSoftware'->>'name' AS software_name,
-  a.payload->'assessedSoftware'->>'url' AS software_url,
-  COUNT(DISTINCT a.id) AS assessment_count,
-  MAX(a.payload->>'dateCreated') AS latest_assessment,
-  AVG(jsonb_array_length(a.payload->'checks'))::numeric(10,2) AS avg_checks,
-  COUNT(DISTINCT check_item->'assessesIndicator'->>'@id') AS unique_indicators
-FROM assessment_raw a
-CROSS JOIN LATERAL jsonb_array_elements(a.payload->'checks') AS check_item
-GROUP BY
-  a.payload->'assessedSoftware'->>'name',
-  a.payload->'assessedSoftware'->>'url';
+  f.software_name,
+  f.software_url,
+  COUNT(DISTINCT f.assessment_id) AS assessment_count,
+  MAX(f.assessment_date) AS latest_assessment,
+  (COUNT(*)::numeric / COUNT(DISTINCT f.assessment_id))::numeric(10,2) AS avg_checks,
+  COUNT(DISTINCT f.indicator_id) AS unique_indicators
+FROM check_facts f
+GROUP BY f.software_name, f.software_url;
 
 -- dimension coverage (pass/fail per dimension)
 CREATE OR REPLACE VIEW dimension_coverage AS
@@ -61,21 +53,14 @@ SELECT
   d.name AS dimension_name,
   d.identifier AS dimension_id,
   COUNT(*) AS total_checks,
-  SUM(CASE WHEN check_item->'status'->>'@id' LIKE '%Pass%' THEN 1 ELSE 0 END) AS passed,
-  SUM(CASE WHEN check_item->'status'->>'@id' LIKE '%Fail%' THEN 1 ELSE 0 END) AS failed,
-  SUM(CASE WHEN check_item->'status'->>'@id' NOT LIKE '%Pass%'
-           AND check_item->'status'->>'@id' NOT LIKE '%Fail%' THEN 1 ELSE 0 END) AS other,
-  ROUND(100.0 * SUM(CASE WHEN check_item->'status'->>'@id' LIKE '%Pass%' THEN 1 ELSE 0 END)
+  SUM(CASE WHEN f.status LIKE '%Pass%' THEN 1 ELSE 0 END) AS passed,
+  SUM(CASE WHEN f.status LIKE '%Fail%' THEN 1 ELSE 0 END) AS failed,
+  SUM(CASE WHEN f.status NOT LIKE '%Pass%'
+           AND f.status NOT LIKE '%Fail%' THEN 1 ELSE 0 END) AS other,
+  ROUND(100.0 * SUM(CASE WHEN f.status LIKE '%Pass%' THEN 1 ELSE 0 END)
     / NULLIF(COUNT(*), 0), 2) AS pass_rate
-FROM assessment_raw a
-CROSS JOIN LATERAL jsonb_array_elements(a.payload->'checks') AS check_item
-LEFT JOIN indicators i ON (check_item->'assessesIndicator'->>'@id') = i.identifier
-LEFT JOIN dimensions d ON d.identifier = split_part(
-  CASE WHEN jsonb_typeof(i.quality_dimension::jsonb) = 'array'
-       THEN i.quality_dimension::jsonb->0->>'@id'
-       ELSE i.quality_dimension::jsonb->>'@id'
-  END, '/', -1)
-WHERE d.name IS NOT NULL
+FROM check_facts f
+JOIN dimensions d ON d.id = f.dimension_id
 GROUP BY d.name, d.identifier;
 
 -- indicator results with status
@@ -85,50 +70,60 @@ SELECT
   i.name AS indicator_name,
   i.quality_dimension,
   d.name AS dimension_name,
-  check_item->'status'->>'@id' AS status,
+  f.status,
   COUNT(*) AS occurrences,
   ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (PARTITION BY i.identifier), 2) AS percentage
-FROM assessment_raw a
-CROSS JOIN LATERAL jsonb_array_elements(a.payload->'checks') AS check_item
-LEFT JOIN indicators i ON (check_item->'assessesIndicator'->>'@id') = i.identifier
-LEFT JOIN dimensions d ON d.identifier = split_part(
-  CASE WHEN jsonb_typeof(i.quality_dimension::jsonb) = 'array'
-       THEN i.quality_dimension::jsonb->0->>'@id'
-       ELSE i.quality_dimension::jsonb->>'@id'
-  END, '/', -1)
-WHERE i.identifier IS NOT NULL
-GROUP BY i.identifier, i.name, i.quality_dimension, d.name, check_item->'status'->>'@id';
+FROM check_facts f
+JOIN indicators i ON i.identifier = f.indicator_id
+LEFT JOIN dimensions d ON d.id = f.dimension_id
+GROUP BY i.identifier, i.name, i.quality_dimension, d.name, f.status;
 
 -- software quality scores
 CREATE OR REPLACE VIEW software_quality_scores AS
 SELECT
-  a.payload->'assessedSoftware'->>'name' AS software_name,
+  f.software_name,
   d.name AS dimension_name,
   COUNT(*) AS total_checks,
-  SUM(CASE WHEN check_item->'status'->>'@id' LIKE '%Pass%' THEN 1 ELSE 0 END) AS passed,
-  ROUND(100.0 * SUM(CASE WHEN check_item->'status'->>'@id' LIKE '%Pass%' THEN 1 ELSE 0 END)
+  SUM(CASE WHEN f.status LIKE '%Pass%' THEN 1 ELSE 0 END) AS passed,
+  ROUND(100.0 * SUM(CASE WHEN f.status LIKE '%Pass%' THEN 1 ELSE 0 END)
     / NULLIF(COUNT(*), 0), 2) AS score
-FROM assessment_raw a
-CROSS JOIN LATERAL jsonb_array_elements(a.payload->'checks') AS check_item
-LEFT JOIN indicators i ON (check_item->'assessesIndicator'->>'@id') = i.identifier
-LEFT JOIN dimensions d ON d.identifier = split_part(
-  CASE WHEN jsonb_typeof(i.quality_dimension::jsonb) = 'array'
-       THEN i.quality_dimension::jsonb->0->>'@id'
-       ELSE i.quality_dimension::jsonb->>'@id'
-  END, '/', -1)
-WHERE d.name IS NOT NULL
-GROUP BY a.payload->'assessedSoftware'->>'name', d.name;
+FROM check_facts f
+JOIN dimensions d ON d.id = f.dimension_id
+GROUP BY f.software_name, d.name;
 
--- assessment trends over time
+-- assessment trends over time, from the trigger-maintained monthly rollup
 CREATE OR REPLACE VIEW assessment_trends AS
 SELECT
-  date_trunc('month', (a.payload->>'dateCreated')::timestamp) AS month,
-  COUNT(DISTINCT a.id) AS assessments,
-  COUNT(DISTINCT a.payload->'assessedSoftware'->>'name') AS software_count,
-  AVG(jsonb_array_length(a.payload->'checks'))::numeric(10,2) AS avg_checks
-FROM assessment_raw a
-GROUP BY date_trunc('month', (a.payload->>'dateCreated')::timestamp)
-ORDER BY month;
+  m.month,
+  m.assessments::bigint AS assessments,
+  m.software_count::bigint AS software_count,
+  (m.checks::numeric / NULLIF(m.with_checks, 0))::numeric(10,2) AS avg_checks
+FROM assessment_monthly m
+WHERE m.assessments > 0
+ORDER BY m.month;
+
+-- assessment trends per software
+CREATE OR REPLACE VIEW software_trends AS
+SELECT
+  m.month,
+  m.software_name,
+  m.assessments,
+  (m.checks::numeric / NULLIF(m.with_checks, 0))::numeric(10,2) AS avg_checks
+FROM assessment_monthly_software m
+WHERE m.assessments > 0;
+
+-- check results per quality dimension over time
+CREATE OR REPLACE VIEW dimension_trends AS
+SELECT
+  m.month,
+  d.name AS dimension_name,
+  m.checks,
+  m.passed,
+  m.failed,
+  ROUND(100.0 * m.passed / NULLIF(m.checks, 0), 2) AS pass_rate
+FROM check_monthly_dimension m
+LEFT JOIN dimensions d ON d.id = m.dimension_id
+WHERE m.checks > 0;
 
 -- software by programming language
 CREATE OR REPLACE VIEW software_languages AS
@@ -146,16 +141,10 @@ SELECT
   i.name AS indicator_name,
   d.name AS dimension_name,
   COUNT(*) AS failure_count,
-  array_agg(DISTINCT a.payload->'assessedSoftware'->>'name') AS affected_software
-FROM assessment_raw a
-CROSS JOIN LATERAL jsonb_array_elements(a.payload->'checks') AS check_item
-LEFT JOIN indicators i ON (check_item->'assessesIndicator'->>'@id') = i.identifier
-LEFT JOIN dimensions d ON d.identifier = split_part(
-  CASE WHEN jsonb_typeof(i.quality_dimension::jsonb) = 'array'
-       THEN i.quality_dimension::jsonb->0->>'@id'
-       ELSE i.quality_dimension::jsonb->>'@id'
-  END, '/', -1)
-WHERE check_item->'status'->>'@id' LIKE '%Fail%'
-  AND i.identifier IS NOT NULL
+  array_agg(DISTINCT f.software_name) AS affected_software
+FROM check_facts f
+JOIN indicators i ON i.identifier = f.indicator_id
+LEFT JOIN dimensions d ON d.id = f.dimension_id
+WHERE f.status LIKE '%Fail%'
 GROUP BY i.identifier, i.name, d.name
 ORDER BY failure_count DESC;
@@ -17,6 +17,8 @@ GRANT SELECT ON dimension_coverage TO web_anon, web_user;
 GRANT SELECT ON indicator_results TO web_anon, web_user;
 GRANT SELECT ON software_quality_scores TO web_anon, web_user;
 GRANT SELECT ON assessment_trends TO web_anon, web_user;
+GRANT SELECT ON software_trends TO web_anon, web_user;
+GRANT SELECT ON dimension_trends TO web_anon, web_user;
 GRANT SELECT ON common_issues TO web_anon, web_user;
 
 -- default privileges for new objects
@@ -0,0 +1,43 @@
+SET search_path TO api, public;
+
+-- materialized copies of the dashboard views
+-- each has a unique index so it can be refreshed with REFRESH ... CONCURRENTLY
+-- refreshed by: python maintenance.py refresh-views
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS assessment_summary_mv AS
+SELECT * FROM assessment_summary;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_assessment_summary_mv
+  ON assessment_summary_mv(software_name, software_url);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS dimension_coverage_mv AS
+SELECT * FROM dimension_coverage;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_dimension_coverage_mv
+  ON dimension_coverage_mv(dimension_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS indicator_results_mv AS
+SELECT * FROM indicator_results;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_indicator_results_mv
+  ON indicator_results_mv(indicator_id, status);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS software_quality_scores_mv AS
+SELECT * FROM software_quality_scores;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_software_quality_scores_mv
+  ON software_quality_scores_mv(software_name, dimension_name);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS common_issues_mv AS
+SELECT * FROM common_issues;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_common_issues_mv
+  ON common_issues_mv(indicator_id);
+
+-- refresh bookkeeping (outside the api schema so PostgREST does not expose it)
+CREATE TABLE IF NOT EXISTS public.mv_refresh_state (
+  view_name TEXT PRIMARY KEY,
+  watermarks JSONB NOT NULL,
+  refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+GRANT SELECT ON assessment_summary_mv TO web_anon, web_user;
+GRANT SELECT ON dimension_coverage_mv TO web_anon, web_user;
+GRANT SELECT ON indicator_results_mv TO web_anon, web_user;
+GRANT SELECT ON software_quality_scores_mv TO web_anon, web_user;
+GRANT SELECT ON common_issues_mv TO web_anon, web_user;
@@ -0,0 +1,10 @@
+-- shared cache of aggregate query results (see database/everse_db/result_cache.py)
+-- Entries are keyed by a hash of the query and only served while the data
+-- watermark they were computed at is current. UNLOGGED: no WAL, not
+-- replicated and emptied after a crash, which a cache can afford.
+CREATE UNLOGGED TABLE IF NOT EXISTS public.query_result_cache (
+  key TEXT PRIMARY KEY,
+  watermark TEXT NOT NULL,
+  payload TEXT NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,21 @@
+SET search_path TO api, public;
+
+-- check scores per software, computed by database/everse_db/scoring.py
+-- refreshed by: python maintenance.py score
+-- level 'indicator' and 'dimension': item is the indicator or dimension
+-- identifier; level 'software': item is '' and the score is the weighted
+-- mean of the dimension scores. score is NULL when no check could be scored.
+CREATE TABLE IF NOT EXISTS quality_scores (
+  level TEXT NOT NULL,
+  software_name TEXT NOT NULL,
+  item TEXT NOT NULL DEFAULT '',
+  checks INTEGER NOT NULL,
+  scored_checks INTEGER NOT NULL,
+  score NUMERIC(5,2),
+  computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (level, software_name, item)
+);
+
+-- derived data: readable by everyone, written only by the scoring job
+REVOKE ALL ON quality_scores FROM web_user;
+GRANT SELECT ON quality_scores TO web_anon, web_user;
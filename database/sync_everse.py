@@ -0,0 +1,54 @@
+"""
+Download the EVERSE dimension and indicator catalog from GitHub.
+
+Only files whose git blob SHA changed since the previous run are downloaded, and
+those are fetched concurrently. The output directory is the input of
+import_everse.py.
+"""
+
+import argparse
+import sys
+from everse_db.arguments import positive_int
+from everse_db.everse_sync import GITHUB_API, GITHUB_RAW, EverseSync
+
+
+def main():
+    """
+    Parse command-line arguments and synchronise the catalog.
+    """
+    parser = argparse.ArgumentParser(
+        description="Sync EVERSE dimensions and indicators into a local directory."
+    )
+    parser.add_argument(
+        "output_dir",
+        nargs="?",
+        default="/tmp/everse-sync",
+        help="Directory to write dimensions/ and indicators/ into.",
+    )
+    parser.add_argument("--workers", type=positive_int, default=8, help="Concurrent downloads")
+    parser.add_argument("--api-url", default=GITHUB_API, help="GitHub contents API base URL")
+    parser.add_argument("--raw-url", default=GITHUB_RAW, help="Raw file base URL")
+    args = parser.parse_args()
+
+    syncer = EverseSync(
+        args.output_dir,
+        api_url=args.api_url,
+        raw_url=args.raw_url,
+        max_workers=args.workers,
+    )
+    result = syncer.sync()
+
+    for path in result.downloaded:
+        print(f"  {path}")
+    print(
+        f"Downloaded {len(result.downloaded)}, unchanged {len(result.unchanged)}, "
+        f"removed {len(result.removed)}, failed {len(result.failed)}."
+    )
+    for message in result.failed:
+        print(f"Failed {message}", file=sys.stderr)
+    if result.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
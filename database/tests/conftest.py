@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The tests import everse_db the way the scripts in database/ do.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
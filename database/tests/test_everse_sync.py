@@ -0,0 +1,180 @@
+"""
+EverseSync against a local HTTP stand-in for the GitHub contents API and raw
+file host.
+"""
+
+import hashlib
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from everse_db.everse_sync import MANIFEST_NAME, EverseSync, git_blob_sha
+
+
+class StandIn:
+    """Files per directory, served as contents API listings and raw downloads."""
+
+    def __init__(self):
+        self.files = {
+            "dimensions": {"FAIR.json": b'{"abbreviation": "FAIR"}'},
+            "indicators": {
+                "license.json": b'{"abbreviation": "license"}',
+                "tests.json": b'{"abbreviation": "tests"}',
+            },
+        }
+        #: path -> status codes answered before the file is served
+        self.failures = {}
+        #: path -> content served instead of the listed file
+        self.corrupt = {}
+        self.requests = Counter()
+
+    def listing(self, directory):
+        entries = [
+            {"name": name, "sha": git_blob_sha(content), "type": "file"}
+            for name, content in sorted(self.files[directory].items())
+        ]
+        body = json.dumps(entries).encode("utf-8")
+        return body, '"%s"' % hashlib.md5(body).hexdigest()
+
+
+def make_handler(stand_in):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=b"", headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            stand_in.requests[self.path] += 1
+            failures = stand_in.failures.get(self.path)
+            if failures:
+                self._send(failures.pop(0))
+                return
+            kind, _, rest = self.path.lstrip("/").partition("/")
+            if kind == "api" and rest in stand_in.files:
+                body, etag = stand_in.listing(rest)
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304)
+                else:
+                    self._send(200, body, {"ETag": etag})
+                return
+            directory, _, name = rest.partition("/")
+            content = stand_in.files.get(directory, {}).get(name)
+            if kind != "raw" or content is None:
+                self._send(404)
+                return
+            self._send(200, stand_in.corrupt.get(self.path, content))
+
+    return Handler
+
+
+@pytest.fixture
+def stand_in():
+    stand_in = StandIn()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(stand_in))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stand_in.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield stand_in
+    server.shutdown()
+    server.server_close()
+
+
+def syncer(stand_in, output_dir):
+    return EverseSync(
+        str(output_dir),
+        api_url=f"{stand_in.url}/api",
+        raw_url=f"{stand_in.url}/raw",
+        max_workers=4,
+        token="",
+        retry_delay=0,
+    )
+
+
+def test_first_sync_downloads_every_file(stand_in, tmp_path):
+    result = syncer(stand_in, tmp_path).sync()
+
+    assert result.downloaded == [
+        "dimensions/FAIR.json",
+        "indicators/license.json",
+        "indicators/tests.json",
+    ]
+    assert result.failed == []
+    assert (tmp_path / "indicators" / "tests.json").read_bytes() == b'{"abbreviation": "tests"}'
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest["files"]["dimensions/FAIR.json"] == git_blob_sha(
+        b'{"abbreviation": "FAIR"}'
+    )
+
+
+def test_unchanged_repository_downloads_nothing(stand_in, tmp_path):
+    syncer(stand_in, tmp_path).sync()
+    stand_in.requests.clear()
+
+    result = syncer(stand_in, tmp_path).sync()
+
+    assert result.downloaded == []
+    assert len(result.unchanged) == 3
+    # Two conditional listing requests, both answered with 304.
+    assert set(stand_in.requests) == {"/api/dimensions", "/api/indicators"}
+
+
+def test_only_changed_files_are_downloaded_and_deleted_files_removed(stand_in, tmp_path):
+    syncer(stand_in, tmp_path).sync()
+    stand_in.files["indicators"]["tests.json"] = b'{"abbreviation": "tests", "v": 2}'
+    del stand_in.files["indicators"]["license.json"]
+    stand_in.requests.clear()
+
+    result = syncer(stand_in, tmp_path).sync()
+
+    assert result.downloaded == ["indicators/tests.json"]
+    assert result.removed == ["indicators/license.json"]
+    assert result.unchanged == ["dimensions/FAIR.json"]
+    assert not (tmp_path / "indicators" / "license.json").exists()
+    assert stand_in.requests["/raw/dimensions/FAIR.json"] == 0
+
+
+def test_download_not_matching_the_blob_sha_is_rejected(stand_in, tmp_path):
+    stand_in.corrupt["/raw/indicators/tests.json"] = b'{"abbreviation": "te'
+
+    result = syncer(stand_in, tmp_path).sync()
+
+    assert [message.split(":")[0] for message in result.failed] == ["indicators/tests.json"]
+    assert "does not match" in result.failed[0]
+    assert not (tmp_path / "indicators" / "tests.json").exists()
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert "indicators/tests.json" not in manifest["files"]
+
+    # The next run fetches it again and keeps it once it matches.
+    del stand_in.corrupt["/raw/indicators/tests.json"]
+    result = syncer(stand_in, tmp_path).sync()
+    assert result.downloaded == ["indicators/tests.json"]
+
+
+def test_not_found_is_not_retried(stand_in, tmp_path):
+    stand_in.failures["/raw/indicators/tests.json"] = [404]
+
+    result = syncer(stand_in, tmp_path).sync()
+
+    assert [message.split(":")[0] for message in result.failed] == ["indicators/tests.json"]
+    assert stand_in.requests["/raw/indicators/tests.json"] == 1
+
+
+def test_server_errors_are_retried(stand_in, tmp_path):
+    stand_in.failures["/raw/indicators/tests.json"] = [503, 500]
+    stand_in.failures["/api/dimensions"] = [502]
+
+    result = syncer(stand_in, tmp_path).sync()
+
+    assert result.failed == []
+    assert stand_in.requests["/raw/indicators/tests.json"] == 3
+    assert stand_in.requests["/api/dimensions"] == 2
@@ -27,25 +27,30 @@ module "secrets" {
   labels    = var.common_labels
 }
 
-# db init scripts
-module "db_init" {
-  source = "./modules/db-init"
-
-  namespace = module.namespace.name
-  labels    = var.common_labels
-}
-
 # postgresql
 module "postgresql" {
   source = "./modules/postgresql"
 
-  namespace      = module.namespace.name
-  labels         = var.common_labels
-  secret_name    = module.secrets.secret_name
-  image          = var.postgres_image
-  db_name        = var.postgres_db
-  db_user        = var.postgres_user
-  init_configmap = module.db_init.configmap_name
+  namespace   = module.namespace.name
+  labels      = var.common_labels
+  secret_name = module.secrets.secret_name
+  image       = var.postgres_image
+  db_name     = var.postgres_db
+  db_user     = var.postgres_user
+}
+
+# schema scripts, applied with migrate.py
+module "db_init" {
+  source = "./modules/db-init"
+
+  namespace   = module.namespace.name
+  labels      = var.common_labels
+  secret_name = module.secrets.secret_name
+  db_host     = module.postgresql.host
+  db_name     = var.postgres_db
+  db_user     = var.postgres_user
+
+  module_depends_on = [module.postgresql]
 }
 
 # postgrest api
@@ -85,6 +90,17 @@ module "sync" {
   secrets_name = module.secrets.secret_name
 }
 
+# scheduled maintenance.py jobs
+module "maintenance" {
+  source = "./modules/maintenance"
+
+  namespace    = module.namespace.name
+  db_host      = module.postgresql.host
+  db_name      = var.postgres_db
+  db_user      = var.postgres_user
+  secrets_name = module.secrets.secret_name
+}
+
 # auth service for jwt token generation
 module "auth_service" {
   source = "./modules/auth-service"
@@ -97,7 +113,7 @@ module "auth_service" {
   database_user  = var.postgres_user
   jwt_secret_key = "jwt-secret"
 
-  module_depends_on = [module.postgresql]
+  module_depends_on = [module.db_init]
 }
 
 # demo portal for public dashboard access
@@ -131,6 +131,21 @@ resource "kubernetes_deployment" "auth_service" {
             value = var.log_level
           }
 
+          env {
+            name  = "DB_POOL_SIZE"
+            value = tostring(var.db_pool_size)
+          }
+
+          env {
+            name  = "DB_MAX_OVERFLOW"
+            value = tostring(var.db_max_overflow)
+          }
+
+          env {
+            name  = "DB_STATEMENT_TIMEOUT_MS"
+            value = tostring(var.db_statement_timeout_ms)
+          }
+
           resources {
             limits = {
               cpu    = var.cpu_limit
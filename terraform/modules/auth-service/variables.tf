@@ -85,6 +85,24 @@ variable "log_level" {
   default     = "INFO"
 }
 
+variable "db_pool_size" {
+  description = "Database connections kept open per gunicorn worker"
+  type        = number
+  default     = 5
+}
+
+variable "db_max_overflow" {
+  description = "Extra database connections a worker may open under load"
+  type        = number
+  default     = 10
+}
+
+variable "db_statement_timeout_ms" {
+  description = "statement_timeout for auth-service connections in ms (0 disables it)"
+  type        = number
+  default     = 5000
+}
+
 variable "cpu_limit" {
   description = "CPU limit for auth-service container"
   type        = string
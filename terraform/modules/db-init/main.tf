@@ -1,24 +1,72 @@
-# configmap for db initialization scripts
-# loads SQL from database/sql/schema/ files
+# job that applies the SQL scripts in database/sql/schema/ with migrate.py
+# the job name carries a hash of the scripts, so changing any script creates a
+# new job; migrate.py then applies only the new and changed scripts
 
 locals {
   sql_path = "${path.module}/../../../database/sql/schema"
+  sql_hash = sha1(join("", [
+    for f in sort(fileset(local.sql_path, "*.sql")) : filesha1("${local.sql_path}/${f}")
+  ]))
 }
 
-resource "kubernetes_config_map" "schema" {
+resource "kubernetes_job_v1" "migrate" {
   metadata {
-    name      = "db-init-schema"
+    name      = "db-migrate-${substr(local.sql_hash, 0, 8)}"
     namespace = var.namespace
     labels    = var.labels
   }
 
-  data = {
-    "01-schema.sql"      = file("${local.sql_path}/001_create_schema.sql")
-    "02-tables.sql"      = file("${local.sql_path}/002_create_tables.sql")
-    "03-indexes.sql"     = file("${local.sql_path}/003_create_indexes.sql")
-    "04-triggers.sql"    = file("${local.sql_path}/004_create_triggers.sql")
-    "05-rls.sql"         = file("${local.sql_path}/005_setup_rls.sql")
-    "06-views.sql"       = file("${local.sql_path}/006_create_views.sql")
-    "07-permissions.sql" = file("${local.sql_path}/007_grant_permissions.sql")
+  spec {
+    backoff_limit = var.backoff_limit
+
+    template {
+      metadata {
+        labels = merge(var.labels, {
+          component = "db-migrate"
+        })
+      }
+
+      spec {
+        restart_policy = "OnFailure"
+
+        container {
+          name              = "migrate"
+          image             = var.image
+          image_pull_policy = "IfNotPresent"
+          working_dir       = "/app"
+          command           = ["python3", "migrate.py"]
+
+          env {
+            name  = "DB_HOST"
+            value = var.db_host
+          }
+          env {
+            name  = "DB_NAME"
+            value = var.db_name
+          }
+          env {
+            name  = "DB_USER"
+            value = var.db_user
+          }
+          env {
+            name = "DB_PASSWORD"
+            value_from {
+              secret_key_ref {
+                name = var.secret_name
+                key  = var.password_key
+              }
+            }
+          }
+        }
+      }
+    }
   }
+
+  wait_for_completion = true
+
+  timeouts {
+    create = "10m"
+  }
+
+  depends_on = [var.module_depends_on]
 }
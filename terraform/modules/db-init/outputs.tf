@@ -1,3 +1,3 @@
-output "configmap_name" {
-  value = kubernetes_config_map.schema.metadata[0].name
+output "job_name" {
+  value = kubernetes_job_v1.migrate.metadata[0].name
 }
@@ -6,3 +6,41 @@ variable "labels" {
   type    = map(string)
   default = { app = "dashverse" }
 }
+
+variable "image" {
+  type    = string
+  default = "dashverse/database:latest"
+}
+
+variable "db_host" {
+  type = string
+}
+
+variable "db_name" {
+  type    = string
+  default = "dashverse"
+}
+
+variable "db_user" {
+  type    = string
+  default = "dashverse"
+}
+
+variable "secret_name" {
+  type = string
+}
+
+variable "password_key" {
+  type    = string
+  default = "postgres-password"
+}
+
+variable "backoff_limit" {
+  type    = number
+  default = 6
+}
+
+variable "module_depends_on" {
+  type    = any
+  default = []
+}
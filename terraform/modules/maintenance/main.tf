@@ -0,0 +1,78 @@
+# scheduled database maintenance with maintenance.py from the database image
+
+locals {
+  db_env = {
+    DB_HOST = var.db_host
+    DB_NAME = var.db_name
+    DB_USER = var.db_user
+  }
+
+  jobs = {
+    # refresh the materialized dashboard views whose sources changed; catches
+    # rows written through PostgREST, which no CLI refreshes after
+    "refresh-views" = {
+      schedule = var.refresh_schedule
+      args     = ["refresh-views"]
+    }
+    # create the coming months' partitions before rows for them arrive; rows
+    # without a partition land in assessment_raw_default, after which the
+    # month's partition can no longer be created
+    "ensure-partitions" = {
+      schedule = var.partitions_schedule
+      args     = ["ensure-partitions", "--months-ahead", tostring(var.partition_months_ahead)]
+    }
+  }
+}
+
+resource "kubernetes_cron_job_v1" "maintenance" {
+  for_each = local.jobs
+
+  metadata {
+    name      = each.key
+    namespace = var.namespace
+  }
+
+  spec {
+    schedule                      = each.value.schedule
+    concurrency_policy            = "Forbid"
+    successful_jobs_history_limit = 3
+    failed_jobs_history_limit     = 1
+
+    job_template {
+      metadata {}
+      spec {
+        template {
+          metadata {}
+          spec {
+            restart_policy = "OnFailure"
+
+            container {
+              name              = each.key
+              image             = var.image
+              image_pull_policy = "IfNotPresent"
+              working_dir       = "/app"
+              command           = concat(["python3", "maintenance.py"], each.value.args)
+
+              dynamic "env" {
+                for_each = local.db_env
+                content {
+                  name  = env.key
+                  value = env.value
+                }
+              }
+              env {
+                name = "DB_PASSWORD"
+                value_from {
+                  secret_key_ref {
+                    name = var.secrets_name
+                    key  = "postgres-password"
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
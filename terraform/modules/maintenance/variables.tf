@@ -0,0 +1,45 @@
+variable "namespace" {
+  type = string
+}
+
+variable "image" {
+  type        = string
+  default     = "dashverse/database:latest"
+  description = "Image with the database scripts (database/Dockerfile)"
+}
+
+variable "db_host" {
+  type = string
+}
+
+variable "db_name" {
+  type    = string
+  default = "dashverse"
+}
+
+variable "db_user" {
+  type    = string
+  default = "postgres"
+}
+
+variable "secrets_name" {
+  type = string
+}
+
+variable "refresh_schedule" {
+  type        = string
+  default     = "*/15 * * * *"
+  description = "Cron schedule for refreshing stale materialized views (default: every 15 minutes)"
+}
+
+variable "partitions_schedule" {
+  type        = string
+  default     = "0 3 1 * *"
+  description = "Cron schedule for creating assessment partitions (default: 3am on the 1st of each month)"
+}
+
+variable "partition_months_ahead" {
+  type        = number
+  default     = 3
+  description = "Months after the current one that ensure-partitions keeps created"
+}
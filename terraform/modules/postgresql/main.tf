@@ -81,12 +81,6 @@ resource "kubernetes_deployment" "postgres" {
             mount_path = "/var/lib/postgresql/data"
           }
 
-          volume_mount {
-            name       = "init-scripts"
-            mount_path = "/docker-entrypoint-initdb.d"
-            read_only  = true
-          }
-
           resources {
             limits = {
               cpu    = var.cpu_limit
@@ -121,13 +115,6 @@ resource "kubernetes_deployment" "postgres" {
             claim_name = kubernetes_persistent_volume_claim.postgres.metadata[0].name
           }
         }
-
-        volume {
-          name = "init-scripts"
-          config_map {
-            name = var.init_configmap
-          }
-        }
       }
     }
   }
@@ -60,8 +60,3 @@ variable "memory_request" {
   type    = string
   default = "512Mi"
 }
-
-variable "init_configmap" {
-  type    = string
-  default = "db-init-schema"
-}
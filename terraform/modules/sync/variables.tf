@@ -2,6 +2,22 @@ variable "namespace" {
   type = string
 }
 
+variable "image" {
+  type        = string
+  default     = "dashverse/database:latest"
+  description = "Image with the database scripts (database/Dockerfile)"
+}
+
+variable "state_storage_size" {
+  type    = string
+  default = "100Mi"
+}
+
+variable "storage_class" {
+  type    = string
+  default = "standard"
+}
+
 variable "db_host" {
   type = string
 }